@@ -11,6 +11,7 @@ TRUNCATE TABLE courses;
 TRUNCATE TABLE lecturers;
 TRUNCATE TABLE departments;
 TRUNCATE TABLE programs;
+TRUNCATE TABLE project_members;
 TRUNCATE TABLE research_projects;
 TRUNCATE TABLE non_academic_staff;
 
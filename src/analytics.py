@@ -0,0 +1,251 @@
+"""
+analytics.py
+
+Grade analytics computed with NumPy.
+
+Every student's grade, program and year of study is fetched once into column arrays
+(GradeData). Grouped statistics are then vectorised: groups are encoded as integer codes
+with np.unique, counts and sums come from np.bincount, and per-group medians and
+percentiles are read from a single lexsort by (group, grade). No statistic loops over
+students in Python.
+"""
+
+import sys
+import os
+from collections import namedtuple
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from cache import cached
+from config import ANALYTICS_CONFIG
+from database import db_connection
+from query_registry import register, run_query
+
+# Students without a grade are left out of every statistic. Every row is needed, so the
+# whole table is read (once, then cached until students is written).
+GRADES_QUERY = register("student_grades", """
+SELECT student_id, COALESCE(program, ''), COALESCE(year_of_study, 0), current_grades
+FROM students
+WHERE current_grades IS NOT NULL;
+""", allowed_scans=("students",))
+
+GROUPINGS = ("program", "year", "program_year")
+
+# Column arrays with one entry per graded student
+GradeData = namedtuple("GradeData", ["student_ids", "programs", "years", "grades"])
+
+# One row of group_statistics(); grades are percentages, above_share a fraction
+GroupStats = namedtuple("GroupStats", ["group", "students", "mean", "std", "minimum", "median", "maximum",
+                                       "above", "above_share"])
+
+# Result of compare_cohorts(): difference of means (a - b), Welch's t and Cohen's d
+CohortComparison = namedtuple("CohortComparison", ["a", "b", "difference", "t_statistic", "effect_size"])
+
+
+@cached(tables=("students",))
+def load_grades():
+    """
+    Fetch every graded student's ID, program, year and grade into NumPy arrays (one query).
+
+    Returns:
+        GradeData: Read-only arrays of equal length; programs is an array of str.
+    """
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "student_grades")
+            rows = cursor.fetchall()
+    data = make_grade_data(rows)
+    for array in data:
+        array.flags.writeable = False  # Cached and shared by every caller
+    return data
+
+
+def make_grade_data(rows):
+    """Build GradeData from (student_id, program, year_of_study, grade) rows."""
+    if not rows:
+        return GradeData(np.empty(0, np.int64), np.empty(0, str), np.empty(0, np.int64), np.empty(0, np.float64))
+    student_ids, programs, years, grades = zip(*rows)
+    return GradeData(
+        np.array(student_ids, dtype=np.int64),
+        np.array(programs, dtype=str),
+        np.array(years, dtype=np.int64),
+        np.array(grades, dtype=np.float64),
+    )
+
+
+def _group_codes(data, by):
+    """Return (group labels, integer group code per student) for a grouping in GROUPINGS."""
+    if by == "program":
+        return np.unique(data.programs, return_inverse=True)
+    if by == "year":
+        return np.unique(data.years, return_inverse=True)
+    if by == "program_year":
+        program_labels, program_codes = np.unique(data.programs, return_inverse=True)
+        year_labels, year_codes = np.unique(data.years, return_inverse=True)
+        combined, codes = np.unique(program_codes * len(year_labels) + year_codes, return_inverse=True)
+        labels = [(program_labels[c // len(year_labels)], year_labels[c % len(year_labels)]) for c in combined]
+        return labels, codes
+    raise ValueError(f"Unknown grouping {by!r}; expected one of {', '.join(GROUPINGS)}")
+
+
+def _as_python(value):
+    """Convert NumPy scalars (and tuples of them) to plain Python values for display."""
+    if isinstance(value, tuple):
+        return tuple(_as_python(item) for item in value)
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _group_percentiles(grades, codes, counts, fractions):
+    """Per-group linear-interpolated percentiles from one sort by (group, grade)."""
+    ordered = grades[np.lexsort((grades, codes))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    results = []
+    for fraction in fractions:
+        position = starts + (counts - 1) * fraction
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        results.append(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+    return results
+
+
+def group_statistics(by="program", threshold=None, data=None):
+    """
+    Count, mean, standard deviation, minimum, median and maximum grade per group, and how
+    many students are above `threshold`.
+
+    Args:
+        by (str): "program", "year" or "program_year".
+        threshold (float): Grade to beat; ANALYTICS_CONFIG["default_threshold"] when None.
+        data (GradeData): Grades to analyse; load_grades() when None.
+
+    Returns:
+        list: GroupStats rows ordered by group.
+    """
+    data = load_grades() if data is None else data
+    threshold = ANALYTICS_CONFIG["default_threshold"] if threshold is None else threshold
+    if not len(data.grades):
+        return []
+    labels, codes = _group_codes(data, by)
+    grades = data.grades
+    groups = len(labels)
+
+    counts = np.bincount(codes, minlength=groups)
+    means = np.bincount(codes, weights=grades, minlength=groups) / counts
+    variances = np.bincount(codes, weights=(grades - means[codes]) ** 2, minlength=groups) / counts
+    above = np.bincount(codes, weights=grades > threshold, minlength=groups).astype(np.int64)
+    minimum, median, maximum = _group_percentiles(grades, codes, counts, (0.0, 0.5, 1.0))
+
+    return [
+        GroupStats(_as_python(labels[i]), int(counts[i]), float(means[i]), float(np.sqrt(variances[i])),
+                   float(minimum[i]), float(median[i]), float(maximum[i]), int(above[i]), float(above[i] / counts[i]))
+        for i in range(groups)
+    ]
+
+
+def grade_percentiles(percentiles=(10, 25, 50, 75, 90), data=None):
+    """Return {percentile: grade} over all graded students."""
+    data = load_grades() if data is None else data
+    if not len(data.grades):
+        return {p: None for p in percentiles}
+    values = np.percentile(data.grades, percentiles)
+    return {p: float(value) for p, value in zip(percentiles, values)}
+
+
+def grade_distribution(bin_width=None, data=None):
+    """
+    Histogram of grades in bins of `bin_width` points from 0 to 100 (grades outside are
+    counted in the first or last bin).
+
+    Returns:
+        list: (lower bound, upper bound, students) tuples.
+    """
+    data = load_grades() if data is None else data
+    bin_width = bin_width or ANALYTICS_CONFIG["histogram_bin_width"]
+    edges = np.arange(0, 100 + bin_width, bin_width, dtype=np.float64)
+    edges[-1] = max(edges[-1], 100)
+    counts, _ = np.histogram(np.clip(data.grades, edges[0], edges[-1]), bins=edges)
+    return [(float(low), float(high), int(count)) for low, high, count in zip(edges[:-1], edges[1:], counts)]
+
+
+def z_scores(by=None, data=None):
+    """
+    Standardise every grade against all students, or against its own group.
+
+    Args:
+        by (str): None for the whole population, otherwise a grouping in GROUPINGS.
+
+    Returns:
+        numpy.ndarray: One z-score per student, aligned with data.student_ids (0 where a
+        group has no spread).
+    """
+    data = load_grades() if data is None else data
+    grades = data.grades
+    if by is None:
+        std = grades.std()
+        return (grades - grades.mean()) / std if std else np.zeros_like(grades)
+    labels, codes = _group_codes(data, by)
+    counts = np.bincount(codes, minlength=len(labels))
+    means = np.bincount(codes, weights=grades, minlength=len(labels)) / counts
+    stds = np.sqrt(np.bincount(codes, weights=(grades - means[codes]) ** 2, minlength=len(labels)) / counts)
+    spread = stds[codes]
+    return np.divide(grades - means[codes], spread, out=np.zeros_like(grades), where=spread > 0)
+
+
+def outliers(limit=2.0, by="program", data=None):
+    """
+    Students whose grade is more than `limit` standard deviations from their group's mean.
+
+    Returns:
+        list: (student_id, grade, z_score) tuples, most extreme first.
+    """
+    data = load_grades() if data is None else data
+    scores = z_scores(by, data)
+    selected = np.flatnonzero(np.abs(scores) > limit)
+    selected = selected[np.argsort(-np.abs(scores[selected]), kind="stable")]
+    return [(int(data.student_ids[i]), float(data.grades[i]), float(scores[i])) for i in selected]
+
+
+def compare_cohorts(a, b, by="program", data=None):
+    """
+    Compare the grades of two groups, e.g. compare_cohorts("Physics", "Chemistry") or
+    compare_cohorts(1, 2, by="year").
+
+    Returns:
+        CohortComparison: Mean difference (a - b), Welch's t statistic and Cohen's d;
+        statistics are None when either group has fewer than two students.
+
+    Raises:
+        ValueError: For a grouping other than "program" or "year".
+    """
+    data = load_grades() if data is None else data
+    if by == "program":
+        column = data.programs
+    elif by == "year":
+        column = data.years
+    else:
+        raise ValueError("Cohorts can be compared by 'program' or 'year'.")
+    first, second = data.grades[column == a], data.grades[column == b]
+    if len(first) < 2 or len(second) < 2:
+        return CohortComparison(a, b, None, None, None)
+    difference = first.mean() - second.mean()
+    var_a, var_b = first.var(ddof=1), second.var(ddof=1)
+    standard_error = np.sqrt(var_a / len(first) + var_b / len(second))
+    pooled = np.sqrt(((len(first) - 1) * var_a + (len(second) - 1) * var_b) / (len(first) + len(second) - 2))
+    return CohortComparison(
+        a, b, float(difference),
+        float(difference / standard_error) if standard_error else None,
+        float(difference / pooled) if pooled else None,
+    )
+
+
+def format_group(group, by="program"):
+    """Display label for a group from group_statistics(..., by=by)."""
+    if by == "program_year":
+        program, year = group
+        return f"{format_group(program)}, year {year}"
+    if by == "year":
+        return f"Year {group}"
+    return group or "No program"
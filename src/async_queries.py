@@ -0,0 +1,130 @@
+"""
+async_queries.py
+
+asyncio counterparts of the query functions in queries.py and of search.search_records.
+
+pymysql is a blocking driver, so each call runs the synchronous query on a bounded
+thread pool (sized like the connection pool) and is awaited with an optional timeout.
+The event loop never blocks, the result cache and connection pool are shared with the
+synchronous API, and independent queries can be fanned out with asyncio.gather:
+
+    overview = await get_department_overview("Computer Science", timeout=5)
+    details = await get_department_details("Computer Science", timeout=5)  # 5 queries in parallel
+"""
+
+import asyncio
+import functools
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import queries
+import search
+from config import ASYNC_CONFIG
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the shared query thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=ASYNC_CONFIG["workers"], thread_name_prefix="async-query")
+    return _executor
+
+
+def shutdown():
+    """Stop the query thread pool (a new one is created on next use)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def run_sync(function, *args, timeout=None, **kwargs):
+    """
+    Run a blocking function on the query thread pool and await its result.
+
+    Args:
+        function (callable): The blocking function, e.g. a query from queries.py.
+        timeout (float): Seconds to wait; ASYNC_CONFIG["default_timeout"] when None.
+
+    Raises:
+        asyncio.TimeoutError: If the call does not finish in time. The query keeps running
+        on its worker thread until the database answers, but its result is discarded.
+    """
+    timeout = ASYNC_CONFIG["default_timeout"] if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_executor(), functools.partial(function, *args, **kwargs))
+    return await asyncio.wait_for(future, timeout)
+
+
+def _async_version(function):
+    """Wrap a synchronous query as a coroutine function accepting a `timeout` keyword."""
+    @functools.wraps(function)
+    async def wrapper(*args, timeout=None, **kwargs):
+        return await run_sync(function, *args, timeout=timeout, **kwargs)
+    return wrapper
+
+
+get_students_in_major = _async_version(queries.get_students_in_major)
+get_professors_in_department = _async_version(queries.get_professors_in_department)
+get_students_in_course = _async_version(queries.get_students_in_course)
+get_courses_taught_by_lecturers = _async_version(queries.get_courses_taught_by_lecturers)
+get_top_students = _async_version(queries.get_top_students)
+get_staff_in_department = _async_version(queries.get_staff_in_department)
+get_all_departments = _async_version(queries.get_all_departments)
+get_courses_by_department = _async_version(queries.get_courses_by_department)
+get_research_projects_by_department = _async_version(queries.get_research_projects_by_department)
+get_bachelors_degrees = _async_version(queries.get_bachelors_degrees)
+get_masters_degrees = _async_version(queries.get_masters_degrees)
+get_students_in_major_page = _async_version(queries.get_students_in_major_page)
+get_students_in_course_page = _async_version(queries.get_students_in_course_page)
+get_top_students_page = _async_version(queries.get_top_students_page)
+get_transcript = _async_version(queries.get_transcript)
+get_transcripts = _async_version(queries.get_transcripts)
+get_program_transcripts = _async_version(queries.get_program_transcripts)
+get_department_overview = _async_version(queries.get_department_overview)
+get_department_overviews = _async_version(queries.get_department_overviews)
+get_department_stats = _async_version(queries.get_department_stats)
+search_records = _async_version(search.search_records)
+
+
+async def get_department_details(department_name, timeout=None):
+    """
+    Fetch a department's courses, staff, professors, lecturer courses and research projects in parallel.
+
+    This fans out five separate queries, one connection each, and is kept as the concurrency
+    example the benchmark measures. Services that just need the data should await
+    get_department_overview() instead, which returns the same sections in one round trip.
+
+    Args:
+        department_name (str): The department name.
+        timeout (float): Per-query timeout in seconds.
+
+    Returns:
+        dict: Results keyed by "courses", "staff", "professors", "lecturer_courses" and "research_projects".
+    """
+    calls = {
+        "courses": get_courses_by_department,
+        "staff": get_staff_in_department,
+        "professors": get_professors_in_department,
+        "lecturer_courses": get_courses_taught_by_lecturers,
+        "research_projects": get_research_projects_by_department,
+    }
+    results = await asyncio.gather(*(call(department_name, timeout=timeout) for call in calls.values()))
+    return dict(zip(calls, results))
+
+
+async def get_departments_details(department_names, timeout=None):
+    """Fetch get_department_details() for several departments concurrently, keyed by department name."""
+    results = await asyncio.gather(*(get_department_details(name, timeout) for name in department_names))
+    return dict(zip(department_names, results))
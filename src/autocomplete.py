@@ -0,0 +1,149 @@
+"""
+autocomplete.py
+
+In-memory prefix completion for department, course, program and lecturer names.
+
+All names are loaded with one query into sorted arrays; a completion is a bisect into
+the array followed by a short scan, so lookups take microseconds. The names are reloaded
+on the next lookup after a write to their table is reported to the query cache (see
+cache.QueryCache.add_listener), or after AUTOCOMPLETE_CONFIG["refresh_interval"] seconds
+to pick up writes from other processes.
+"""
+
+import bisect
+import threading
+import time
+
+from cache import query_cache
+from config import AUTOCOMPLETE_CONFIG
+from database import db_connection
+
+# category -> table the names come from
+CATEGORY_TABLES = {
+    "department": "departments",
+    "course": "courses",
+    "program": "programs",
+    "lecturer": "lecturers",
+}
+
+NAMES_QUERY = """
+SELECT 'department', TRIM(department_name) FROM departments
+UNION ALL SELECT 'course', name FROM courses
+UNION ALL SELECT 'program', name FROM programs
+UNION ALL SELECT 'lecturer', name FROM lecturers;
+"""
+
+
+class PrefixIndex:
+    """
+    A case-insensitive prefix index over a set of names, backed by a sorted array.
+
+    Args:
+        names (iterable): The names to index; duplicates are collapsed.
+    """
+
+    def __init__(self, names=()):
+        entries = {}
+        for name in names:
+            if name:
+                entries.setdefault(name.casefold(), name)
+        self._keys = sorted(entries)
+        self._names = [entries[key] for key in self._keys]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def complete(self, prefix, limit=10):
+        """Return up to `limit` names starting with `prefix` (any case), in alphabetical order."""
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(self._keys, prefix)
+        matches = []
+        for i in range(start, min(start + limit, len(self._keys))):
+            if not self._keys[i].startswith(prefix):
+                break
+            matches.append(self._names[i])
+        return matches
+
+    def resolve(self, text):
+        """
+        Return the stored spelling of `text` if it names an entry (ignoring case) or is
+        the prefix of exactly one entry; otherwise None.
+        """
+        key = text.strip().casefold()
+        if not key:
+            return None
+        start = bisect.bisect_left(self._keys, key)
+        if start < len(self._keys) and self._keys[start] == key:
+            return self._names[start]
+        matches = self.complete(key, limit=2)
+        return matches[0] if len(matches) == 1 else None
+
+
+class Autocompleter:
+    """
+    Prefix indexes for every name category, loaded lazily and refreshed when stale.
+
+    Args:
+        load_names (callable): Returns (category, name) rows; reads the database by default.
+        cache: The QueryCache whose invalidations mark categories stale.
+        refresh_interval (float): Seconds after which names are reloaded regardless.
+        clock (callable): Time source, replaceable for testing.
+    """
+
+    def __init__(self, load_names=None, cache=query_cache, refresh_interval=None, clock=time.monotonic):
+        self._load_names = load_names or _load_names_from_database
+        self.refresh_interval = AUTOCOMPLETE_CONFIG["refresh_interval"] if refresh_interval is None else refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._indexes = None
+        self._loaded_at = 0.0
+        self._stale = True
+        cache.add_listener(self._on_invalidate)
+
+    def _on_invalidate(self, tables):
+        if tables is None or set(tables) & set(CATEGORY_TABLES.values()):
+            self._stale = True
+
+    def _current_indexes(self):
+        with self._lock:
+            if self._stale or self._clock() - self._loaded_at > self.refresh_interval:
+                self._stale = False  # Cleared first, so a write during the load marks it stale again
+                names = {category: [] for category in CATEGORY_TABLES}
+                try:
+                    for category, name in self._load_names():
+                        names[category].append(name)
+                except Exception:
+                    self._stale = True
+                    raise
+                self._indexes = {category: PrefixIndex(values) for category, values in names.items()}
+                self._loaded_at = self._clock()
+            return self._indexes
+
+    def complete(self, category, prefix, limit=None):
+        """Return names in `category` that start with `prefix`."""
+        limit = AUTOCOMPLETE_CONFIG["max_suggestions"] if limit is None else limit
+        return self._current_indexes()[category].complete(prefix, limit)
+
+    def resolve(self, category, text):
+        """Return the exact stored name `text` refers to, or None (see PrefixIndex.resolve)."""
+        return self._current_indexes()[category].resolve(text)
+
+
+def _load_names_from_database():
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(NAMES_QUERY)
+            return cursor.fetchall()
+
+
+autocompleter = Autocompleter()
+
+
+def complete(category, prefix, limit=None):
+    """Complete a department, course, program or lecturer name from the shared autocompleter."""
+    return autocompleter.complete(category, prefix, limit)
+
+
+def resolve(category, text):
+    """Resolve a typed name to its stored spelling with the shared autocompleter."""
+    return autocompleter.resolve(category, text)
@@ -0,0 +1,352 @@
+"""
+benchmark.py
+
+Latency benchmarks for every query function in queries.py.
+
+For each data scale, the runner loads a synthetic dataset (see generator.py) into a
+disposable database, warms each query up, times repeated runs and records p50/p95/p99
+latency, rows per second and peak Python memory. Results are written as JSON and compared
+against a stored baseline; any query whose p95 latency regresses beyond the tolerance
+makes the run fail.
+
+Usage:
+    python src/benchmark.py --scales 1 10 100
+    python src/benchmark.py --scales 1 10 --save-baseline
+    python src/benchmark.py --host 127.0.0.1 --port 3307   # e.g. a throwaway MySQL/MariaDB container
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Mapping
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import async_queries
+import generator
+import queries
+from cache import query_cache
+from config import DB_CONFIG
+from database import configure_connections, connect, db_connection
+from department_stats import install_department_stats
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "data", "benchmark_baseline.json")
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "benchmark_results.json")
+SCRATCH_DATABASE = f"{DB_CONFIG['database']}_bench"
+
+# name -> (query function, function building its arguments from the sample parameters)
+QUERY_BENCHMARKS = {
+    "get_students_in_major": (queries.get_students_in_major, lambda p: (p["department"],)),
+    "get_courses_by_department": (queries.get_courses_by_department, lambda p: (p["department"],)),
+    "get_students_in_course": (queries.get_students_in_course, lambda p: (p["course"],)),
+    "get_top_students": (queries.get_top_students, lambda p: ()),
+    "get_all_departments": (queries.get_all_departments, lambda p: ()),
+    "get_professors_in_department": (queries.get_professors_in_department, lambda p: (p["department"],)),
+    "get_courses_taught_by_lecturers": (queries.get_courses_taught_by_lecturers, lambda p: (p["department"],)),
+    "get_staff_in_department": (queries.get_staff_in_department, lambda p: (p["department"],)),
+    "get_research_projects_by_department": (queries.get_research_projects_by_department, lambda p: (p["department"],)),
+    "get_bachelors_degrees": (queries.get_bachelors_degrees, lambda p: ()),
+    "get_masters_degrees": (queries.get_masters_degrees, lambda p: ()),
+    "get_department_stats": (queries.get_department_stats, lambda p: ()),
+    "get_department_overview": (queries.get_department_overview, lambda p: (p["department"],)),
+    "get_department_overviews": (queries.get_department_overviews, lambda p: ()),
+    "get_transcript": (queries.get_transcript, lambda p: (p["students"][0],)),
+    "get_transcripts": (queries.get_transcripts, lambda p: (p["students"],)),
+    "get_program_transcripts": (queries.get_program_transcripts, lambda p: (p["department"],)),
+    "iter_top_students": (queries.iter_top_students, lambda p: ()),
+    "iter_students_in_major": (queries.iter_students_in_major, lambda p: (p["department"],)),
+}
+
+
+def percentile(sorted_values, fraction):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _call(function, args):
+    """
+    Run a query function and return its row count.
+
+    Streaming (iter_*) variants are drained without keeping the rows, so they are timed
+    until the last row arrives and their peak memory reflects the fetch batch only.
+    A mapping is one record (an overview or a transcript), or one per record when its
+    values are records (get_department_overviews, get_transcripts).
+    """
+    result = function(*args)
+    if result is None:
+        return 0
+    if isinstance(result, Mapping):
+        records = sum(isinstance(value, Mapping) for value in result.values())
+        return records or min(len(result), 1)
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    count = 0
+    for _ in result:
+        count += 1
+    return count
+
+
+def measure(function, args, warmup, repeats):
+    """
+    Time repeated calls of a query function.
+
+    Returns:
+        dict: Latency percentiles (ms), row count, throughput and peak traced memory.
+    """
+    for _ in range(warmup):
+        _call(function, args)
+
+    timings = []
+    rows = 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        rows = _call(function, args)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+
+    # Memory is traced in a separate call so tracing overhead does not skew the timings
+    tracemalloc.start()
+    _call(function, args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(timings)
+    return {
+        "p50_ms": percentile(timings, 0.50) * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "p99_ms": percentile(timings, 0.99) * 1000,
+        "mean_ms": total / len(timings) * 1000,
+        "rows": rows,
+        "rows_per_sec": rows * len(timings) / total if total else 0.0,
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+def compare_async_throughput(department, requests):
+    """
+    Compare department fan-out throughput of the synchronous and asyncio APIs.
+
+    The sync path runs the five department queries one after another for each request;
+    the async path issues all requests at once through async_queries, whose thread pool
+    overlaps the database round trips.
+
+    Returns:
+        dict: Requests per second for both paths and the speed-up.
+    """
+    sync_calls = (
+        queries.get_courses_by_department,
+        queries.get_staff_in_department,
+        queries.get_professors_in_department,
+        queries.get_courses_taught_by_lecturers,
+        queries.get_research_projects_by_department,
+    )
+    started = time.perf_counter()
+    for _ in range(requests):
+        for function in sync_calls:
+            function(department)
+    sync_elapsed = time.perf_counter() - started
+
+    async def fan_out():
+        await asyncio.gather(*(async_queries.get_department_details(department) for _ in range(requests)))
+
+    started = time.perf_counter()
+    asyncio.run(fan_out())
+    async_elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "sync_requests_per_sec": requests / sync_elapsed if sync_elapsed else 0.0,
+        "async_requests_per_sec": requests / async_elapsed if async_elapsed else 0.0,
+        "speedup": sync_elapsed / async_elapsed if async_elapsed else 0.0,
+    }
+
+
+def prepare_scratch_database(database, source_database):
+    """Create the scratch database with the same tables and indexes as the application database."""
+    conn = connect(database=None)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
+            for table in [*generator.TABLE_ORDER, "department_stats"]:
+                cursor.execute(f"CREATE TABLE IF NOT EXISTS `{database}`.`{table}` LIKE `{source_database}`.`{table}`")
+        conn.commit()
+    finally:
+        conn.close()
+
+    conn = connect(database=database)
+    try:
+        install_department_stats(conn)  # Triggers are not copied by CREATE TABLE ... LIKE
+    finally:
+        conn.close()
+
+
+def drop_scratch_database(database):
+    """Remove the scratch database."""
+    conn = connect(database=None)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+    finally:
+        conn.close()
+
+
+def sample_parameters():
+    """Pick representative arguments (a department, one of its courses and 1,000 student IDs) from the loaded data."""
+    department = generator.department_name(0)
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT name FROM courses WHERE department = %s ORDER BY course_code LIMIT 1", (department,))
+            row = cursor.fetchone()
+            cursor.execute("SELECT student_id FROM students ORDER BY student_id LIMIT 1000")
+            students = [student_id for (student_id,) in cursor.fetchall()]
+    return {"department": department, "course": row[0] if row else "", "students": students or [0]}
+
+
+def run_benchmarks(scales, seed=42, warmup=3, repeats=20, workers=None, only=None, async_requests=0):
+    """
+    Load each scale into the scratch database and benchmark every query against it.
+
+    Returns:
+        tuple: Results keyed by scale, then by query name; and the async-vs-sync
+        comparison keyed by scale (empty unless async_requests is set).
+    """
+    results = {}
+    async_results = {}
+    for scale in scales:
+        print(f"\n📦 Loading scale {scale} ({generator.ScalePlan(scale).students:,} students)...")
+        generator.generate_to_database(scale, seed=seed, workers=workers, progress=False)
+
+        params = sample_parameters()
+        scale_results = {}
+        for name, (function, build_args) in QUERY_BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            scale_results[name] = stats = measure(function, build_args(params), warmup, repeats)
+            print(f"   {name:<38} p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  "
+                  f"p99 {stats['p99_ms']:8.2f} ms  {stats['rows']:>8,} rows  {stats['peak_memory_kib']:9.1f} KiB")
+        results[str(scale)] = scale_results
+
+        if async_requests:
+            async_results[str(scale)] = comparison = compare_async_throughput(params["department"], async_requests)
+            print(f"   {'department fan-out (sync vs async)':<38} {comparison['sync_requests_per_sec']:8.1f} vs "
+                  f"{comparison['async_requests_per_sec']:8.1f} req/s  ({comparison['speedup']:.2f}x)")
+    return results, async_results
+
+
+def compare_to_baseline(results, baseline, tolerance, min_delta_ms):
+    """
+    Find queries whose p95 latency got worse than the baseline.
+
+    A regression must exceed both the relative tolerance and an absolute floor, so
+    sub-millisecond jitter on tiny datasets does not fail the run.
+
+    Returns:
+        list: Human-readable regression descriptions.
+    """
+    regressions = []
+    for scale, scale_results in results.items():
+        for name, stats in scale_results.items():
+            previous = baseline.get("results", {}).get(scale, {}).get(name)
+            if not previous:
+                continue
+            limit = previous["p95_ms"] * (1 + tolerance)
+            if stats["p95_ms"] > limit and stats["p95_ms"] - previous["p95_ms"] > min_delta_ms:
+                regressions.append(
+                    f"{name} @ scale {scale}: p95 {stats['p95_ms']:.2f} ms vs baseline {previous['p95_ms']:.2f} ms"
+                )
+    return regressions
+
+
+def main():
+    """Parse arguments, run the benchmarks and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark every query in queries.py at several data scales.")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100], help="Scale factors (1 = 1,000 students)")
+    parser.add_argument("--seed", type=int, default=42, help="Data generator seed")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed runs per query")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--workers", type=int, default=None, help="Data generator worker processes")
+    parser.add_argument("--only", nargs="+", help="Benchmark only these query functions")
+    parser.add_argument("--async-requests", type=int, default=0,
+                        help="Also compare sync and asyncio throughput with this many department fan-out requests")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the JSON results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p95 slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--keep-database", action="store_true", help="Do not drop the scratch database afterwards")
+    parser.add_argument("--host", help="Database host (e.g. a disposable MySQL/MariaDB instance)")
+    parser.add_argument("--port", type=int, help="Database port")
+    parser.add_argument("--user", help="Database user")
+    parser.add_argument("--password", help="Database password")
+    args = parser.parse_args()
+
+    server = {key: value for key, value in (
+        ("host", args.host), ("port", args.port), ("user", args.user), ("password", args.password)
+    ) if value is not None}
+
+    query_cache.enabled = False  # Measure the database, not the result cache
+    configure_connections(**server)
+    prepare_scratch_database(SCRATCH_DATABASE, DB_CONFIG["database"])
+    configure_connections(**server, database=SCRATCH_DATABASE)
+    try:
+        results, async_results = run_benchmarks(
+            args.scales, args.seed, args.warmup, args.repeats, args.workers, args.only, args.async_requests
+        )
+    finally:
+        async_queries.shutdown()
+        configure_connections(**server)
+        if not args.keep_database:
+            drop_scratch_database(SCRATCH_DATABASE)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "warmup": args.warmup,
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+    if async_results:
+        report["async"] = async_results
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"💾 Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️ No baseline found; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        print("\n❌ Performance regressions detected:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+    print("\n✅ No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+bootstrap.py
+
+Explicit, idempotent schema setup for the University Record Management System.
+
+The schema's fingerprint (a hash of the DDL generated from models.py plus the
+department_stats triggers) is stored in the `schema_version` table. On start-up a single
+cheap query compares it with the current code; only when they differ is the database
+created, the tables, indexes and triggers brought up to date and the new fingerprint
+recorded. Every step is timed, and start.py appends the timings to startup_times.jsonl.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pymysql
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from config import DB_CONFIG
+from database import connect
+from department_stats import install_department_stats, trigger_statements
+from models import Base, DATABASE_URL, Session, ensure_indexes
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_LOG = os.path.join(BASE_DIR, "startup_times.jsonl")
+
+UNKNOWN_DATABASE = 1049
+NO_SUCH_TABLE = 1146
+
+_engine = None
+
+
+def get_engine():
+    """Return the shared SQLAlchemy engine (created on first use) and bind models.Session to it."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+        Session.configure(bind=_engine)
+    return _engine
+
+
+def schema_fingerprint():
+    """
+    Hash the DDL the models and triggers would produce.
+
+    Any change to a table, column, index or trigger yields a different fingerprint.
+    """
+    dialect = mysql.dialect()
+    parts = []
+    for table in Base.metadata.sorted_tables:
+        parts.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda idx: idx.name):
+            parts.append(str(CreateIndex(index).compile(dialect=dialect)))
+    parts.extend(statement for _, statement in trigger_statements())
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def stored_fingerprint():
+    """
+    Return the fingerprint recorded in schema_version, or None if the database,
+    the table or the row does not exist yet.
+    """
+    try:
+        conn = connect()
+    except pymysql.OperationalError as e:
+        if e.args[0] == UNKNOWN_DATABASE:
+            return None
+        raise
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT version FROM schema_version WHERE id = 1")
+            row = cursor.fetchone()
+        return row[0] if row else None
+    except pymysql.ProgrammingError as e:
+        if e.args[0] == NO_SUCH_TABLE:
+            return None
+        raise
+    finally:
+        conn.close()
+
+
+def apply_schema(fingerprint):
+    """Create the database, tables, indexes and triggers, then record `fingerprint`."""
+    conn = connect(database=None)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{DB_CONFIG['database']}`")
+    finally:
+        conn.close()
+
+    engine = get_engine()
+    Base.metadata.create_all(engine)
+    ensure_indexes(engine)
+
+    conn = connect()
+    try:
+        install_department_stats(conn)
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO schema_version (id, version, applied_at) VALUES (1, %s, NOW()) "
+                "ON DUPLICATE KEY UPDATE version = %s, applied_at = NOW()",
+                (fingerprint, fingerprint)
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def bootstrap(force=False):
+    """
+    Bring the database schema up to date, doing nothing if it already matches.
+
+    Args:
+        force (bool): Re-apply the schema even if the stored fingerprint matches.
+
+    Returns:
+        dict: "applied" (bool), "fingerprint" and per-step timings in seconds.
+    """
+    timings = {}
+    started = time.perf_counter()
+    fingerprint = schema_fingerprint()
+    timings["fingerprint"] = time.perf_counter() - started
+
+    step = time.perf_counter()
+    current = stored_fingerprint()
+    timings["version_check"] = time.perf_counter() - step
+
+    applied = force or current != fingerprint
+    if applied:
+        step = time.perf_counter()
+        apply_schema(fingerprint)
+        timings["apply_schema"] = time.perf_counter() - step
+
+    timings["total"] = time.perf_counter() - started
+    return {"applied": applied, "fingerprint": fingerprint, "timings": timings}
+
+
+def record_startup_time(timings, path=STARTUP_LOG, **details):
+    """Append one start-up's timings (seconds) as a JSON line, so start-up time can be tracked over time."""
+    entry = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), **details,
+             "timings": {step: round(seconds, 4) for step, seconds in timings.items()}}
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps(entry) + "\n")
+
+
+if __name__ == "__main__":
+    result = bootstrap(force="--force" in sys.argv)
+    status = "applied" if result["applied"] else "already up to date"
+    print(f"✅ Schema {status} ({result['timings']['total']:.3f}s)")
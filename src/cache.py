@@ -0,0 +1,213 @@
+"""
+cache.py
+
+Read-through result cache for the query functions in queries.py.
+
+Results are keyed on the function name and its arguments, kept in a bounded LRU with a
+per-query TTL, and tagged with the tables they were read from. Any write made through
+the project's own code (loader, migrations, generator, ...) calls invalidate_tables(),
+which evicts every entry that depends on a written table. Writes made by other
+processes are picked up when the entries' TTL expires.
+"""
+
+import functools
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from config import CACHE_CONFIG
+
+_WRITE_TARGET = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?(?:INTO\s+)?|REPLACE\s+(?:INTO\s+)?|UPDATE\s+(?:IGNORE\s+)?|"
+    r"DELETE\s+FROM\s+|TRUNCATE\s+(?:TABLE\s+)?|ALTER\s+TABLE\s+|DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?|"
+    r"LOAD\s+DATA\s+.*?\s+INTO\s+TABLE\s+)`?(\w+)`?",
+    re.IGNORECASE | re.DOTALL
+)
+
+_MISSING = object()
+
+
+class QueryCache:
+    """
+    A thread-safe LRU cache with per-entry TTLs and table-based invalidation.
+
+    Args:
+        max_entries (int): Entries kept before the least recently used one is evicted.
+        default_ttl (float): Seconds an entry stays valid when no TTL is given.
+        clock (callable): Time source, replaceable for testing.
+    """
+
+    def __init__(self, max_entries=256, default_ttl=60, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.enabled = True
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires_at, tables)
+        self._by_table = {}  # table -> set of keys
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self.generation = 0  # Bumped on every invalidation
+        self._listeners = []  # Called with the invalidated tables (None after clear())
+
+    def get(self, key):
+        """Return the cached value for `key`, or the module-level _MISSING sentinel."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return _MISSING
+            value, expires_at, _ = entry
+            if self._clock() >= expires_at:
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key, value, tables=(), ttl=None, generation=None):
+        """
+        Store a value that depends on `tables`, evicting the LRU entry if the cache is full.
+
+        If `generation` is given and an invalidation happened since it was read, the
+        value may predate a write and is not stored.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, self._clock() + ttl, tuple(tables))
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key):
+        _, _, tables = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def add_listener(self, callback):
+        """
+        Register `callback(tables)` to run after every invalidation, e.g. to refresh other
+        in-memory data derived from those tables. `tables` is None after clear().
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, tables):
+        for callback in list(self._listeners):
+            callback(tables)
+
+    def invalidate_tables(self, *tables):
+        """Evict every entry that was read from any of `tables`."""
+        with self._lock:
+            keys = set()
+            for table in tables:
+                keys.update(self._by_table.get(table, ()))
+            for key in keys:
+                self._remove(key)
+            self._invalidations += len(keys)
+            self.generation += 1
+        self._notify(tables)
+        return len(keys)
+
+    def clear(self):
+        """Remove all entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self.generation += 1
+        self._notify(None)
+
+    def stats(self):
+        """
+        Return cache statistics.
+
+        Returns:
+            dict: Size, hit/miss counts, hit ratio, evictions, expirations and invalidations.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+
+query_cache = QueryCache(CACHE_CONFIG["max_entries"], CACHE_CONFIG["default_ttl"])
+
+
+def cached(tables, ttl=None, cache=None):
+    """
+    Decorator that caches a query function's result, keyed on its name and arguments.
+
+    Args:
+        tables (tuple): Tables the query reads; writes to any of them evict the entry.
+        ttl (float): Seconds to keep results. CACHE_CONFIG["ttl"] overrides it per function.
+        cache (QueryCache): Cache to use; the shared query_cache by default.
+
+    Every caller receives the same cached object, so decorated functions must return
+    immutable values (tuples, read-only mappings and arrays); a caller that sorted or
+    appended to a shared list would change the result for everyone else.
+
+    The undecorated function stays available as `function.__wrapped__`.
+    """
+    def decorator(function):
+        name = function.__name__
+        entry_ttl = CACHE_CONFIG["ttl"].get(name, ttl)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            store = cache or query_cache
+            if not store.enabled:
+                return function(*args, **kwargs)
+            key = (name, args, tuple(sorted(kwargs.items())))
+            value = store.get(key)
+            if value is _MISSING:
+                generation = store.generation
+                value = function(*args, **kwargs)
+                store.set(key, value, tables, entry_ttl, generation)
+            return value
+
+        wrapper.cache_tables = tuple(tables)
+        return wrapper
+    return decorator
+
+
+def invalidate_tables(*tables):
+    """Evict cached results that depend on any of `tables`."""
+    return query_cache.invalidate_tables(*tables)
+
+
+def table_written_by(sql):
+    """
+    Return the table a write statement modifies, or None for reads and other statements.
+
+    Recognises INSERT, REPLACE, UPDATE, DELETE, TRUNCATE, ALTER/DROP TABLE and LOAD DATA.
+    """
+    match = _WRITE_TARGET.match(sql)
+    return match.group(1).lower() if match else None
+
+
+def get_cache_stats():
+    """Return statistics for the shared query cache."""
+    return query_cache.stats()
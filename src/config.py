@@ -5,3 +5,79 @@ DB_CONFIG = {
     "database": "university_db",
     "port": 3306
 }
+
+# Connection pool settings used by database.get_pool()
+POOL_CONFIG = {
+    "size": 5,  # Maximum number of open connections
+    "checkout_timeout": 10,  # Seconds to wait for a free connection before giving up
+    "max_lifetime": 1800,  # Seconds before a connection is closed and replaced
+    "health_check_interval": 30  # Ping connections that have been idle longer than this (seconds)
+}
+
+# Bulk loading settings used by loader.py
+LOADER_CONFIG = {
+    "insert_batch_rows": 1000,  # Rows per multi-row INSERT / executemany() batch
+    "max_statement_bytes": 1048576,  # Keep merged INSERTs well below the server's max_allowed_packet
+    "commit_every": 50,  # Statements (or batches) per transaction
+    "progress_interval": 2.0  # Seconds between progress lines
+}
+
+# Streaming (server-side cursor) settings used by database.stream_rows()
+STREAM_CONFIG = {
+    "fetch_batch_rows": 1000  # Rows pulled from the socket per fetchmany() call
+}
+
+# Query result cache settings used by cache.py
+CACHE_CONFIG = {
+    "max_entries": 256,  # Cached results kept before the least recently used is evicted
+    "default_ttl": 60,  # Seconds a cached result stays valid
+    "ttl": {  # Per-query TTLs (seconds) for data that rarely changes
+        "get_all_departments": 600,
+        "get_bachelors_degrees": 3600,
+        "get_masters_degrees": 3600
+    }
+}
+
+# GUI background query settings used by gui.py
+GUI_CONFIG = {
+    "query_workers": 4,  # Worker threads running GUI queries (keep at or below the pool size)
+    "poll_interval_ms": 50  # How often the Tk main loop checks for finished queries
+}
+
+# asyncio query API settings used by async_queries.py
+ASYNC_CONFIG = {
+    "workers": 5,  # Threads running blocking queries; matches the connection pool size
+    "default_timeout": 30  # Seconds before an awaited query raises asyncio.TimeoutError (None = wait forever)
+}
+
+# Name autocompletion settings used by autocomplete.py
+AUTOCOMPLETE_CONFIG = {
+    "max_suggestions": 10,  # Completions returned per lookup
+    "refresh_interval": 300  # Seconds before names are reloaded to pick up writes from other processes
+}
+
+# Query registry settings used by query_registry.py
+REGISTRY_CONFIG = {
+    # Run registered queries as server-side prepared statements (PREPARE/EXECUTE), prepared
+    # once per connection. pymysql has no binary protocol, so each call then needs an extra
+    # SET round trip for the parameters; leave off unless parsing dominates (large, complex SQL).
+    "server_prepare": False
+}
+
+# Query instrumentation settings used by instrumentation.py
+INSTRUMENTATION_CONFIG = {
+    "enabled": True,  # Time every registered query (a few microseconds per call)
+    "slow_query_ms": 200,  # Queries slower than this are appended to the slow-query log (None = never)
+    "slow_query_log": "slow_queries.jsonl"  # Relative to the project root
+}
+
+# Grade analytics settings used by analytics.py
+ANALYTICS_CONFIG = {
+    "default_threshold": 70,  # Grade students must exceed to count as "above threshold"
+    "histogram_bin_width": 10  # Width of grade distribution bins, in percentage points
+}
+
+# CSV import settings used by importer.py
+IMPORT_CONFIG = {
+    "chunk_rows": 5000  # Rows validated and committed together; a resumed import restarts at the last committed chunk
+}
@@ -1,18 +1,398 @@
+"""
+database.py
+
+This module manages MySQL connections for the University Record Management System.
+Connections are handed out from a thread-safe pool so that each query reuses an
+established session instead of paying a fresh TCP and authentication handshake.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import pymysql
-from config import DB_CONFIG
+import pymysql.cursors
+import instrumentation
+from config import DB_CONFIG, POOL_CONFIG, STREAM_CONFIG
+
+
+class PoolTimeoutError(pymysql.OperationalError):
+    """Raised when no pooled connection becomes available within the checkout timeout."""
+
+
+_overrides = {}
+
+
+def _connect_kwargs():
+    """Build pymysql.connect() arguments from DB_CONFIG and any configure_connections() overrides."""
+    params = {
+        "host": DB_CONFIG["host"],
+        "user": DB_CONFIG["user"],
+        "password": DB_CONFIG["password"],
+        "database": DB_CONFIG["database"],
+        "port": DB_CONFIG["port"],
+        "ssl_disabled": True
+    }
+    params.update(_overrides)
+    return params
+
+
+def connect(**overrides):
+    """Open a new, unpooled connection to the MySQL database."""
+    params = _connect_kwargs()
+    params.update(overrides)
+    return pymysql.connect(**params)
+
+
+class _PoolEntry:
+    """A physical connection owned by the pool, with the timestamps used for recycling."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class PooledConnection:
+    """
+    A connection checked out from a ConnectionPool.
+
+    Behaves like a pymysql connection; calling close() returns it to the pool
+    instead of closing the socket. It can also be used as a context manager.
+    """
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+        self._checked_out_at = time.perf_counter()
+
+    def __getattr__(self, name):
+        if self._entry is None:
+            raise pymysql.InterfaceError("Connection has already been returned to the pool.")
+        return getattr(self._entry.raw, name)
+
+    @property
+    def closed(self):
+        """True once the connection has been returned to the pool."""
+        return self._entry is None
+
+    def close(self):
+        """Return the connection to the pool."""
+        self._release(discard=False)
+
+    def invalidate(self):
+        """Close the underlying connection instead of returning it, e.g. after a broken stream."""
+        self._release(discard=True)
+
+    def _release(self, discard):
+        if self._entry is None:
+            return
+        entry, self._entry = self._entry, None
+        self._pool._release(entry, time.perf_counter() - self._checked_out_at, discard)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        discard = exc_type is not None and issubclass(exc_type, (pymysql.OperationalError, pymysql.InterfaceError))
+        self._release(discard)
+        return False
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of MySQL connections.
+
+    Connections are created lazily up to `size`. On checkout, connections older than
+    `max_lifetime` seconds are replaced and connections idle for longer than
+    `health_check_interval` seconds are pinged first, so callers never receive a
+    connection the server has already dropped.
+    """
+
+    def __init__(self, size=5, checkout_timeout=10, max_lifetime=1800, health_check_interval=30, **connect_kwargs):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self._connect_kwargs = connect_kwargs
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._open = 0
+        self._closed = False
+
+        # Metrics
+        self._checkouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._health_check_failures = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._held_total = 0.0
+        self._released = 0
+
+    def acquire(self, timeout=None):
+        """
+        Check out a connection, waiting up to `timeout` seconds for one to become free.
+
+        Returns:
+            PooledConnection: A live connection; call close() to return it.
+
+        Raises:
+            PoolTimeoutError: If the pool stays exhausted for the whole timeout.
+            pymysql.MySQLError: If a new connection cannot be opened.
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        deadline = start + timeout
+        entry = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise pymysql.InterfaceError("Connection pool has been closed.")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(f"No database connection available after {timeout}s (pool size {self.size}).")
+                self._cond.wait(remaining)
+
+        try:
+            entry = self._new_entry() if entry is None else self._validate(entry)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.perf_counter() - start
+        with self._cond:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        instrumentation.note_connection_wait(waited)
+        return PooledConnection(self, entry)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager that checks out a connection and always returns it."""
+        conn = self.acquire(timeout)
+        with conn:
+            yield conn
+
+    def _new_entry(self):
+        raw = pymysql.connect(**self._connect_kwargs)
+        with self._cond:
+            self._created += 1
+        return _PoolEntry(raw)
+
+    def _validate(self, entry):
+        """Recycle expired connections and ping ones that have been idle for a while."""
+        now = time.monotonic()
+        if now - entry.created_at > self.max_lifetime:
+            self._close_raw(entry)
+            with self._cond:
+                self._recycled += 1
+            return self._new_entry()
+        if now - entry.last_used > self.health_check_interval:
+            try:
+                entry.raw.ping(reconnect=False)
+            except pymysql.MySQLError:
+                self._close_raw(entry)
+                with self._cond:
+                    self._health_check_failures += 1
+                return self._new_entry()
+        return entry
+
+    def _release(self, entry, held, discard):
+        if not discard:
+            try:
+                # Drop any open transaction so the next borrower starts from a clean snapshot
+                entry.raw.rollback()
+            except pymysql.MySQLError:
+                discard = True
+        entry.last_used = time.monotonic()
+
+        with self._cond:
+            self._released += 1
+            self._held_total += held
+            if discard or self._closed or entry.last_used - entry.created_at > self.max_lifetime:
+                self._open -= 1
+                if not discard and not self._closed:
+                    self._recycled += 1
+                close_entry = True
+            else:
+                self._idle.append(entry)
+                close_entry = False
+            self._cond.notify()
+
+        if close_entry:
+            self._close_raw(entry)
+
+    @staticmethod
+    def _close_raw(entry):
+        try:
+            entry.raw.close()
+        except pymysql.MySQLError:
+            pass
+
+    def close(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_raw(entry)
+
+    def stats(self):
+        """
+        Return a snapshot of pool usage.
+
+        Returns:
+            dict: Connection counts plus checkout and wait-time metrics (seconds).
+        """
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "health_check_failures": self._health_check_failures,
+                "timeouts": self._timeouts,
+                "wait_time_total": self._wait_total,
+                "wait_time_max": self._wait_max,
+                "wait_time_avg": self._wait_total / self._checkouts if self._checkouts else 0.0,
+                "hold_time_avg": self._held_total / self._released if self._released else 0.0
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the shared connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(**POOL_CONFIG, **_connect_kwargs())
+    return _pool
+
+
+def close_pool():
+    """Close the shared connection pool (a new one is created on next use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def configure_connections(**overrides):
+    """
+    Point all new connections at different settings, e.g. configure_connections(database="scratch_db").
+
+    The shared pool is closed so that later checkouts use the new settings. Calling it
+    without arguments restores DB_CONFIG.
+    """
+    _overrides.clear()
+    _overrides.update(overrides)
+    close_pool()
+
+
+def get_pool_stats():
+    """Return usage metrics for the shared connection pool."""
+    return get_pool().stats()
+
+
+@contextmanager
+def db_connection(timeout=None):
+    """Check out a pooled connection for the duration of a `with` block."""
+    with get_pool().connection(timeout) as conn:
+        yield conn
+
+
+def stream_batches(query, params=None, batch_size=None, timeout=None, name=None):
+    """
+    Run a query on a server-side (unbuffered) cursor and yield its rows a batch at a time.
+
+    Rows are read from the socket `batch_size` at a time, so memory stays flat no matter
+    how large the result is. The pooled connection is held until the generator is
+    exhausted or closed. If the consumer stops early, the connection still has unread
+    rows on the wire; it is discarded rather than drained and returned to the pool.
+
+    Args:
+        query (str): SQL to execute.
+        params (tuple): Query parameters.
+        batch_size (int): Rows per fetchmany() call (STREAM_CONFIG["fetch_batch_rows"] by default).
+        timeout (float): Seconds to wait for a pooled connection.
+        name (str): Query name for instrumentation. A stream is timed from execution until
+            its last row has been read (including the consumer's own work) and its caller
+            is the function that consumed it.
+
+    Yields:
+        tuple: (cursor.description, list of rows) for each non-empty batch.
+    """
+    batch_size = batch_size or STREAM_CONFIG["fetch_batch_rows"]
+    caller = instrumentation.calling_function() if instrumentation.enabled() else None
+    conn = get_pool().acquire(timeout)
+    finished = False
+    count = 0
+    start = time.perf_counter()
+    try:
+        cursor = conn.cursor(pymysql.cursors.SSCursor)
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            count += len(rows)
+            yield cursor.description, rows
+        cursor.close()
+        finished = True
+    finally:
+        if finished:
+            conn.close()
+        else:
+            conn.invalidate()
+        if caller is not None:
+            instrumentation.record(name or "stream", time.perf_counter() - start, count, caller, error=not finished)
+
+
+def stream_rows(query, params=None, batch_size=None, timeout=None, name=None):
+    """
+    Like stream_batches(), but yield the rows one at a time.
+
+    Yields:
+        tuple: One result row.
+    """
+    batches = stream_batches(query, params, batch_size, timeout, name)
+    try:
+        for _, rows in batches:
+            yield from rows
+    finally:
+        batches.close()  # Hands back (or discards) the connection as soon as the consumer stops
+
 
 def get_db_connection():
-    """Connect to the MySQL database."""
+    """Connect to the MySQL database (a pooled connection; close() returns it to the pool)."""
     try:
-        conn = pymysql.connect(
-            host=DB_CONFIG["host"],
-            user=DB_CONFIG["user"],
-            password=DB_CONFIG["password"],
-            database=DB_CONFIG["database"],
-            port=DB_CONFIG["port"],
-            ssl_disabled=True
-        )
-        return conn
+        return get_pool().acquire()
     except pymysql.MySQLError as e:
         print(f"❌ Database connection error: {e}")
         return None
@@ -0,0 +1,213 @@
+"""
+department_stats.py
+
+Maintains the `department_stats` summary table (see models.DepartmentStat).
+
+Triggers on courses, lecturers, non_academic_staff, students and research_projects
+adjust the affected department's counters on every INSERT, UPDATE and DELETE, so
+dashboards read one row per department instead of aggregating the fact tables.
+TRUNCATE does not fire triggers, so bulk loaders call rebuild_department_stats()
+afterwards to recompute every row from scratch. Since that rebuild makes per-row
+maintenance pointless, loaders also run inside triggers_suspended(), which turns the
+triggers off for their own session via the @skip_department_stats user variable.
+"""
+
+from contextlib import contextmanager
+
+from cache import invalidate_tables
+
+# Every counter is named in the trigger INSERTs (zero unless it is the one being adjusted),
+# so creating a department's first row never depends on column defaults or sql_mode.
+COUNTER_COLUMNS = ("course_count", "lecturer_count", "staff_count", "student_count",
+                   "graded_students", "grade_total", "research_project_count")
+
+
+def _insert_values(deltas):
+    """Column list and value list for a new row holding `deltas` ({column: SQL expression})."""
+    columns = ", ".join(("department",) + COUNTER_COLUMNS)
+    values = ", ".join(deltas.get(column, "0") for column in COUNTER_COLUMNS)
+    return columns, values
+
+
+# Adds deltas to a department's row, creating it on first use.
+_BUMP = """
+INSERT INTO department_stats ({columns}) VALUES ({department}, {values})
+ON DUPLICATE KEY UPDATE {column} = {column} + {delta};
+"""
+
+# Research projects belong to their principal investigator's department.
+_BUMP_PROJECTS = """
+INSERT INTO department_stats ({columns})
+SELECT l.department, {values} FROM lecturers l
+WHERE l.lecturer_id = {lecturer} AND l.department IS NOT NULL
+ON DUPLICATE KEY UPDATE research_project_count = research_project_count + {delta};
+"""
+
+_BUMP_GRADES = """
+INSERT INTO department_stats ({columns}) VALUES ({row}.program, {values})
+ON DUPLICATE KEY UPDATE student_count = student_count + {student_count},
+                        graded_students = graded_students + {graded_students},
+                        grade_total = grade_total + {grade_total};
+"""
+
+
+def _bump(column, department, delta):
+    columns, values = _insert_values({column: delta})
+    return _BUMP.format(columns=columns, department=department, values=values, column=column, delta=delta).strip()
+
+
+def _counter_body(row, sign, column, department_column="department"):
+    return (f"IF {row}.{department_column} IS NOT NULL THEN "
+            + _bump(column, f"{row}.{department_column}", f"{sign}1")
+            + " END IF;")
+
+
+def _grade_body(row, sign):
+    deltas = {
+        "student_count": f"{sign}1",
+        "graded_students": f"{sign}({row}.current_grades IS NOT NULL)",
+        "grade_total": f"{sign}COALESCE({row}.current_grades, 0)",
+    }
+    columns, values = _insert_values(deltas)
+    upsert = _BUMP_GRADES.format(columns=columns, row=row, values=values, **deltas).strip()
+    return f"IF {row}.program IS NOT NULL THEN " + upsert + " END IF;"
+
+
+def _project_body(row, sign):
+    columns, values = _insert_values({"research_project_count": f"{sign}1"})
+    return _BUMP_PROJECTS.format(columns=columns, values=values, delta=f"{sign}1", lecturer=f"{row}.principal_investigator").strip()
+
+
+def _lecturer_projects_body(row, sign):
+    """Move a lecturer's projects along with the lecturer when their department changes."""
+    return (f"IF {row}.department IS NOT NULL THEN "
+            + _bump("research_project_count", f"{row}.department",
+                    f"{sign}(SELECT COUNT(*) FROM research_projects rp "
+                    f"WHERE rp.principal_investigator = {row}.lecturer_id)")
+            + " END IF;")
+
+
+def _trigger_bodies(table):
+    """Return {"INSERT": body, "UPDATE": body, "DELETE": body} for a fact table."""
+    if table == "students":
+        make = _grade_body
+    elif table == "research_projects":
+        make = _project_body
+    else:
+        column = {"courses": "course_count", "lecturers": "lecturer_count", "non_academic_staff": "staff_count"}[table]
+        make = lambda row, sign: _counter_body(row, sign, column)
+
+    bodies = {
+        "INSERT": make("NEW", ""),
+        "UPDATE": make("OLD", "-") + " " + make("NEW", ""),
+        "DELETE": make("OLD", "-"),
+    }
+    if table == "lecturers":
+        bodies["UPDATE"] = (
+            "IF NOT (OLD.department <=> NEW.department) THEN "
+            + bodies["UPDATE"] + " " + _lecturer_projects_body("OLD", "-") + " " + _lecturer_projects_body("NEW", "")
+            + " END IF;"
+        )
+        bodies["DELETE"] += " " + _lecturer_projects_body("OLD", "-")
+    return bodies
+
+
+TRACKED_TABLES = ("courses", "lecturers", "non_academic_staff", "students", "research_projects")
+
+
+def trigger_statements():
+    """
+    Build the DDL for every department_stats trigger.
+
+    Returns:
+        list: (trigger_name, CREATE TRIGGER statement) pairs.
+    """
+    statements = []
+    for table in TRACKED_TABLES:
+        for event, body in _trigger_bodies(table).items():
+            name = f"trg_department_stats_{table}_{event.lower()}"
+            statements.append((name, f"CREATE TRIGGER {name} AFTER {event} ON {table} FOR EACH ROW "
+                                     f"BEGIN IF @skip_department_stats IS NULL THEN {body} END IF; END"))
+    return statements
+
+
+@contextmanager
+def triggers_suspended(conn):
+    """
+    Turn the department_stats triggers off for statements run on `conn` inside the block.
+
+    Only this connection's session is affected. The caller must call
+    rebuild_department_stats() afterwards, because the counters are not maintained
+    while the triggers are suspended.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SET @skip_department_stats = 1")
+    try:
+        yield conn
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("SET @skip_department_stats = NULL")
+
+
+REBUILD_QUERY = """
+INSERT INTO department_stats (department, course_count, lecturer_count, staff_count, student_count,
+                              graded_students, grade_total, research_project_count)
+SELECT department, SUM(courses), SUM(lecturers), SUM(staff), SUM(students), SUM(graded), SUM(grades), SUM(projects)
+FROM (
+    SELECT department, COUNT(*) AS courses, 0 AS lecturers, 0 AS staff, 0 AS students, 0 AS graded, 0 AS grades, 0 AS projects
+    FROM courses WHERE department IS NOT NULL GROUP BY department
+    UNION ALL
+    SELECT department, 0, COUNT(*), 0, 0, 0, 0, 0
+    FROM lecturers WHERE department IS NOT NULL GROUP BY department
+    UNION ALL
+    SELECT department, 0, 0, COUNT(*), 0, 0, 0, 0
+    FROM non_academic_staff WHERE department IS NOT NULL GROUP BY department
+    UNION ALL
+    SELECT program, 0, 0, 0, COUNT(*), COUNT(current_grades), COALESCE(SUM(current_grades), 0), 0
+    FROM students WHERE program IS NOT NULL GROUP BY program
+    UNION ALL
+    SELECT l.department, 0, 0, 0, 0, 0, 0, COUNT(*)
+    FROM research_projects rp JOIN lecturers l ON l.lecturer_id = rp.principal_investigator
+    WHERE l.department IS NOT NULL GROUP BY l.department
+) counts
+GROUP BY department;
+"""
+
+
+def install_department_stats(conn):
+    """
+    (Re)create the department_stats triggers and fill the table if it is empty.
+
+    `conn` is a DB-API connection to the application database; the department_stats
+    table itself is created by models.py.
+    """
+    with conn.cursor() as cursor:
+        for name, statement in trigger_statements():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(statement)
+        cursor.execute("SELECT COUNT(*) FROM department_stats")
+        empty = cursor.fetchone()[0] == 0
+    conn.commit()
+    if empty:
+        rebuild_department_stats(conn)
+
+
+def rebuild_department_stats(conn, commit=True):
+    """
+    Recompute every department_stats row from the fact tables.
+
+    Needed after TRUNCATE (which bypasses triggers) and safe to run at any time. With
+    commit=False the rebuild stays in the caller's transaction.
+
+    Returns:
+        int: The number of departments with statistics.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("DELETE FROM department_stats")
+        cursor.execute(REBUILD_QUERY)
+        cursor.execute("SELECT COUNT(*) FROM department_stats")
+        count = cursor.fetchone()[0]
+    if commit:
+        conn.commit()
+        invalidate_tables("department_stats")
+    return count
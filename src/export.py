@@ -0,0 +1,311 @@
+"""
+export.py
+
+Stream a table or a registered query to CSV, JSON Lines or Parquet.
+
+Rows are read from a server-side cursor (database.stream_batches) and written a batch at
+a time, so memory use depends on the batch size, not on the size of the table. CSV and
+JSONL output can be compressed with gzip or zstd (the latter needs the `zstandard`
+package); Parquet output needs `pyarrow` and uses its own column compression. With
+`partition_by`, rows are split into one file per value in hive-style directories
+(`department=Physics/part-0.csv`).
+
+Usage:
+    python src/export.py students --format csv --compression gzip
+    python src/export.py courses --format parquet --partition-by department
+    python src/export.py --query students_in_major --param "Computer Science" --format jsonl
+"""
+
+import csv
+import datetime
+import decimal
+import gzip
+import json
+import os
+import sys
+import time
+from urllib.parse import quote
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymysql.constants import FIELD_TYPE
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from database import stream_batches
+from models import Base
+from query_registry import QUERIES, load_all_queries
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXPORT_DIR = os.path.join(BASE_DIR, "data", "exports")
+
+FORMATS = ("csv", "jsonl", "parquet")
+COMPRESSIONS = (None, "gzip", "zstd")
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+# Every partition keeps a file open until the export ends
+MAX_PARTITIONS = 512
+
+# The column that holds a table's department when partitioning by "department"
+# (students belong to a department through their program)
+DEPARTMENT_COLUMNS = {
+    "departments": "department_name",
+    "courses": "department",
+    "lecturers": "department",
+    "non_academic_staff": "department",
+    "department_stats": "department",
+    "students": "program",
+}
+
+_INTEGER_TYPES = {FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG, FIELD_TYPE.LONGLONG, FIELD_TYPE.INT24,
+                  FIELD_TYPE.YEAR}
+_FLOAT_TYPES = {FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE}
+_DECIMAL_TYPES = {FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL}
+# MySQL reports TEXT columns with the BLOB type codes and cursor.description carries no
+# charset to tell them apart; the schema has no binary columns, so these are text
+_TEXT_BLOB_TYPES = {FIELD_TYPE.BLOB, FIELD_TYPE.TINY_BLOB, FIELD_TYPE.MEDIUM_BLOB, FIELD_TYPE.LONG_BLOB}
+
+
+def _json_default(value):
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time, datetime.timedelta)):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    raise TypeError(f"Cannot export value of type {type(value).__name__}")
+
+
+def _open_text(path, compression):
+    """Open `path` for writing text, compressed as requested."""
+    if compression is None:
+        return open(path, "w", encoding="utf-8", newline="")
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    if zstandard is None:
+        raise ImportError("zstd compression needs the zstandard package: pip install zstandard")
+    return zstandard.open(path, "wt", encoding="utf-8", newline="")
+
+
+class CsvWriter:
+    """Writes rows to a CSV file with a header line."""
+
+    def __init__(self, path, description, compression=None):
+        self.file = _open_text(path, compression)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([column[0] for column in description])
+
+    def write_batch(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlWriter:
+    """Writes one JSON object per row."""
+
+    def __init__(self, path, description, compression=None):
+        self.file = _open_text(path, compression)
+        self.columns = [column[0] for column in description]
+        self.encoder = json.JSONEncoder(ensure_ascii=False, default=_json_default)
+
+    def write_batch(self, rows):
+        encode, columns = self.encoder.encode, self.columns
+        self.file.writelines(encode(dict(zip(columns, row))) + "\n" for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+def _arrow_type(column):
+    """Arrow type for a cursor.description entry (name, type_code, display_size, internal_size, precision, scale, null_ok)."""
+    type_code, precision, scale = column[1], column[4], column[5]
+    if type_code in _INTEGER_TYPES:
+        return pyarrow.int64()
+    if type_code in _FLOAT_TYPES:
+        return pyarrow.float64()
+    if type_code in _DECIMAL_TYPES and precision:
+        return pyarrow.decimal128(min(precision, 38), scale or 0)
+    if type_code in (FIELD_TYPE.DATE, FIELD_TYPE.NEWDATE):
+        return pyarrow.date32()
+    if type_code in (FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP):
+        return pyarrow.timestamp("us")
+    return pyarrow.string()  # Including _TEXT_BLOB_TYPES
+
+
+class ParquetWriter:
+    """Writes each batch as a Parquet row group, with a schema taken from the cursor description."""
+
+    def __init__(self, path, description, compression=None):
+        if pyarrow is None:
+            raise ImportError("Parquet export needs the pyarrow package: pip install pyarrow")
+        self.schema = pyarrow.schema([(column[0], _arrow_type(column)) for column in description])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression=compression or "snappy")
+
+    def write_batch(self, rows):
+        columns = [
+            [value.decode("utf-8", "replace") if isinstance(value, bytes) else value for value in values]
+            if field.type == pyarrow.string() else values
+            for values, field in zip(zip(*rows), self.schema)
+        ]
+        arrays = [pyarrow.array(values, type=field.type) for values, field in zip(columns, self.schema)]
+        self.writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+
+def output_suffix(fmt, compression=None):
+    """File extension for a format and compression, e.g. ".csv.gz" (Parquet compresses internally)."""
+    return f".{fmt}" + ("" if fmt == "parquet" else COMPRESSION_SUFFIXES[compression])
+
+
+def write_batches(batches, output, fmt="csv", compression=None, partition_by=None):
+    """
+    Write (description, rows) batches, as produced by database.stream_batches(), to files.
+
+    Args:
+        batches (iterable): (cursor.description, list of rows) pairs.
+        output (str): Output file, or the output directory when partitioning.
+        fmt (str): "csv", "jsonl" or "parquet".
+        compression (str): None, "gzip" or "zstd".
+        partition_by (str): Column whose values split the rows into separate files.
+
+    Returns:
+        dict: {"rows": rows written, "files": {path: rows}}. An empty result writes no file.
+
+    Raises:
+        ValueError: For an unknown format or compression, or a partition column missing from the result.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}; expected gzip or zstd")
+    writer_class = WRITERS[fmt]
+    writers, counts = {}, {}
+    suffix = output_suffix(fmt, compression)
+
+    def writer_for(key, description):
+        if key not in writers:
+            if len(writers) >= MAX_PARTITIONS:
+                raise ValueError(f"More than {MAX_PARTITIONS} distinct {partition_by!r} values; choose a coarser partition column")
+            if partition_by is None:
+                path = output
+            else:
+                directory = os.path.join(output, f"{partition_by}={quote(str(key), safe=' ') if key is not None else '__null__'}")
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, f"part-0{suffix}")
+            writers[key] = (path, writer_class(path, description, compression))
+            counts[path] = 0
+        return writers[key]
+
+    try:
+        for description, rows in batches:
+            if partition_by is None:
+                groups = {None: rows}
+            else:
+                names = [column[0] for column in description]
+                if partition_by not in names:
+                    raise ValueError(f"Cannot partition by {partition_by!r}: the result has no such column")
+                position = names.index(partition_by)
+                groups = {}
+                for row in rows:
+                    groups.setdefault(row[position], []).append(row)
+            for key, group in groups.items():
+                path, writer = writer_for(key, description)
+                writer.write_batch(group)
+                counts[path] += len(group)
+    finally:
+        for _, writer in writers.values():
+            writer.close()
+    return {"rows": sum(counts.values()), "files": counts}
+
+
+def export_sql(source, params=None):
+    """
+    Return the (SQL, parameters) that read a table or a registered query.
+
+    Raises:
+        ValueError: If `source` is neither a table from models.py nor a registered query.
+    """
+    if source in Base.metadata.tables:
+        columns = ", ".join(f"`{column.name}`" for column in Base.metadata.tables[source].columns)
+        return f"SELECT {columns} FROM `{source}`", None
+    load_all_queries()
+    if source in QUERIES:
+        sql = QUERIES[source].sql.strip().rstrip(";")
+        return sql, tuple(params) if params else None
+    raise ValueError(f"Unknown table or registered query: {source!r}")
+
+
+def export(source, output=None, fmt="csv", compression=None, partition_by=None, params=None, batch_size=None):
+    """
+    Stream a table or registered query to a file (or a directory of partitions).
+
+    Args:
+        source (str): Table name or registered query name.
+        output (str): Output path; defaults to data/exports/<source><suffix> (a directory when partitioning).
+        fmt (str): "csv", "jsonl" or "parquet".
+        compression (str): None, "gzip" or "zstd".
+        partition_by (str): A column name, or "department" for the table's department column.
+        params (list): Parameters for a registered query.
+        batch_size (int): Rows fetched and written at a time (STREAM_CONFIG["fetch_batch_rows"] by default).
+
+    Returns:
+        dict: {"rows", "files", "seconds"}.
+    """
+    sql, sql_params = export_sql(source, params)
+    if partition_by == "department":
+        partition_by = DEPARTMENT_COLUMNS.get(source, "department")
+    if output is None:
+        output = os.path.join(EXPORT_DIR, source + ("" if partition_by else output_suffix(fmt, compression)))
+    os.makedirs(output if partition_by else (os.path.dirname(os.path.abspath(output))), exist_ok=True)
+
+    started = time.perf_counter()
+    batches = stream_batches(sql, sql_params, batch_size, name=f"export:{source}")
+    try:
+        result = write_batches(batches, output, fmt, compression, partition_by)
+    finally:
+        batches.close()
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export a table or registered query to CSV, JSONL or Parquet.")
+    parser.add_argument("source", nargs="?", help="Table name")
+    parser.add_argument("--query", help="Registered query name (instead of a table)")
+    parser.add_argument("--param", action="append", default=[], help="Query parameter (repeat for several)")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--compression", choices=["gzip", "zstd"])
+    parser.add_argument("--partition-by", help="Column to split files by, or 'department'")
+    parser.add_argument("--output", help="Output file (or directory when partitioning)")
+    parser.add_argument("--batch-size", type=int, help="Rows fetched and written at a time")
+    args = parser.parse_args()
+
+    if bool(args.source) == bool(args.query):
+        parser.error("give either a table name or --query")
+    try:
+        summary = export(args.source or args.query, args.output, args.format, args.compression,
+                         args.partition_by, args.param, args.batch_size)
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+    print(f"✅ Exported {summary['rows']:,} rows to {len(summary['files'])} file(s) in {summary['seconds']:.1f}s")
+    for path, rows in summary["files"].items():
+        print(f"   {path} ({rows:,} rows)")
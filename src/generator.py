@@ -0,0 +1,498 @@
+"""
+generator.py
+
+Synthetic data generator for load testing the University Record Management System.
+
+Produces departments, programs, lecturers, courses, students, enrollments, lecturer_courses,
+research projects (with project_members) and non-academic staff at a chosen scale factor.
+Every row is derived from (seed, table, chunk) and entity IDs are assigned to departments
+arithmetically, so the output is deterministic and foreign keys always line up no matter
+how many worker processes generate it.
+
+Usage:
+    python src/generator.py --scale 100 --seed 42              # 100,000 students into the database
+    python src/generator.py --scale 1000 --output data/generated  # 1M students as TSV bulk-load files
+"""
+
+import math
+import os
+import random
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import loader
+from cache import invalidate_tables
+from database import connect
+from department_stats import rebuild_department_stats, triggers_suspended
+
+CHUNK_SIZE = 20000  # Rows generated per task
+
+BASE_DEPARTMENTS = [
+    ("Computer Science", "Engineering", "AI, Data Science, Cybersecurity"),
+    ("Mathematics", "Science", "Statistics, Algebra, Geometry"),
+    ("Physics", "Science", "Quantum Mechanics, Astrophysics"),
+    ("Biology", "Life Sciences", "Genetics, Microbiology, Neuroscience"),
+    ("Chemistry", "Science", "Organic, Inorganic, Analytical Chemistry"),
+    ("Business", "Management", "Finance, Marketing, Strategy"),
+    ("Psychology", "Social Sciences", "Cognitive Science, Behavioral Analysis"),
+    ("Mechanical Engineering", "Engineering", "Robotics, Thermodynamics, Design"),
+    ("Electrical Engineering", "Engineering", "Circuits, Renewable Energy, Signal Processing"),
+    ("History", "Humanities", "Medieval Studies, Modern History"),
+]
+FACULTIES = ["Engineering", "Science", "Life Sciences", "Management", "Social Sciences", "Humanities"]
+FIRST_NAMES = [
+    "Alice", "Ben", "Chloe", "Daniel", "Emma", "Farah", "George", "Hannah", "Isaac", "Jade",
+    "Kevin", "Lily", "Mason", "Nora", "Oliver", "Priya", "Quentin", "Rachel", "Samuel", "Tara",
+    "Umar", "Violet", "William", "Xena", "Yusuf", "Zoe",
+]
+LAST_NAMES = [
+    "Adams", "Brown", "Carter", "Davis", "Evans", "Foster", "Green", "Harris", "Iqbal", "Johnson",
+    "King", "Lewis", "Mitchell", "Nguyen", "Owens", "Patel", "Quinn", "Robinson", "Smith", "Turner",
+    "Usman", "Walker", "Xu", "Young", "Zhang",
+]
+TOPICS = [
+    "Foundations", "Methods", "Systems", "Theory", "Analysis", "Design", "Applications",
+    "Modelling", "Ethics", "Research Skills", "Advanced Topics", "Laboratory",
+]
+JOB_TITLES = [
+    "Administrator", "Research Coordinator", "Technical Lab Assistant", "Student Support Officer",
+    "Financial Officer", "Librarian", "IT Support Technician", "Academic Advisor",
+]
+QUALIFICATIONS = ["PhD", "DPhil", "EdD", "DSc"]
+FUNDING_SOURCES = ["University Research Grant", "Research Council", "Industry Partnership"]
+
+# Column order used for every output format
+TABLE_COLUMNS = {
+    "departments": ["department_name", "faculty", "research_areas", "courses_offered", "staff_members"],
+    "programs": ["name", "degree_awarded", "duration", "course_requirements", "enrolment_details"],
+    "lecturers": ["lecturer_id", "name", "department", "academic_qualifications", "expertise", "course_load",
+                  "research_interests", "publications"],
+    "courses": ["course_code", "name", "description", "department", "level", "credits", "prerequisites",
+                "schedule", "materials"],
+    "students": ["student_id", "name", "dob", "contact_info", "program", "year_of_study", "current_grades",
+                 "graduation_status", "disciplinary_records", "advisor_id"],
+    "enrollments": ["student_id", "course_id"],
+    "lecturer_courses": ["lecturer_id", "course_id"],
+    "research_projects": ["project_title", "principal_investigator", "funding_sources", "team_members",
+                          "publications", "outcomes"],
+    "project_members": ["project_title", "member_type", "member_id", "position"],
+    "non_academic_staff": ["staff_id", "name", "job_title", "department", "employment_type", "contract_details",
+                           "salary_information", "emergency_contact"],
+}
+TABLE_ORDER = list(TABLE_COLUMNS)  # Parents before children
+
+
+class ScalePlan:
+    """
+    Row counts for every table at a given scale factor.
+
+    A scale factor of 1 means 1,000 students; the other tables grow in proportion, with
+    a floor so that small scales still cover every department.
+    """
+
+    def __init__(self, scale):
+        if scale <= 0:
+            raise ValueError("Scale factor must be positive.")
+        self.scale = scale
+        self.students = max(10, int(round(1000 * scale)))
+        self.departments = max(len(BASE_DEPARTMENTS), self.students // 5000)
+        self.lecturers = max(5 * self.departments, self.students // 20)
+        self.courses = max(8 * self.departments, self.students // 25)
+        self.staff = max(2 * self.departments, self.students // 100)
+        self.projects = self.lecturers // 2
+        self.enrollments_per_student = 4
+        self.lecturers_per_course = 2
+
+    def counts(self):
+        """Return the approximate number of rows generated for each table."""
+        return {
+            "departments": self.departments,
+            "programs": 2 * self.departments,
+            "lecturers": self.lecturers,
+            "courses": self.courses,
+            "students": self.students,
+            "enrollments": self.students * self.enrollments_per_student,
+            "lecturer_courses": self.courses * self.lecturers_per_course,
+            "research_projects": self.projects,
+            "project_members": self.projects * 3,
+            "non_academic_staff": self.staff,
+        }
+
+    # Entities are spread round-robin over departments: entity index i belongs to
+    # department i % departments, so the members of a department can be computed
+    # without looking anything up.
+    def members_in_department(self, total, department):
+        """Number of entities (out of `total`) assigned to a department."""
+        return (total - department + self.departments - 1) // self.departments
+
+    def member_index(self, department, k):
+        """Zero-based index of the k-th entity in a department."""
+        return department + k * self.departments
+
+
+def department_name(index):
+    """Name of the department at `index`."""
+    if index < len(BASE_DEPARTMENTS):
+        return BASE_DEPARTMENTS[index][0]
+    return f"Department {index + 1:04d}"
+
+
+def person_name(rng):
+    """Random "First Last" name."""
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def lecturer_name(index):
+    """Deterministic, unique lecturer name so project teams can be resolved by name."""
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    return f"{first} {last} {index + 1}"
+
+
+def course_code(index):
+    """Course code of the course at `index`."""
+    return f"GEN{index + 1:07d}"
+
+
+def lecturer_expertise(index):
+    """Area of expertise of the lecturer at `index`."""
+    return TOPICS[index % len(TOPICS)]
+
+
+def _rng(seed, table, chunk):
+    return random.Random(f"{seed}:{table}:{chunk}")
+
+
+def _chunk_range(total, chunk):
+    start = chunk * CHUNK_SIZE
+    return range(start, min(total, start + CHUNK_SIZE))
+
+
+def _departments(plan, rng, indexes):
+    for d in indexes:
+        if d < len(BASE_DEPARTMENTS):
+            _, faculty, areas = BASE_DEPARTMENTS[d]
+        else:
+            faculty = FACULTIES[d % len(FACULTIES)]
+            areas = ", ".join(rng.sample(TOPICS, 3))
+        yield (department_name(d), faculty, areas, plan.members_in_department(plan.courses, d),
+               plan.members_in_department(plan.lecturers, d) + plan.members_in_department(plan.staff, d))
+
+
+def _programs(plan, rng, indexes):
+    for i in indexes:
+        d, masters = divmod(i, 2)
+        name = department_name(d)
+        if masters:
+            yield (f"Advanced {name}", "MSc", 1, f"Core modules in advanced {name}", "Full-time (1 year)")
+        else:
+            yield (name, "BSc", 3, f"Core modules in {name}", "Full-time (3 years)")
+
+
+def _lecturers(plan, rng, indexes):
+    for i in indexes:
+        expertise = lecturer_expertise(i)
+        yield (i + 1, lecturer_name(i), department_name(i % plan.departments),
+               f"{rng.choice(QUALIFICATIONS)} {expertise}", expertise, rng.randint(1, 4),
+               f"{expertise}, {rng.choice(TOPICS)}", f"{expertise} Journal {rng.randint(2015, 2025)}")
+
+
+def _courses(plan, rng, indexes):
+    for j in indexes:
+        d = j % plan.departments
+        name = f"{department_name(d)} {TOPICS[j % len(TOPICS)]} {j + 1}"
+        level = rng.randint(1, 4)
+        yield (course_code(j), name, f"Study of {name.lower()}", department_name(d), level, rng.choice((10, 15, 20)),
+               "None" if level == 1 else f"Level {level - 1} modules", rng.choice(("Mon/Wed", "Tue/Thu", "Fri")),
+               "Lecture notes")
+
+
+def _students(plan, rng, indexes):
+    for i in indexes:
+        d = i % plan.departments
+        year = rng.randint(1, 4)
+        grade = round(min(100.0, max(0.0, rng.gauss(70, 10))), 1)
+        advisor = plan.member_index(d, rng.randrange(plan.members_in_department(plan.lecturers, d))) + 1
+        name = person_name(rng)
+        yield (i + 1, name, f"{2006 - year - rng.randint(0, 2)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+               f"{name.lower().replace(' ', '.')}{i + 1}@university.ac.uk", department_name(d), year, grade,
+               "In Progress", None, advisor)
+
+
+def _enrollments(plan, rng, indexes):
+    for i in indexes:
+        d = i % plan.departments
+        available = plan.members_in_department(plan.courses, d)
+        for k in rng.sample(range(available), min(plan.enrollments_per_student, available)):
+            yield (i + 1, course_code(plan.member_index(d, k)))
+
+
+def _lecturer_courses(plan, rng, indexes):
+    for j in indexes:
+        d = j % plan.departments
+        available = plan.members_in_department(plan.lecturers, d)
+        for k in rng.sample(range(available), min(plan.lecturers_per_course, available)):
+            yield (plan.member_index(d, k) + 1, course_code(j))
+
+
+def _project_team(plan, rng, p):
+    """PI index and the student IDs on project `p` (students come from the PI's department)."""
+    pi = (2 * p) % plan.lecturers
+    d = pi % plan.departments
+    available = plan.members_in_department(plan.students, d)
+    students = [plan.member_index(d, k) + 1 for k in rng.sample(range(available), min(rng.randint(1, 4), available))]
+    return pi, students
+
+
+def _project_title(p):
+    return f"{lecturer_expertise(2 * p)} Research #{p + 1}"
+
+
+def _research_projects(plan, rng, indexes):
+    for p in indexes:
+        pi, students = _project_team(plan, rng, p)
+        team = ", ".join([lecturer_name(pi)] + [f"Student {s}" for s in students])
+        expertise = lecturer_expertise(pi)
+        # No further RNG draws here: _project_members replays the same stream to rebuild the team
+        yield (_project_title(p), pi + 1, FUNDING_SOURCES[p % len(FUNDING_SOURCES)],
+               team, f"{expertise} Journal", f"Innovative research in {expertise}")
+
+
+def _project_members(plan, rng, indexes):
+    for p in indexes:
+        # Same RNG stream as _research_projects, so both tables describe the same team
+        pi, students = _project_team(plan, rng, p)
+        title = _project_title(p)
+        yield (title, "lecturer", pi + 1, 1)
+        for position, student_id in enumerate(students, start=2):
+            yield (title, "student", student_id, position)
+
+
+def _staff(plan, rng, indexes):
+    for i in indexes:
+        name = person_name(rng)
+        yield (i + 1, name, rng.choice(JOB_TITLES), department_name(i % plan.departments),
+               rng.choice(("Full-time", "Part-time")), rng.choice(("Permanent", "3-year contract", "5-year contract")),
+               rng.randrange(30000, 70000, 500), f"{name.lower().replace(' ', '.')}{i + 1}@university.ac.uk")
+
+
+# table -> (row function, RNG stream name, function giving the number of source entities)
+_GENERATORS = {
+    "departments": (_departments, "departments", lambda plan: plan.departments),
+    "programs": (_programs, "programs", lambda plan: 2 * plan.departments),
+    "lecturers": (_lecturers, "lecturers", lambda plan: plan.lecturers),
+    "courses": (_courses, "courses", lambda plan: plan.courses),
+    "students": (_students, "students", lambda plan: plan.students),
+    "enrollments": (_enrollments, "enrollments", lambda plan: plan.students),
+    "lecturer_courses": (_lecturer_courses, "lecturer_courses", lambda plan: plan.courses),
+    "research_projects": (_research_projects, "research_projects", lambda plan: plan.projects),
+    "project_members": (_project_members, "research_projects", lambda plan: plan.projects),
+    "non_academic_staff": (_staff, "non_academic_staff", lambda plan: plan.staff),
+}
+
+
+def generate_chunk(scale, seed, table, chunk):
+    """
+    Generate one chunk of rows for a table.
+
+    Returns:
+        list: Row tuples in TABLE_COLUMNS order.
+    """
+    plan = ScalePlan(scale)
+    row_function, stream, total = _GENERATORS[table]
+    return list(row_function(plan, _rng(seed, stream, chunk), _chunk_range(total(plan), chunk)))
+
+
+def iter_tasks(scale, tables=None):
+    """Yield (table, chunk) pairs covering every table in dependency order."""
+    plan = ScalePlan(scale)
+    for table in tables or TABLE_ORDER:
+        total = _GENERATORS[table][2](plan)
+        for chunk in range(max(1, math.ceil(total / CHUNK_SIZE))):
+            yield table, chunk
+
+
+def _generate_task(args):
+    scale, seed, table, chunk = args
+    return table, generate_chunk(scale, seed, table, chunk)
+
+
+def _write_task(args):
+    scale, seed, table, chunk, directory = args
+    path = os.path.join(directory, f"{table}.{chunk:05d}.tsv")
+    rows = generate_chunk(scale, seed, table, chunk)
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        file.writelines(loader.format_tsv_row(row) for row in rows)
+    return table, path, len(rows)
+
+
+def _run(function, tasks, workers):
+    """
+    Map tasks over worker processes (or inline when workers <= 1), preserving order.
+
+    At most two tasks per worker are in flight, so results cannot pile up in memory
+    when the consumer (e.g. the database) is slower than the generators.
+    """
+    if workers <= 1:
+        yield from map(function, tasks)
+        return
+    with Pool(workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(function, (task,)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def _prepare_for_bulk_load(conn, truncate, atomic=False):
+    with conn.cursor() as cursor:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        cursor.execute("SET UNIQUE_CHECKS = 0")
+        if truncate:
+            for table in reversed(TABLE_ORDER):
+                # TRUNCATE commits implicitly, so an all-or-nothing load has to DELETE instead
+                cursor.execute(f"DELETE FROM {table}" if atomic else f"TRUNCATE TABLE {table}")
+            if not atomic:
+                invalidate_tables(*TABLE_ORDER)
+
+
+def _restore_checks(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("SET UNIQUE_CHECKS = 1")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+
+def _finish_bulk_load(conn, atomic=False):
+    _restore_checks(conn)
+    if atomic:
+        rebuild_department_stats(conn, commit=False)
+        conn.commit()  # The single commit of an all-or-nothing load
+        invalidate_tables(*TABLE_ORDER, "department_stats")
+    else:
+        conn.commit()
+        rebuild_department_stats(conn)  # TRUNCATE bypassed the triggers
+
+
+def generate_to_database(scale, seed=42, workers=None, truncate=True, conn=None, progress=None):
+    """
+    Generate a dataset and insert it directly with batched executemany.
+
+    Rows are generated in worker processes and inserted by this process as they arrive.
+
+    Returns:
+        dict: Rows inserted per table.
+    """
+    workers = workers or os.cpu_count() or 1
+    own_connection = conn is None
+    if own_connection:
+        conn = connect()
+    if progress is None:
+        progress = loader.ProgressReporter(f"Generating scale {scale}")
+
+    inserted = dict.fromkeys(TABLE_ORDER, 0)
+    try:
+        with triggers_suspended(conn):  # _finish_bulk_load() rebuilds department_stats anyway
+            _prepare_for_bulk_load(conn, truncate)
+            tasks = ((scale, seed, table, chunk) for table, chunk in iter_tasks(scale))
+            for table, rows in _run(_generate_task, tasks, workers):
+                inserted[table] += loader.insert_rows(conn, table, TABLE_COLUMNS[table], rows)
+                if progress:
+                    progress(rows=sum(inserted.values()))
+        _finish_bulk_load(conn)
+    except Exception:
+        _restore_checks(conn)  # A caller-supplied connection must not keep the checks off
+        raise
+    finally:
+        if own_connection:
+            conn.close()
+    if progress:
+        progress(rows=sum(inserted.values()), force=True)
+    return inserted
+
+
+def generate_to_files(scale, directory, seed=42, workers=None):
+    """
+    Generate a dataset as TSV files (one per table chunk) for load_generated_files().
+
+    Each worker writes its own files, so memory use stays bounded at any scale.
+
+    Returns:
+        list: (table, path, row_count) for every file written, in load order.
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(directory, exist_ok=True)
+    tasks = ((scale, seed, table, chunk, directory) for table, chunk in iter_tasks(scale))
+    return list(_run(_write_task, tasks, workers))
+
+
+def load_generated_files(files, truncate=True, conn=None, progress=None, atomic=False):
+    """
+    Bulk load files written by generate_to_files() with LOAD DATA LOCAL INFILE.
+
+    Each file is committed as soon as it is loaded, unless `atomic` is set: then the
+    tables are emptied with DELETE rather than TRUNCATE (which commits implicitly) and
+    everything, including the department_stats rebuild, is committed once at the end.
+    If any step fails the transaction is rolled back and the previous data is untouched.
+    This costs undo log space proportional to the old and new data.
+
+    Returns:
+        dict: Rows loaded per table.
+    """
+    own_connection = conn is None
+    if own_connection:
+        conn = connect(local_infile=True)
+    if progress is None:
+        progress = loader.ProgressReporter("Loading generated files")
+
+    loaded = dict.fromkeys(TABLE_ORDER, 0)
+    try:
+        with triggers_suspended(conn):  # _finish_bulk_load() rebuilds department_stats anyway
+            _prepare_for_bulk_load(conn, truncate, atomic)
+            for table, path, _ in files:
+                loaded[table] += loader.load_delimited_file(path, table, TABLE_COLUMNS[table], conn=conn, commit=not atomic)
+                if progress:
+                    progress(rows=sum(loaded.values()))
+            _finish_bulk_load(conn, atomic)
+    except Exception:
+        if atomic:
+            conn.rollback()
+        _restore_checks(conn)  # A caller-supplied connection must not keep the checks off
+        raise
+    finally:
+        if own_connection:
+            conn.close()
+    if progress:
+        progress(rows=sum(loaded.values()), force=True)
+    return loaded
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate synthetic university data for load testing.")
+    parser.add_argument("--scale", type=float, default=1, help="Scale factor (1 = 1,000 students)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed gives the same data")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--output", help="Write TSV bulk-load files to this directory instead of the database")
+    parser.add_argument("--load", action="store_true", help="With --output, also bulk load the files")
+    args = parser.parse_args()
+
+    plan = ScalePlan(args.scale)
+    print(f"📊 Scale {args.scale}: " + ", ".join(f"{t}≈{n:,}" for t, n in plan.counts().items()))
+    started = time.perf_counter()
+    if args.output:
+        files = generate_to_files(args.scale, args.output, args.seed, args.workers)
+        print(f"✅ Wrote {len(files)} files to {args.output} in {time.perf_counter() - started:.1f}s")
+        if args.load:
+            counts = load_generated_files(files)
+            print(f"✅ Loaded {sum(counts.values()):,} rows in {time.perf_counter() - started:.1f}s")
+    else:
+        counts = generate_to_database(args.scale, args.seed, args.workers)
+        print(f"✅ Inserted {sum(counts.values()):,} rows in {time.perf_counter() - started:.1f}s")
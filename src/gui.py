@@ -1,12 +1,19 @@
+import queue
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, simpledialog, messagebox
 
+import analytics
+import autocomplete
+import instrumentation
+from config import ANALYTICS_CONFIG, GUI_CONFIG
+
 # Importing queries from queries.py
 from queries import (
-    get_students_in_major,
+    get_students_in_major_page,
     get_courses_by_department,
-    get_students_in_course,
-    get_top_students,
+    get_students_in_course_page,
+    get_top_students_page,
     get_all_departments,
     get_professors_in_department,
     get_courses_taught_by_lecturers,
@@ -15,12 +22,14 @@ from queries import (
     get_bachelors_degrees,
     get_masters_degrees
 )
+from search import search_records
 
 
 class CustomDialog(simpledialog.Dialog):
-    """Custom Dialog with Larger Font & Styling"""
-    def __init__(self, parent, title, prompt_text):
+    """Custom Dialog with Larger Font & Styling, and name suggestions when a category is given"""
+    def __init__(self, parent, title, prompt_text, category=None):
         self.prompt_text = prompt_text
+        self.category = category  # autocomplete category ("department", "course", "program") or None
         super().__init__(parent, title)
 
     def body(self, master):
@@ -29,11 +38,181 @@ class CustomDialog(simpledialog.Dialog):
         tk.Label(master, text=self.prompt_text, font=("Helvetica", 14, "bold"), bg="#E8E8E8").pack(pady=10)
         self.entry = tk.Entry(master, font=("Helvetica", 14), width=30)
         self.entry.pack(pady=5)
+
+        if self.category:
+            # ✅ Suggestions list: updated as you type; Tab or double-click picks one
+            self.suggestions = tk.Listbox(master, font=("Helvetica", 12), height=6, width=30)
+            self.suggestions.pack(pady=(0, 5))
+            self.entry.bind("<KeyRelease>", self.update_suggestions)
+            self.entry.bind("<Tab>", self.accept_suggestion)
+            self.entry.bind("<Down>", lambda event: self.suggestions.focus_set())
+            self.suggestions.bind("<Double-Button-1>", self.accept_suggestion)
+            self.suggestions.bind("<Return>", self.accept_suggestion)
+            self.update_suggestions()
         return self.entry  # Focus on the entry field automatically
 
+    def update_suggestions(self, event=None):
+        """Show the names starting with the text typed so far."""
+        if event is not None and event.keysym in ("Tab", "Return", "Down"):
+            return
+        try:
+            matches = autocomplete.complete(self.category, self.entry.get().lstrip())
+        except Exception:
+            matches = []  # Suggestions are optional; the query itself reports connection errors
+        self.suggestions.delete(0, tk.END)
+        for name in matches:
+            self.suggestions.insert(tk.END, name)
+
+    def accept_suggestion(self, event=None):
+        """Copy the selected (or first) suggestion into the entry."""
+        selection = self.suggestions.curselection()
+        index = selection[0] if selection else 0
+        if self.suggestions.size():
+            self.entry.delete(0, tk.END)
+            self.entry.insert(0, self.suggestions.get(index))
+            self.entry.focus_set()
+            self.update_suggestions()
+        return "break"  # Keep focus in the dialog instead of moving to the next widget
+
     def apply(self):
-        """Return user input."""
+        """Return user input, using the stored spelling when it names exactly one entry."""
         self.result = self.entry.get()
+        if self.category:
+            try:
+                self.result = autocomplete.resolve(self.category, self.result) or self.result
+            except Exception:
+                pass
+
+
+class VirtualResultView(tk.Frame):
+    """
+    A windowed result grid.
+
+    All rows live in a Python list; the Treeview only ever holds the rows that fit on
+    screen, and scrolling re-fills those same items with a different slice. Memory and
+    redraw cost therefore depend on the window height, not on the number of rows.
+    Clicking a column heading sorts the loaded rows in memory.
+    """
+
+    def __init__(self, master, on_near_end=None):
+        super().__init__(master)
+        self.on_near_end = on_near_end  # Called when the user scrolls close to the last loaded row
+        self.rows = []
+        self.offset = 0
+        self.col_labels = []
+        self.sort_column = None
+        self.sort_reverse = False
+
+        self.tree = ttk.Treeview(self, show="headings", selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)  # Always visible on the right
+
+        self.tree.bind("<Configure>", lambda event: self.render())
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))  # Linux wheel up
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))  # Linux wheel down
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-self.visible_count()))
+        self.tree.bind("<Next>", lambda event: self.scroll_by(self.visible_count()))
+        self.tree.bind("<Home>", lambda event: self.scroll_to(0))
+        self.tree.bind("<End>", lambda event: self.scroll_to(len(self.rows)))
+
+    def set_columns(self, col_labels):
+        """Set the column headers; clicking a header sorts by that column."""
+        self.col_labels = list(col_labels)
+        self.sort_column, self.sort_reverse = None, False  # A new result set starts unsorted
+        self.tree["columns"] = [f"Col{i}" for i in range(1, len(col_labels) + 1)]
+        for i, label in enumerate(col_labels, start=1):
+            self.tree.heading(f"Col{i}", text=label, command=lambda index=i - 1: self.sort_by(index))
+            self.tree.column(f"Col{i}", anchor="center", stretch=True)
+
+    def set_rows(self, rows):
+        """Replace the loaded rows and scroll back to the top."""
+        self.rows = list(rows)
+        self.offset = 0
+        self.render()
+
+    def append_rows(self, rows):
+        """Add rows (e.g. the next page), keeping the current sort order if one is active."""
+        self.rows.extend(rows)
+        if self.sort_column is not None:
+            self._sort_rows()
+        self.render()
+
+    def clear(self):
+        """Remove all rows in one Treeview call."""
+        self.rows = []
+        self.offset = 0
+        self.tree.delete(*self.tree.get_children())
+        self.scrollbar.set(0.0, 1.0)
+
+    def visible_count(self):
+        """Number of rows that fit in the Treeview (minus the heading row)."""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        return max(1, self.tree.winfo_height() // row_height - 1)
+
+    def render(self):
+        """Fill the Treeview with the rows of the current window, reusing existing items."""
+        count = self.visible_count()
+        self.offset = max(0, min(self.offset, len(self.rows) - count))
+        window = self.rows[self.offset:self.offset + count]
+        items = self.tree.get_children()
+        for i, row in enumerate(window):
+            if i < len(items):
+                self.tree.item(items[i], values=row)
+            else:
+                self.tree.insert("", tk.END, values=row)
+        if len(items) > len(window):
+            self.tree.delete(*items[len(window):])
+
+        if self.rows:
+            self.scrollbar.set(self.offset / len(self.rows), (self.offset + len(window)) / len(self.rows))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, offset):
+        """Show the window starting at row `offset`."""
+        self.offset = offset
+        self.tree.selection_remove(self.tree.selection())  # Items are reused, so a selection would move
+        self.render()
+        if self.on_near_end and self.offset + 2 * self.visible_count() >= len(self.rows):
+            self.on_near_end()
+
+    def scroll_by(self, rows):
+        """Scroll by a number of rows (negative scrolls up)."""
+        self.scroll_to(self.offset + rows)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        """Translate scrollbar drags and clicks into a new window offset."""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.rows)))
+        elif unit == "pages":
+            self.scroll_by(int(amount) * self.visible_count())
+        else:
+            self.scroll_by(int(amount))
+
+    def on_mousewheel(self, event):
+        """Scroll three rows per wheel notch (Windows and macOS)."""
+        self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def sort_by(self, index):
+        """Sort the loaded rows by a column; clicking the same column again reverses the order."""
+        if self.sort_column == index:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column, self.sort_reverse = index, False
+        for i, label in enumerate(self.col_labels):
+            arrow = (" ▼" if self.sort_reverse else " ▲") if i == index else ""
+            self.tree.heading(f"Col{i + 1}", text=label + arrow)
+        self._sort_rows()
+        self.scroll_to(0)
+
+    def _sort_rows(self):
+        index = self.sort_column
+        # None sorts last in both directions; values of the same column share a type, so they compare directly
+        present = [row for row in self.rows if row[index] is not None]
+        present.sort(key=lambda row: row[index], reverse=self.sort_reverse)
+        self.rows = present + [row for row in self.rows if row[index] is None]
 
 
 class UniversityGUI(tk.Tk):
@@ -65,18 +244,41 @@ class UniversityGUI(tk.Tk):
         style.configure("Treeview.Heading", font=("Helvetica", 16, "bold"))  # ✅ Bigger headers
         style.configure("Treeview", rowheight=30)  # ✅ Increase row height for better spacing
 
-        # **Scrollable Result Area**
-        self.tree_frame = tk.Frame(self.content_frame)
-        self.tree_frame.pack(fill=tk.BOTH, expand=True)
-
-        self.tree = ttk.Treeview(self.tree_frame, show="headings")
-
-        # ✅ Add a Scrollbar to the Treeview
-        self.scrollbar = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=self.scrollbar.set)
-
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)  # Always visible on the right
+        # **Loading Indicator** (shown while a query runs on a worker thread)
+        self.status_frame = tk.Frame(self.content_frame, bg="white")
+        self.status_label = tk.Label(self.status_frame, font=("Helvetica", 12, "italic"), fg="navy", bg="white")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+        tk.Button(
+            self.status_frame, text="✖ Cancel", command=self.cancel_query,
+            font=("Helvetica", 12, "bold"), bg="#8B0000", fg="white", borderwidth=0, padx=10
+        ).pack(side=tk.RIGHT, padx=10)
+
+        # Queries run on a small thread pool; results come back through a queue polled with after()
+        self.executor = ThreadPoolExecutor(max_workers=GUI_CONFIG["query_workers"], thread_name_prefix="gui-query")
+        self.results_queue = queue.Queue()
+        self.request_id = 0  # Bumped by every new request; results tagged with an older id are stale
+        self.pending = None  # Future of the current request
+        self.on_result = None  # Callback for the current request's result
+        self.polling = False
+        self.protocol("WM_DELETE_WINDOW", self.exit_app)
+        self.executor.submit(autocomplete.complete, "department", "")  # Load the name index in the background
+
+        # **Scrollable Result Area** (only the visible rows are turned into Treeview items)
+        self.results = VirtualResultView(self.content_frame, on_near_end=self.load_more_rows)
+        self.results.pack(fill=tk.BOTH, expand=True)
+
+        # **Pagination Controls** (shown only for paginated queries)
+        self.pager_frame = tk.Frame(self.content_frame, bg="white")
+        self.pager_label = tk.Label(self.pager_frame, font=("Helvetica", 12), bg="white")
+        self.pager_label.pack(side=tk.LEFT, padx=10)
+        self.load_more_button = tk.Button(
+            self.pager_frame, text="⬇ Load more", command=self.load_more_rows,
+            font=("Helvetica", 12, "bold"), bg="#000E4F", fg="white", borderwidth=0, padx=10
+        )
+        self.fetch_page = None
+        self.next_token = None
+        self.rows_shown = 0
+        self.total_rows = None
 
         # ✅ Ensure buttons are created
         self.create_buttons()
@@ -95,6 +297,8 @@ class UniversityGUI(tk.Tk):
             ("🏆 Research Projects", self.show_research_projects),
             ("🎓 Bachelor's Degrees", self.show_bachelors_degrees),
             ("🎓 Master's Degrees", self.show_masters_degrees),
+            ("🔍 Search", self.show_search),
+            ("📊 Grade Analytics", self.show_grade_analytics),
             ("🚪 Exit", self.exit_app)
         ]
 
@@ -115,97 +319,271 @@ class UniversityGUI(tk.Tk):
             separator = tk.Frame(self.menu_frame, height=2, bg="yellow")
             separator.pack(fill=tk.X, padx=10, pady=(0, 5))
 
+    # ----- Background Queries -----
+    def run_query(self, query, on_result, description="results"):
+        """
+        Run `query` (a callable) on a worker thread and pass its result to `on_result` on the Tk thread.
+
+        Starting a new request supersedes the previous one: if it has not started yet it
+        is cancelled, and if it is already running its result is discarded on arrival.
+        """
+        if self.pending is not None:
+            self.pending.cancel()
+        self.request_id += 1
+        request_id = self.request_id
+        self.pending = self.executor.submit(self._run_in_worker, request_id, query, description)
+        self.on_result = on_result
+
+        self.status_label.config(text=f"⏳ Loading {description}...")
+        self.status_frame.pack(fill=tk.X, pady=5, before=self.results)
+        self.config(cursor="watch")
+        if not self.polling:
+            self.polling = True
+            self.after(GUI_CONFIG["poll_interval_ms"], self.poll_results)
+
+    def _run_in_worker(self, request_id, query, description):
+        """Executed on a worker thread; never touches Tk widgets."""
+        try:
+            with instrumentation.action(f"GUI: {description}"):
+                result = query()
+            self.results_queue.put((request_id, result, None))
+        except Exception as e:
+            self.results_queue.put((request_id, None, e))
+
+    def poll_results(self):
+        """Deliver finished results to the main loop, dropping those from superseded requests."""
+        while True:
+            try:
+                request_id, result, error = self.results_queue.get_nowait()
+            except queue.Empty:
+                break
+            if request_id != self.request_id or self.pending is None:
+                continue  # Stale: a newer request was started or this one was cancelled
+            on_result = self.on_result
+            self.finish_query()
+            if error is not None:
+                messagebox.showerror("Query Failed", f"❌ {error}")
+            else:
+                on_result(result)
+
+        if self.pending is not None:
+            self.after(GUI_CONFIG["poll_interval_ms"], self.poll_results)
+        else:
+            self.polling = False
+
+    def cancel_query(self):
+        """Abandon the current request; a query already running on the server finishes but is ignored."""
+        if self.pending is not None:
+            self.pending.cancel()
+            self.request_id += 1
+            self.finish_query()
+
+    def finish_query(self):
+        """Hide the loading indicator."""
+        self.pending = None
+        self.on_result = None
+        self.status_frame.pack_forget()
+        self.config(cursor="")
+
     def clear_tree(self):
         """Clears the tree view before inserting new data."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.results.clear()
 
     def display_data(self, data, col_labels):
         """Displays data in the tree view with descriptive column names."""
         self.clear_tree()
+        self.reset_pager()
 
         if not data:
             messagebox.showinfo("No Results", "No data found.")
             return
 
-        # Set column headers dynamically
-        self.tree["columns"] = [f"Col{i}" for i in range(1, len(col_labels) + 1)]
-        for i, label in enumerate(col_labels, start=1):
-            self.tree.heading(f"Col{i}", text=label)
-            self.tree.column(f"Col{i}", anchor="center", stretch=True)
-
-        # Insert data rows
-        for row in data:
-            self.tree.insert("", tk.END, values=row)
+        # Set column headers dynamically, then hand the rows to the windowed view
+        self.results.set_columns(col_labels)
+        self.results.set_rows(data)
+
+    def display_page(self, fetch_page, col_labels):
+        """
+        Displays the first page of a paginated query; later pages load when the user
+        scrolls near the end of the loaded rows or clicks "Load more".
+
+        fetch_page takes a page token (None for the first page) and returns a queries.Page.
+        """
+        def show_first_page(page):
+            self.display_data(page.rows, col_labels)
+            if page.rows:
+                self.fetch_page = fetch_page
+                self.rows_shown = len(page.rows)
+                self.total_rows = page.total
+                self.next_token = page.next_token
+                self.update_pager()
+
+        self.run_query(lambda: fetch_page(None), show_first_page)
+
+    def load_more_rows(self):
+        """Fetches the next page in the background and appends it to the results."""
+        if not (self.fetch_page and self.next_token) or self.pending is not None:
+            return
+        fetch_page, token = self.fetch_page, self.next_token
+
+        def append_page(page):
+            self.results.append_rows(page.rows)
+            self.rows_shown += len(page.rows)
+            self.next_token = page.next_token
+            self.update_pager()
+
+        self.run_query(lambda: fetch_page(token), append_page, "more rows")
+
+    def update_pager(self):
+        """Shows how many rows are loaded and whether more are available."""
+        total = f" of {self.total_rows}" if self.total_rows is not None else ""
+        self.pager_label.config(text=f"📄 Showing {self.rows_shown}{total}")
+        self.pager_frame.pack(fill=tk.X, pady=5)
+        if self.next_token:
+            self.load_more_button.pack(side=tk.RIGHT, padx=10)
+        else:
+            self.load_more_button.pack_forget()
+
+    def reset_pager(self):
+        """Hides the pagination controls."""
+        self.fetch_page = None
+        self.next_token = None
+        self.rows_shown = 0
+        self.total_rows = None
+        self.pager_frame.pack_forget()
 
     # ----- Query Handlers -----
-    def get_input(self, title, prompt):
-        """Use a **custom pop-up with larger fonts** for input."""
-        dialog = CustomDialog(self, title, prompt)
+    def get_input(self, title, prompt, category=None):
+        """Use a **custom pop-up with larger fonts** for input, with suggestions for `category` names."""
+        dialog = CustomDialog(self, title, prompt, category)
         return dialog.result
 
     def show_students_in_major(self):
-        major = self.get_input("Major", "Enter major name:")
+        major = self.get_input("Major", "Enter major name:", "program")
         if major:
-            data = get_students_in_major(major)
-            self.display_data(data, col_labels=["Student Name"])
+            self.display_page(
+                lambda token: get_students_in_major_page(major, token, include_total=token is None),
+                col_labels=["Student Name"]
+            )
 
     def show_courses_by_dept(self):
-        dept = self.get_input("Department", "Enter department name:")
+        dept = self.get_input("Department", "Enter department name:", "department")
         if dept:
-            data = get_courses_by_department(dept)
-            self.display_data(data, col_labels=["Course Name"])
+            self.run_query(
+                lambda: get_courses_by_department(dept),
+                lambda data: self.display_data(data, col_labels=["Course Name"])
+            )
 
     def show_students_in_course(self):
-        course = self.get_input("Course", "Enter course name:")
+        course = self.get_input("Course", "Enter course name:", "course")
         if course:
-            data = get_students_in_course(course)
-            self.display_data(data, col_labels=["Student Name"])
+            self.display_page(
+                lambda token: get_students_in_course_page(course, token, include_total=token is None),
+                col_labels=["Student Name"]
+            )
 
     def show_top_students(self):
-        data = get_top_students()
-        self.display_data(data, col_labels=["Student Name", "Grade (%)"])
+        self.display_page(
+            lambda token: get_top_students_page(token, include_total=token is None),
+            col_labels=["Student Name", "Grade (%)"]
+        )
 
     def show_all_departments(self):
         """Fetch and display all department names properly."""
-        data = get_all_departments()
-        formatted_data = [(dept,) for dept in data] if data else []
-        self.display_data(formatted_data, col_labels=["Department Name"])
+        self.run_query(
+            get_all_departments,
+            lambda data: self.display_data([(dept,) for dept in data] if data else [], col_labels=["Department Name"])
+        )
 
     def show_professors_in_dept(self):
-        dept = self.get_input("Department", "Enter department name:")
+        dept = self.get_input("Department", "Enter department name:", "department")
         if dept:
-            data = get_professors_in_department(dept)
-            self.display_data(data, col_labels=["Professor Name", "Qualification", "Expertise"])
+            self.run_query(
+                lambda: get_professors_in_department(dept),
+                lambda data: self.display_data(data, col_labels=["Professor Name", "Qualification", "Expertise"])
+            )
 
     def show_courses_by_lecturer_dept(self):
-        dept = self.get_input("Department", "Enter department name:")
+        dept = self.get_input("Department", "Enter department name:", "department")
         if dept:
-            data = get_courses_taught_by_lecturers(dept)
-            self.display_data(data, col_labels=["Lecturer", "Courses"])
+            self.run_query(
+                lambda: get_courses_taught_by_lecturers(dept),
+                lambda data: self.display_data(data, col_labels=["Lecturer", "Courses"])
+            )
 
     def show_staff_in_dept(self):
-        dept = self.get_input("Department", "Enter department name:")
+        dept = self.get_input("Department", "Enter department name:", "department")
         if dept:
-            data = get_staff_in_department(dept)
-            self.display_data(data, col_labels=["Staff Name", "Job Title"])
+            self.run_query(
+                lambda: get_staff_in_department(dept),
+                lambda data: self.display_data(data, col_labels=["Staff Name", "Job Title"])
+            )
 
     def show_research_projects(self):
-        dept = self.get_input("Department", "Enter department name:")
+        dept = self.get_input("Department", "Enter department name:", "department")
         if dept:
-            data = get_research_projects_by_department(dept)
-            self.display_data(data, col_labels=["Project Title", "Principal Investigator", "Funding", "Team Members", "Publications"])
+            self.run_query(
+                lambda: get_research_projects_by_department(dept),
+                lambda data: self.display_data(data, col_labels=["Project Title", "Principal Investigator", "Funding", "Team Members", "Publications"])
+            )
 
     def show_bachelors_degrees(self):
-        data = get_bachelors_degrees()
-        self.display_data(data, col_labels=["Program Name", "Degree", "Duration", "Course Requirements", "Enrollment Details"])
+        self.run_query(
+            get_bachelors_degrees,
+            lambda data: self.display_data(data, col_labels=["Program Name", "Degree", "Duration", "Course Requirements", "Enrollment Details"])
+        )
 
     def show_masters_degrees(self):
-        data = get_masters_degrees()
-        self.display_data(data, col_labels=["Program Name", "Degree", "Duration", "Course Requirements", "Enrollment Details"])
+        self.run_query(
+            get_masters_degrees,
+            lambda data: self.display_data(data, col_labels=["Program Name", "Degree", "Duration", "Course Requirements", "Enrollment Details"])
+        )
+
+    def show_search(self):
+        text = self.get_input("Search", "Search courses, lecturers, research and students:")
+        if text:
+            def fetch_page(token):
+                page = search_records(text, page_token=token, include_total=token is None)
+                rows = [(kind.replace("_", " ").title(), title, detail, round(score, 2))
+                        for kind, _, title, detail, score in page.rows]
+                return page._replace(rows=rows)
+
+            self.display_page(fetch_page, col_labels=["Type", "Name", "Details", "Relevance"])
+
+    def show_grade_analytics(self):
+        """Ask for a grouping and threshold, then show grade statistics per group (blank answers use the defaults)."""
+        by = self.get_input("Grade Analytics", "Group by (program, year or program_year):")
+        if by is None:
+            return  # Cancelled
+        by = by.strip().lower() or "program"
+        if by not in analytics.GROUPINGS:
+            messagebox.showerror("Invalid Grouping", f"❌ '{by}' is not one of {', '.join(analytics.GROUPINGS)}.")
+            return
+        threshold = self.get_input("Grade Analytics", f"Grade threshold (default {ANALYTICS_CONFIG['default_threshold']}):")
+        if threshold is None:
+            return
+        try:
+            threshold = float(threshold) if threshold.strip() else None
+        except ValueError:
+            messagebox.showerror("Invalid Threshold", f"❌ '{threshold}' is not a number.")
+            return
+
+        def compute():
+            return [
+                (analytics.format_group(row.group, by), row.students, round(row.mean, 1), round(row.std, 1),
+                 round(row.median, 1), round(row.minimum, 1), round(row.maximum, 1), f"{row.above_share:.0%}")
+                for row in analytics.group_statistics(by, threshold)
+            ]
+
+        self.run_query(
+            compute,
+            lambda data: self.display_data(data, col_labels=["Group", "Students", "Mean", "Std", "Median", "Min", "Max", "Above Threshold"]),
+            "grade analytics"
+        )
 
     def exit_app(self):
         """Exit the application."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
         self.destroy()
 
 
@@ -0,0 +1,332 @@
+"""
+importer.py
+
+Validated, resumable CSV import for students, lecturers, courses, enrollments and staff.
+
+A CSV file with a header of column names is read in chunks of IMPORT_CONFIG["chunk_rows"]
+rows. Each chunk is validated column by column with NumPy (required values, numbers,
+string lengths and foreign keys, the latter with one IN query per referenced table), and
+the valid rows are upserted with INSERT ... ON DUPLICATE KEY UPDATE via
+loader.insert_rows(). Column types, keys and foreign keys come from models.py.
+
+After every committed chunk a checkpoint (<file>.checkpoint.json) records how far the
+import got, so running the same import again after a failure continues from there. Rows
+that fail validation are written to <file>.rejected.csv with their line number and the
+reasons.
+
+Usage:
+    python src/importer.py students data/new_students.csv
+    python src/importer.py enrollments data/enrollments.csv --restart
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from sqlalchemy import Float, Integer, String
+
+import loader
+from config import IMPORT_CONFIG
+from database import connect
+from models import Base
+
+# Importable record types and their tables, in an order that satisfies foreign keys
+ENTITY_TABLES = {
+    "lecturers": "lecturers",
+    "courses": "courses",
+    "students": "students",
+    "staff": "non_academic_staff",
+    "enrollments": "enrollments",
+}
+
+# Keys per IN (...) query when checking foreign keys
+KEY_LOOKUP_BATCH = 1000
+
+ImportResult = namedtuple("ImportResult", ["imported", "rejected", "report", "resumed_from", "seconds"])
+
+# How a column is validated: kind is "int", "float" or "str"; max_length applies to str;
+# references is (table, column) for foreign keys
+ColumnRule = namedtuple("ColumnRule", ["name", "kind", "required", "max_length", "references"])
+
+
+def column_rules(table):
+    """Derive validation rules for every column of `table` from the SQLAlchemy models."""
+    rules = {}
+    for column in Base.metadata.tables[table].columns:
+        if isinstance(column.type, Integer):
+            kind, max_length = "int", None
+        elif isinstance(column.type, Float):
+            kind, max_length = "float", None
+        else:
+            kind, max_length = "str", getattr(column.type, "length", None) if isinstance(column.type, String) else None
+        references = None
+        for foreign_key in column.foreign_keys:
+            references = (foreign_key.column.table.name, foreign_key.column.name)
+        required = column.primary_key or not column.nullable
+        rules[column.name] = ColumnRule(column.name, kind, required, max_length, references)
+    return rules
+
+
+def _parse_numbers(texts, empty, integer):
+    """
+    Parse a column of strings as numbers in one NumPy conversion.
+
+    Returns:
+        tuple: (object array of int/float/None, boolean mask of unparseable values).
+    """
+    filled = np.where(empty, "0", texts)
+    bad = np.zeros(len(texts), dtype=bool)
+    try:
+        numbers = filled.astype(np.float64)
+    except ValueError:
+        # Only a chunk containing bad values pays for parsing value by value
+        numbers = np.zeros(len(texts))
+        for i, text in enumerate(filled):
+            try:
+                numbers[i] = float(text)
+            except ValueError:
+                bad[i] = True
+    bad |= ~np.isfinite(numbers)
+    if integer:
+        bad |= np.mod(numbers, 1) != 0
+        converted = np.where(bad, 0, numbers).astype(np.int64)
+    else:
+        converted = numbers
+    values = np.array(converted.tolist(), dtype=object)
+    values[empty | bad] = None
+    return values, bad & ~empty
+
+
+def validate_chunk(rules, header, records, lookup_keys):
+    """
+    Validate a chunk of CSV records.
+
+    Args:
+        rules (dict): column_rules() of the target table.
+        header (list): Column names in record order.
+        records (list): Lists of strings, one per CSV row.
+        lookup_keys (callable): (table, column, keys) -> set of those keys that exist.
+
+    Returns:
+        tuple: (valid rows as tuples in header order, list of (index, reasons) for rejected records).
+    """
+    count = len(records)
+    if not count:
+        return [], []
+    problems = [[] for _ in range(count)]
+
+    def reject(mask, message):
+        for index in np.flatnonzero(mask):
+            problems[index].append(message)
+
+    values = {}
+    for position, name in enumerate(header):
+        rule = rules[name]
+        texts = np.char.strip(np.array([record[position] if position < len(record) else "" for record in records], dtype=str))
+        empty = texts == ""
+        if rule.required:
+            reject(empty, f"{name} is required")
+        if rule.kind in ("int", "float"):
+            parsed, bad = _parse_numbers(texts, empty, rule.kind == "int")
+            reject(bad, f"{name} must be {'an integer' if rule.kind == 'int' else 'a number'}")
+        else:
+            if rule.max_length:
+                reject(np.char.str_len(texts) > rule.max_length, f"{name} is longer than {rule.max_length} characters")
+            parsed = texts.astype(object)
+            parsed[empty] = None
+        values[name] = parsed
+
+    for name in header:
+        rule = rules[name]
+        if rule.references is None:
+            continue
+        column = values[name]
+        present = np.array([value is not None for value in column], dtype=bool)
+        keys = set(column[present].tolist())
+        existing = lookup_keys(rule.references[0], rule.references[1], keys) if keys else set()
+        missing = present & ~np.isin(column, list(existing) or [None])
+        reject(missing, f"{name} does not match any {rule.references[0]}.{rule.references[1]}")
+
+    valid = np.array([not reasons for reasons in problems], dtype=bool)
+    rows = list(zip(*(values[name][valid].tolist() for name in header)))
+    rejected = [(index, problems[index]) for index in np.flatnonzero(~valid)]
+    return rows, rejected
+
+
+def database_key_lookup(conn):
+    """Return a lookup_keys() function that checks keys against the database on `conn`."""
+    def lookup_keys(table, column, keys):
+        found = set()
+        keys = list(keys)
+        with conn.cursor() as cursor:
+            for start in range(0, len(keys), KEY_LOOKUP_BATCH):
+                batch = keys[start:start + KEY_LOOKUP_BATCH]
+                cursor.execute(
+                    f"SELECT {loader._quote_identifier(column)} FROM {loader._quote_identifier(table)} "
+                    f"WHERE {loader._quote_identifier(column)} IN ({', '.join(['%s'] * len(batch))})",
+                    batch
+                )
+                found.update(row[0] for row in cursor.fetchall())
+        return found
+    return lookup_keys
+
+
+def checkpoint_path(path):
+    """Path of the checkpoint file kept next to an import file."""
+    return path + ".checkpoint.json"
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def read_checkpoint(path, table):
+    """Return the saved checkpoint for importing `path` into `table`, or None if there is no usable one."""
+    try:
+        with open(checkpoint_path(path), encoding="utf-8") as file:
+            checkpoint = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get("table") != table or checkpoint.get("file") != _file_signature(path):
+        return None  # A different import, or the file has changed since
+    return checkpoint
+
+
+def _write_checkpoint(path, checkpoint):
+    temporary = checkpoint_path(path) + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+    os.replace(temporary, checkpoint_path(path))
+
+
+def import_csv(path, entity, conn=None, chunk_rows=None, resume=True, report_path=None, progress=None):
+    """
+    Import a CSV file of students, lecturers, courses, enrollments or staff.
+
+    Args:
+        path (str): CSV file whose first line names the columns.
+        entity (str): One of ENTITY_TABLES.
+        conn: Connection to use; a dedicated connection is opened (and closed) when omitted.
+        chunk_rows (int): Rows validated and committed together.
+        resume (bool): Continue from a matching checkpoint instead of starting over.
+        report_path (str): Rejected-rows CSV; <path>.rejected.csv by default.
+        progress (callable): Progress callback; defaults to a loader.ProgressReporter. Pass False to disable.
+
+    Returns:
+        ImportResult: Rows upserted and rejected in this run (plus earlier runs when
+        resuming), the report path (None if nothing was rejected), the row the import
+        resumed from and the elapsed time.
+
+    Raises:
+        ValueError: For an unknown entity, or a header with unknown or missing required columns.
+    """
+    if entity not in ENTITY_TABLES:
+        raise ValueError(f"Unknown entity {entity!r}; expected one of {', '.join(ENTITY_TABLES)}")
+    table = ENTITY_TABLES[entity]
+    rules = column_rules(table)
+    chunk_rows = chunk_rows or IMPORT_CONFIG["chunk_rows"]
+    report_path = report_path or path + ".rejected.csv"
+    if progress is None:
+        progress = loader.ProgressReporter(f"Importing {os.path.basename(path)}")
+
+    checkpoint = read_checkpoint(path, table) if resume else None
+    if checkpoint is None:
+        checkpoint = {"table": table, "file": _file_signature(path), "rows_done": 0, "imported": 0, "rejected": 0}
+        if os.path.exists(report_path):
+            os.remove(report_path)
+    resumed_from = checkpoint["rows_done"]
+
+    own_connection = conn is None
+    if own_connection:
+        conn = connect()
+    lookup_keys = database_key_lookup(conn)
+    started = time.perf_counter()
+    report_file = report_writer = None
+
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            reader = csv.reader(file)
+            header = [name.strip() for name in next(reader, [])]
+            unknown = [name for name in header if name not in rules]
+            if unknown:
+                raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+            missing = [rule.name for rule in rules.values() if rule.required and rule.name not in header]
+            if missing:
+                raise ValueError(f"Missing required column(s) for {table}: {', '.join(missing)}")
+            keys = [rule.name for rule in rules.values() if Base.metadata.tables[table].columns[rule.name].primary_key]
+            # Overwrite the non-key columns present in the file; a key-only table needs a no-op update
+            updates = [name for name in header if name not in keys] or keys[:1]
+
+            for _ in range(resumed_from):
+                next(reader, None)
+            line_number = resumed_from + 1  # The header is line 1
+
+            while True:
+                records = [record for _, record in zip(range(chunk_rows), reader)]
+                if not records:
+                    break
+                rows, rejected = validate_chunk(rules, header, records, lookup_keys)
+                if rows:
+                    loader.insert_rows(conn, table, header, rows, on_duplicate_update=updates)  # Commits
+                if rejected:
+                    if report_writer is None:
+                        new_report = not os.path.exists(report_path)
+                        report_file = open(report_path, "a", newline="", encoding="utf-8")
+                        report_writer = csv.writer(report_file)
+                        if new_report:
+                            report_writer.writerow(["line", "errors"] + header)
+                    report_writer.writerows(
+                        [line_number + 1 + index, "; ".join(reasons)] + records[index] for index, reasons in rejected
+                    )
+                    report_file.flush()
+
+                checkpoint["rows_done"] += len(records)
+                checkpoint["imported"] += len(rows)
+                checkpoint["rejected"] += len(rejected)
+                _write_checkpoint(path, checkpoint)
+                line_number += len(records)
+                if progress:
+                    progress(rows=checkpoint["rows_done"] - resumed_from)
+    finally:
+        if report_file is not None:
+            report_file.close()
+        if own_connection:
+            conn.close()
+
+    os.remove(checkpoint_path(path))  # Finished: the next run starts from the top
+    if progress:
+        progress(rows=checkpoint["rows_done"] - resumed_from, force=True)
+    return ImportResult(
+        checkpoint["imported"], checkpoint["rejected"], report_path if checkpoint["rejected"] else None,
+        resumed_from, time.perf_counter() - started
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate and upsert a CSV file of university records.")
+    parser.add_argument("entity", choices=list(ENTITY_TABLES))
+    parser.add_argument("path", help="CSV file with a header line of column names")
+    parser.add_argument("--chunk-rows", type=int, help="Rows validated and committed together")
+    parser.add_argument("--restart", action="store_true", help="Ignore any checkpoint and import from the first row")
+    parser.add_argument("--report", help="Where to write rejected rows (default: <path>.rejected.csv)")
+    args = parser.parse_args()
+
+    try:
+        result = import_csv(args.path, args.entity, chunk_rows=args.chunk_rows, resume=not args.restart, report_path=args.report)
+    except ValueError as e:
+        parser.error(str(e))
+    if result.resumed_from:
+        print(f"↪️ Resumed after row {result.resumed_from:,}")
+    print(f"✅ Imported {result.imported:,} rows into {ENTITY_TABLES[args.entity]} in {result.seconds:.1f}s")
+    if result.rejected:
+        print(f"⚠️ {result.rejected:,} rows rejected; see {result.report}")
@@ -0,0 +1,246 @@
+"""
+instrumentation.py
+
+In-process statistics for the queries the application runs.
+
+query_registry.run_query() and database.stream_rows() report every execution here with
+its wall time, rows returned, the time spent waiting for a pooled connection, the
+function in queries.py (or search.py, ...) that ran it and the user action it belongs
+to (a CLI menu choice or GUI button, see action()). Per query the module keeps counts,
+totals and a latency histogram with fixed buckets, so recording costs a lock and a few
+additions. Executions slower than INSTRUMENTATION_CONFIG["slow_query_ms"] are appended to
+a JSON-lines slow-query log. Query parameters are never logged, as they contain names.
+"""
+
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from config import INSTRUMENTATION_CONFIG
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# Functions between a query function and the database that are never reported as the caller
+_PLUMBING = ("wrapper", "stream_rows")
+
+_local = threading.local()
+_lock = threading.Lock()
+_stats = {}
+_slow_log_lock = threading.Lock()
+
+
+class QueryStats:
+    """Running totals and a latency histogram for one query."""
+
+    __slots__ = ("calls", "errors", "rows", "total_time", "max_time", "wait_time", "buckets", "callers", "actions")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.wait_time = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.callers = {}
+        self.actions = {}
+
+    def percentile(self, fraction):
+        """Estimate a latency percentile (ms) as the upper bound of the bucket that contains it."""
+        if not self.calls:
+            return 0.0
+        target = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target and count:
+                if index < len(BUCKET_BOUNDS_MS):
+                    return float(BUCKET_BOUNDS_MS[index])
+                break
+        return self.max_time * 1000
+
+    def summary(self):
+        """Return the statistics as a plain dictionary (times in milliseconds)."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": self.total_time * 1000,
+            "avg_ms": self.total_time * 1000 / self.calls if self.calls else 0.0,
+            "max_ms": self.max_time * 1000,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "avg_wait_ms": self.wait_time * 1000 / self.calls if self.calls else 0.0,
+            "callers": dict(self.callers),
+            "actions": dict(self.actions),
+            "histogram": dict(zip([f"<={bound}ms" for bound in BUCKET_BOUNDS_MS] + ["slower"], self.buckets))
+        }
+
+
+def enabled():
+    """True when queries should be timed."""
+    return INSTRUMENTATION_CONFIG["enabled"]
+
+
+@contextmanager
+def action(label):
+    """Attribute the queries run on this thread inside the block to a user action, e.g. "CLI: List all departments"."""
+    previous = getattr(_local, "action", None)
+    _local.action = label
+    try:
+        yield
+    finally:
+        _local.action = previous
+
+
+def set_action(label):
+    """
+    Attribute the queries run on this thread from now on to a user action (None clears it).
+
+    For loops such as the CLI menu, where a with action(...) block would have to wrap the
+    whole body.
+    """
+    _local.action = label
+
+
+def note_connection_wait(seconds):
+    """Called by the connection pool after a checkout; charged to the next query on this thread."""
+    _local.wait = seconds
+
+
+def calling_function(depth=2):
+    """
+    Name of the public function that issued a query: the first caller `depth` frames up
+    whose name does not start with an underscore (skipping helpers such as _fetch_page),
+    is not a comprehension or generator expression and is not part of the plumbing
+    (the cache wrapper, stream_rows).
+    """
+    frame = sys._getframe(depth)
+    while frame is not None and (frame.f_code.co_name.startswith(("_", "<")) or frame.f_code.co_name in _PLUMBING):
+        frame = frame.f_back
+    return frame.f_code.co_name if frame is not None else "?"
+
+
+def record(name, elapsed, rows, caller=None, error=False):
+    """
+    Record one execution of query `name`.
+
+    Args:
+        name (str): Registered query name.
+        elapsed (float): Wall time in seconds.
+        rows (int): Rows returned (or affected).
+        caller (str): Function that ran the query.
+        error (bool): True if the query raised.
+    """
+    wait = getattr(_local, "wait", 0.0)
+    current_action = getattr(_local, "action", None)
+    _local.wait = 0.0  # A checkout's wait is charged once, to its first query
+    elapsed_ms = elapsed * 1000
+    bucket = bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = QueryStats()
+        stats.calls += 1
+        stats.errors += error
+        stats.rows += max(rows or 0, 0)
+        stats.total_time += elapsed
+        stats.wait_time += wait
+        if elapsed > stats.max_time:
+            stats.max_time = elapsed
+        stats.buckets[bucket] += 1
+        if caller:
+            stats.callers[caller] = stats.callers.get(caller, 0) + 1
+        if current_action:
+            stats.actions[current_action] = stats.actions.get(current_action, 0) + 1
+
+    threshold = INSTRUMENTATION_CONFIG["slow_query_ms"]
+    if threshold is not None and elapsed_ms >= threshold:
+        _log_slow_query(name, elapsed_ms, rows, wait * 1000, caller, current_action, error)
+
+
+def slow_log_path():
+    """Absolute path of the slow-query log."""
+    return os.path.join(BASE_DIR, INSTRUMENTATION_CONFIG["slow_query_log"])
+
+
+def _log_slow_query(name, elapsed_ms, rows, wait_ms, caller, current_action, error):
+    entry = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "query": name,
+        "elapsed_ms": round(elapsed_ms, 3),
+        "rows": rows,
+        "connection_wait_ms": round(wait_ms, 3),
+        "caller": caller,
+        "action": current_action,
+        "error": error
+    }
+    try:
+        with _slow_log_lock, open(slow_log_path(), "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass  # Logging must never break a query
+
+
+@contextmanager
+def timed(name, caller=None):
+    """
+    Time a block as one execution of `name`. The block may set `counter["rows"]`.
+
+    Example:
+        with instrumentation.timed("students_in_major") as counter:
+            cursor.execute(...)
+            counter["rows"] = cursor.rowcount
+    """
+    counter = {"rows": 0}
+    start = time.perf_counter()
+    try:
+        yield counter
+    except BaseException:
+        record(name, time.perf_counter() - start, counter["rows"], caller, error=True)
+        raise
+    record(name, time.perf_counter() - start, counter["rows"], caller)
+
+
+def get_query_stats():
+    """
+    Return statistics for every query run so far in this process.
+
+    Returns:
+        dict: Query name -> QueryStats.summary(), slowest total time first.
+    """
+    with _lock:
+        summaries = {name: stats.summary() for name, stats in _stats.items()}
+    return dict(sorted(summaries.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+
+
+def reset_query_stats():
+    """Forget all recorded statistics."""
+    with _lock:
+        _stats.clear()
+
+
+def format_query_stats(stats=None):
+    """Format get_query_stats() as a text table for the CLI."""
+    stats = get_query_stats() if stats is None else stats
+    if not stats:
+        return "No queries have run yet."
+    header = f"{'Query':<34} {'Calls':>6} {'Rows':>8} {'Avg ms':>8} {'p95 ms':>8} {'Max ms':>8} {'Wait ms':>8}"
+    lines = [header, "-" * len(header)]
+    for name, row in stats.items():
+        lines.append(
+            f"{name[:34]:<34} {row['calls']:>6} {row['rows']:>8} {row['avg_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['max_ms']:>8.1f} {row['avg_wait_ms']:>8.2f}"
+        )
+        callers = ", ".join(f"{caller} ({count})" for caller, count in row["callers"].items())
+        if callers:
+            lines.append(f"    called by: {callers}")
+    return "\n".join(lines)
@@ -0,0 +1,438 @@
+"""
+loader.py
+
+Bulk loading helpers for the University Record Management System.
+
+- iter_sql_statements() streams statements out of a SQL file without reading it all into
+  memory, and only splits on semicolons outside string literals and comments.
+- execute_sql_file() runs those statements, merging consecutive single-table INSERTs into
+  multi-row statements and committing in batches.
+- insert_rows() writes Python rows with executemany.
+- load_delimited_file() loads CSV/TSV files through LOAD DATA LOCAL INFILE, the fastest
+  path for large datasets.
+"""
+
+import os
+import re
+import sys
+import time
+
+import pymysql
+from cache import invalidate_tables, table_written_by
+from config import LOADER_CONFIG
+from database import connect
+
+# Characters that change the tokenizer state outside of a string or comment
+_NORMAL_SPECIAL = re.compile(r"['\"`;#]|--(?=[ \t\r\n]|$)|/\*")
+_BLOCK_END = re.compile(r"\*/")
+_QUOTE_SPECIAL = {
+    "'": re.compile(r"\\|'"),
+    '"': re.compile(r'\\|"'),
+    "`": re.compile(r"`")  # Backslash is not an escape inside identifiers
+}
+
+_INSERT_VALUES = re.compile(
+    r"^(INSERT\s+(?:IGNORE\s+)?INTO\s+[`\w.]+\s*(?:\([^)]*\))?\s*VALUES)\s*(\(.*\))$",
+    re.IGNORECASE | re.DOTALL
+)
+_ON_DUPLICATE = re.compile(r"\)\s*ON\s+DUPLICATE\s+KEY\s+UPDATE", re.IGNORECASE)
+_IDENTIFIER = re.compile(r"^\w+$")
+
+
+class SQLTokenizer:
+    """
+    Incremental splitter that turns lines of SQL text into complete statements.
+
+    Quotes (', ", `) with backslash or doubled-quote escapes, `-- ` and `#` line comments,
+    and /* */ block comments are tracked across lines. Comments are dropped, except MySQL
+    executable comments (/*! ... */), which are kept as part of the statement.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self._quote = None  # Active quote character, if inside a string
+        self._in_comment = False  # Inside a /* */ comment that is being dropped
+        self._in_kept_comment = False  # Inside a /*! */ comment that is being kept
+
+    def feed(self, line):
+        """Consume one line of text and return the statements it completes."""
+        statements = []
+        pos = 0
+        length = len(line)
+
+        while pos < length:
+            if self._in_comment or self._in_kept_comment:
+                match = _BLOCK_END.search(line, pos)
+                end = match.end() if match else length
+                if self._in_kept_comment:
+                    self._parts.append(line[pos:end])
+                if match:
+                    self._in_comment = self._in_kept_comment = False
+                pos = end
+                continue
+
+            if self._quote:
+                match = _QUOTE_SPECIAL[self._quote].search(line, pos)
+                if not match:
+                    self._parts.append(line[pos:])
+                    break
+                if match.group() == "\\":
+                    # Keep the escape and the escaped character together
+                    self._parts.append(line[pos:match.end() + 1])
+                    pos = match.end() + 1
+                elif line.startswith(self._quote, match.end()):
+                    # Doubled quote ('') is an escaped quote, not the end of the string
+                    self._parts.append(line[pos:match.end() + 1])
+                    pos = match.end() + 1
+                else:
+                    self._parts.append(line[pos:match.end()])
+                    self._quote = None
+                    pos = match.end()
+                continue
+
+            match = _NORMAL_SPECIAL.search(line, pos)
+            if not match:
+                self._parts.append(line[pos:])
+                break
+            self._parts.append(line[pos:match.start()])
+            token = match.group()
+            if token == ";":
+                statement = "".join(self._parts).strip()
+                self._parts = []
+                if statement:
+                    statements.append(statement)
+                pos = match.end()
+            elif token in ("--", "#"):
+                # Line comment: skip to the end of the line but keep the line break
+                self._parts.append("\n")
+                break
+            elif token == "/*":
+                if line.startswith("!", match.end()):
+                    self._in_kept_comment = True
+                    self._parts.append(token)
+                else:
+                    self._in_comment = True
+                    self._parts.append(" ")
+                pos = match.end()
+            else:
+                self._quote = token
+                self._parts.append(token)
+                pos = match.end()
+
+        return statements
+
+    def close(self):
+        """Return any trailing statement that was not terminated by a semicolon."""
+        statement = "".join(self._parts).strip()
+        self._parts = []
+        return [statement] if statement else []
+
+
+def iter_sql_statements(lines):
+    """
+    Yield complete SQL statements from an iterable of text lines (e.g. an open file).
+
+    Args:
+        lines (iterable): Lines of SQL text, including their line endings.
+
+    Yields:
+        str: Each statement without its terminating semicolon or comments.
+    """
+    tokenizer = SQLTokenizer()
+    for line in lines:
+        yield from tokenizer.feed(line)
+    yield from tokenizer.close()
+
+
+def coalesce_inserts(statements, max_rows=None, max_bytes=None):
+    """
+    Merge consecutive `INSERT ... VALUES` statements for the same table and columns.
+
+    Multi-row INSERTs are sent to the server in one round trip and parsed once, which is
+    much faster than executing one statement per row. Statements that are not plain
+    VALUES inserts (INSERT ... SELECT, ON DUPLICATE KEY UPDATE, DDL, ...) pass through
+    unchanged and flush any pending merge.
+
+    Args:
+        statements (iterable): SQL statements, e.g. from iter_sql_statements().
+        max_rows (int): Maximum number of merged statements per INSERT.
+        max_bytes (int): Approximate size limit of a merged INSERT (keep below max_allowed_packet).
+
+    Yields:
+        tuple: (sql, statement_count) where statement_count is how many input statements
+        the yielded SQL covers.
+    """
+    max_rows = max_rows or LOADER_CONFIG["insert_batch_rows"]
+    max_bytes = max_bytes or LOADER_CONFIG["max_statement_bytes"]
+    header = None
+    values = []
+    size = 0
+
+    for statement in statements:
+        match = _INSERT_VALUES.match(statement)
+        if not match or _ON_DUPLICATE.search(statement):
+            if values:
+                yield f"{header} {', '.join(values)}", len(values)
+                header, values, size = None, [], 0
+            yield statement, 1
+            continue
+
+        statement_header, body = " ".join(match.group(1).split()), match.group(2)
+        if values and (statement_header != header or len(values) >= max_rows or size + len(body) > max_bytes):
+            yield f"{header} {', '.join(values)}", len(values)
+            values, size = [], 0
+        header = statement_header
+        values.append(body)
+        size += len(body)
+
+    if values:
+        yield f"{header} {', '.join(values)}", len(values)
+
+
+class ProgressReporter:
+    """Prints throttled progress lines for long-running loads."""
+
+    def __init__(self, label, total_bytes=None, interval=None, stream=None):
+        self.label = label
+        self.total_bytes = total_bytes
+        self.interval = LOADER_CONFIG["progress_interval"] if interval is None else interval
+        self.stream = stream or sys.stdout
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def __call__(self, bytes_done=None, statements=0, rows=0, force=False):
+        """Report progress, at most once per interval unless `force` is set."""
+        now = time.perf_counter()
+        if not force and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+        elapsed = now - self.started
+        parts = [f"⏳ {self.label}:"]
+        if bytes_done is not None and self.total_bytes:
+            parts.append(f"{100 * bytes_done / self.total_bytes:5.1f}%")
+        if statements:
+            parts.append(f"{statements:,} statements")
+        if rows:
+            parts.append(f"{rows:,} rows ({rows / elapsed if elapsed else 0:,.0f}/s)")
+        parts.append(f"{elapsed:.1f}s elapsed")
+        print(" ".join(parts), file=self.stream, flush=True)
+
+
+def execute_sql_file(filename, conn=None, commit_every=None, progress=None):
+    """
+    Stream a SQL file into the database.
+
+    Args:
+        filename (str): Path to the SQL file.
+        conn: Connection to use. A dedicated, unpooled connection is opened (and closed)
+            when omitted, so session settings from the script do not leak into the pool.
+        commit_every (int): Commit after this many executed statements.
+        progress (callable): Progress callback; defaults to a ProgressReporter. Pass False to disable.
+
+    Returns:
+        int: The number of source statements executed.
+    """
+    commit_every = commit_every or LOADER_CONFIG["commit_every"]
+    if progress is None:
+        progress = ProgressReporter(os.path.basename(filename), os.path.getsize(filename))
+    own_connection = conn is None
+    if own_connection:
+        conn = connect()
+
+    state = {"bytes": 0}
+
+    def lines():
+        with open(filename, "rb") as file:
+            for raw in file:
+                state["bytes"] += len(raw)
+                yield raw.decode("utf-8")
+
+    executed = 0
+    pending = 0
+    written = set()
+    try:
+        with conn.cursor() as cursor:
+            for sql, count in coalesce_inserts(iter_sql_statements(lines())):
+                cursor.execute(sql)
+                executed += count
+                pending += 1
+                table = table_written_by(sql)
+                if table:
+                    written.add(table)
+                if pending >= commit_every:
+                    conn.commit()
+                    pending = 0
+                if progress:
+                    progress(bytes_done=state["bytes"], statements=executed)
+        conn.commit()
+        if progress:
+            progress(bytes_done=state["bytes"], statements=executed, force=True)
+        return executed
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        # Earlier batches may have been committed even if a later one failed
+        invalidate_tables(*written)
+        if own_connection:
+            conn.close()
+
+
+def _quote_identifier(name):
+    """Backtick-quote a table or column name after checking it is a plain identifier."""
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return f"`{name}`"
+
+
+def insert_rows(conn, table, columns, rows, batch_size=None, commit_every=None, on_duplicate_update=None, progress=None):
+    """
+    Insert an iterable of row tuples with executemany, committing in batches.
+
+    pymysql rewrites each executemany() batch into a single multi-row INSERT, so rows
+    are sent in large packets rather than one round trip each.
+
+    Args:
+        conn: Database connection.
+        table (str): Target table.
+        columns (list): Column names, in row order.
+        rows (iterable): Row tuples; consumed lazily.
+        batch_size (int): Rows per executemany() call.
+        commit_every (int): Commit after this many batches.
+        on_duplicate_update (list): Columns to overwrite when the key already exists
+            (INSERT ... ON DUPLICATE KEY UPDATE). Plain INSERT when omitted.
+        progress (callable): Optional progress callback.
+
+    Returns:
+        int: The number of rows sent.
+    """
+    batch_size = batch_size or LOADER_CONFIG["insert_batch_rows"]
+    commit_every = commit_every or LOADER_CONFIG["commit_every"]
+    column_list = ", ".join(_quote_identifier(column) for column in columns)
+    placeholders = ", ".join(["%s"] * len(columns))
+    sql = f"INSERT INTO {_quote_identifier(table)} ({column_list}) VALUES ({placeholders})"
+    if on_duplicate_update:
+        updates = ", ".join(f"{_quote_identifier(c)} = VALUES({_quote_identifier(c)})" for c in on_duplicate_update)
+        sql += f" ON DUPLICATE KEY UPDATE {updates}"
+
+    total = 0
+    batches = 0
+    batch = []
+    with conn.cursor() as cursor:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                cursor.executemany(sql, batch)
+                total += len(batch)
+                batch = []
+                batches += 1
+                if batches % commit_every == 0:
+                    conn.commit()
+                if progress:
+                    progress(rows=total)
+        if batch:
+            cursor.executemany(sql, batch)
+            total += len(batch)
+    conn.commit()
+    invalidate_tables(table)
+    if progress:
+        progress(rows=total, force=True)
+    return total
+
+
+def format_tsv_value(value):
+    """Encode one value in the default LOAD DATA text format (tab-separated, \\N for NULL)."""
+    if value is None:
+        return "\\N"
+    text = str(value)
+    if any(ch in text for ch in "\\\t\n\r\0"):
+        text = (text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+                    .replace("\r", "\\r").replace("\0", "\\0"))
+    return text
+
+
+def format_tsv_row(row):
+    """Encode a row as one line of a TSV file readable by load_delimited_file()."""
+    return "\t".join(format_tsv_value(value) for value in row) + "\n"
+
+
+def load_delimited_file(path, table, columns=None, fmt="tsv", header=False, conn=None, replace=False, commit=True):
+    """
+    Bulk load a CSV or TSV file with LOAD DATA LOCAL INFILE.
+
+    TSV files use MySQL's default text format (see format_tsv_row()); CSV files follow
+    RFC 4180 quoting. Both must use LF line endings.
+
+    Args:
+        path (str): File to load.
+        table (str): Target table.
+        columns (list): Column names in file order; all table columns when omitted.
+        fmt (str): "tsv" or "csv".
+        header (bool): Skip the first line of the file.
+        conn: Connection opened with local_infile=True; one is opened when omitted.
+        replace (bool): Replace rows with duplicate keys instead of failing on them.
+        commit (bool): Commit when done. Pass False to leave the rows in the caller's
+            transaction; the caller then commits (or rolls back) and invalidates the cache.
+
+    Returns:
+        int: The number of rows loaded.
+    """
+    if fmt == "tsv":
+        format_clause = "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'"
+    elif fmt == "csv":
+        format_clause = "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' LINES TERMINATED BY '\\n'"
+    else:
+        raise ValueError(f"Unsupported format: {fmt!r}")
+
+    sql = (
+        f"LOAD DATA LOCAL INFILE %s {'REPLACE' if replace else ''} INTO TABLE {_quote_identifier(table)} "
+        f"CHARACTER SET utf8mb4 {format_clause}"
+    )
+    if header:
+        sql += " IGNORE 1 LINES"
+    if columns:
+        sql += " (" + ", ".join(_quote_identifier(column) for column in columns) + ")"
+
+    own_connection = conn is None
+    if own_connection:
+        conn = connect(local_infile=True)
+    try:
+        with conn.cursor() as cursor:
+            rows = cursor.execute(sql, (os.path.abspath(path),))
+        if commit:
+            conn.commit()
+            invalidate_tables(table)
+        return rows
+    except pymysql.MySQLError:
+        if commit:
+            conn.rollback()
+        raise
+    finally:
+        if own_connection:
+            conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk load a SQL, CSV or TSV file into the database.")
+    parser.add_argument("path", help="File to load (.sql, .csv or .tsv)")
+    parser.add_argument("--table", help="Target table for CSV/TSV files")
+    parser.add_argument("--columns", help="Comma-separated column names in file order")
+    parser.add_argument("--header", action="store_true", help="Skip the first line of a CSV/TSV file")
+    parser.add_argument("--commit-every", type=int, help="Statements per transaction for SQL files")
+    args = parser.parse_args()
+
+    extension = os.path.splitext(args.path)[1].lower().lstrip(".")
+    started = time.perf_counter()
+    if extension == "sql":
+        count = execute_sql_file(args.path, commit_every=args.commit_every)
+        print(f"✅ Executed {count:,} statements in {time.perf_counter() - started:.1f}s")
+    elif extension in ("csv", "tsv"):
+        if not args.table:
+            parser.error("--table is required for CSV/TSV files")
+        columns = args.columns.split(",") if args.columns else None
+        count = load_delimited_file(args.path, args.table, columns, fmt=extension, header=args.header)
+        print(f"✅ Loaded {count:,} rows into {args.table} in {time.perf_counter() - started:.1f}s")
+    else:
+        parser.error(f"Unsupported file type: {args.path}")
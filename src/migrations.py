@@ -0,0 +1,123 @@
+"""
+migrations.py
+
+This script moves data from legacy columns into the normalized tables defined in models.py.
+Currently it fills `project_members` from the free-text `research_projects.team_members`
+column (e.g. "Alice Johnson, Student 12, Student 34").
+"""
+
+import re
+import sys
+import os
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache import invalidate_tables
+from database import get_db_connection
+
+STUDENT_MEMBER_PATTERN = re.compile(r"^Student\s+(\d+)$", re.IGNORECASE)
+
+PROJECTS_WITHOUT_MEMBERS_QUERY = """
+SELECT rp.project_title, rp.principal_investigator, rp.team_members
+FROM research_projects rp
+LEFT JOIN project_members pm ON pm.project_title = rp.project_title
+WHERE pm.project_title IS NULL;
+"""
+
+INSERT_PROJECT_MEMBER_QUERY = """
+INSERT IGNORE INTO project_members (project_title, member_type, member_id, position)
+VALUES (%s, %s, %s, %s);
+"""
+
+
+def parse_team_members(team_members):
+    """
+    Split a team_members string into its members.
+
+    Args:
+        team_members (str): Comma-separated team, e.g. "Alice Johnson, Student 12, Student 34".
+
+    Returns:
+        list: (member_type, value) tuples in listed order, where value is a student_id
+        (int) for students and a lecturer name (str) for lecturers.
+    """
+    members = []
+    for token in (team_members or "").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        match = STUDENT_MEMBER_PATTERN.match(token)
+        if match:
+            members.append(("student", int(match.group(1))))
+        else:
+            members.append(("lecturer", token))
+    return members
+
+
+def _existing_ids(cursor, table, key, ids):
+    """Return the subset of `ids` present in `table`, looked up in chunks."""
+    found = set()
+    ids = sorted(ids)
+    for start in range(0, len(ids), 1000):
+        chunk = ids[start:start + 1000]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(f"SELECT {key} FROM {table} WHERE {key} IN ({placeholders})", chunk)
+        found.update(row[0] for row in cursor.fetchall())
+    return found
+
+
+def migrate_project_members(conn):
+    """
+    Populate project_members for every research project that has no members yet.
+
+    Lecturer names are resolved to lecturer_id (preferring the project's principal
+    investigator), and student references are kept only if the student exists. Projects
+    that already have members are skipped, so the migration can be re-run safely.
+
+    Returns:
+        int: The number of member rows inserted.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(PROJECTS_WITHOUT_MEMBERS_QUERY)
+        projects = cursor.fetchall()
+        if not projects:
+            return 0
+
+        cursor.execute("SELECT lecturer_id, name FROM lecturers")
+        lecturer_ids_by_name = {}
+        for lecturer_id, name in cursor.fetchall():
+            lecturer_ids_by_name.setdefault(name, []).append(lecturer_id)
+
+        parsed = [(title, pi, parse_team_members(team)) for title, pi, team in projects]
+        student_ids = {value for _, _, members in parsed for kind, value in members if kind == "student"}
+        known_students = _existing_ids(cursor, "students", "student_id", student_ids)
+
+        rows = []
+        for title, pi, members in parsed:
+            for position, (kind, value) in enumerate(members, start=1):
+                if kind == "student":
+                    if value in known_students:
+                        rows.append((title, "student", value, position))
+                    continue
+                candidates = lecturer_ids_by_name.get(value, [])
+                lecturer_id = pi if pi in candidates else (candidates[0] if candidates else None)
+                if lecturer_id is not None:
+                    rows.append((title, "lecturer", lecturer_id, position))
+
+        cursor.executemany(INSERT_PROJECT_MEMBER_QUERY, rows)
+    conn.commit()
+    invalidate_tables("project_members")
+    return len(rows)
+
+
+if __name__ == "__main__":
+    conn = get_db_connection()
+    if conn is None:
+        print("❌ Database connection failed.")
+        sys.exit(1)
+    try:
+        inserted = migrate_project_members(conn)
+        print(f"✅ Migrated {inserted} project members from research_projects.team_members")
+    finally:
+        conn.close()
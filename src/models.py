@@ -1,38 +1,34 @@
 """
 This module defines the SQLAlchemy ORM models for the University Record Management System.
-It sets up the database connection, creates the required tables, and defines relationships
-between entities such as students, lecturers, courses, departments, programs, and research projects.
+It defines the tables and the relationships between entities such as students, lecturers,
+courses, departments, programs, and research projects.
+
+Importing it has no side effects: creating the database and tables is done explicitly by
+bootstrap.py, which also binds `Session` to its engine. Code that reads through the ORM
+uses `ScopedSession` (one session per thread), see orm_queries.py.
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Float, Text, Table
-from sqlalchemy.orm import declarative_base, sessionmaker, relationship
-from sqlalchemy.sql import text
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Text, Table, Index, DateTime
+from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session, relationship
 from config import DB_CONFIG
 
 # Database configuration
 DB_NAME = DB_CONFIG["database"]
 CONNECTION_URL = f"mysql+pymysql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}"
-
-# Ensure database exists before defining tables
-engine = create_engine(CONNECTION_URL)
-with engine.connect() as conn:
-    conn.execute(text(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}"))
-
-# Connect to the actual database
 DATABASE_URL = f"{CONNECTION_URL}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
 
 # Define ORM base class
 Base = declarative_base()
-Session = sessionmaker(bind=engine)
-session = Session()
+Session = sessionmaker()  # Bound to the shared engine by bootstrap.get_engine()
+ScopedSession = scoped_session(Session)  # Thread-local sessions for GUI workers and the asyncio executor
 
 # Define many-to-many relationship between Students and Courses
 enrollments = Table(
     "enrollments",
     Base.metadata,
     Column("student_id", Integer, ForeignKey("students.student_id"), primary_key=True),
-    Column("course_id", String(20), ForeignKey("courses.course_code"), primary_key=True)
+    Column("course_id", String(20), ForeignKey("courses.course_code"), primary_key=True),
+    Index("ix_enrollments_course_student", "course_id", "student_id")  # Students in a course
 )
 
 # Define many-to-many relationship between Lecturers and Courses
@@ -40,7 +36,8 @@ lecturer_courses = Table(
     "lecturer_courses",
     Base.metadata,
     Column("lecturer_id", Integer, ForeignKey("lecturers.lecturer_id"), primary_key=True),
-    Column("course_id", String(20), ForeignKey("courses.course_code"), primary_key=True)
+    Column("course_id", String(20), ForeignKey("courses.course_code"), primary_key=True),
+    Index("ix_lecturer_courses_course", "course_id")  # Lecturers teaching a course
 )
 
 # Students Table
@@ -49,6 +46,11 @@ class Student(Base):
     Represents a student in the university.
     """
     __tablename__ = "students"
+    __table_args__ = (
+        Index("ix_students_program_name", "program", "name"),  # Students in a major (covering)
+        Index("ix_students_grades_id_name", "current_grades", "student_id", "name"),  # Top students (covering)
+        Index("ft_students_name", "name", mysql_prefix="FULLTEXT"),  # Search
+    )
 
     student_id = Column(Integer, primary_key=True)  # Unique student ID
     name = Column(String(100), nullable=False)  # Student name
@@ -71,6 +73,10 @@ class Lecturer(Base):
     Represents a lecturer in the university.
     """
     __tablename__ = "lecturers"
+    __table_args__ = (
+        Index("ix_lecturers_department_name", "department", "name"),  # Professors / courses taught in a department
+        Index("ft_lecturers_profile", "expertise", "research_interests", "publications", mysql_prefix="FULLTEXT"),  # Search
+    )
 
     lecturer_id = Column(Integer, primary_key=True)  # Unique lecturer ID
     name = Column(String(100), nullable=False)  # Lecturer name
@@ -91,6 +97,9 @@ class NonAcademicStaff(Base):
     Represents non-academic staff members.
     """
     __tablename__ = "non_academic_staff"
+    __table_args__ = (
+        Index("ix_staff_department_name_title", "department", "name", "job_title"),  # Staff in a department (covering)
+    )
 
     staff_id = Column(Integer, primary_key=True)  # Unique staff ID
     name = Column(String(100), nullable=False)  # Staff name
@@ -107,6 +116,11 @@ class Course(Base):
     Represents a university course.
     """
     __tablename__ = "courses"
+    __table_args__ = (
+        Index("ix_courses_department_name", "department", "name"),  # Courses by department (covering)
+        Index("ix_courses_name", "name"),  # Students in a course, looked up by course name
+        Index("ft_courses_name_description", "name", "description", mysql_prefix="FULLTEXT"),  # Search
+    )
 
     course_code = Column(String(20), primary_key=True)  # Unique course code
     name = Column(String(100), nullable=False)  # Course name
@@ -141,6 +155,9 @@ class Program(Base):
     Represents a degree program at the university.
     """
     __tablename__ = "programs"
+    __table_args__ = (
+        Index("ix_programs_degree_awarded", "degree_awarded"),  # Bachelor's / Master's listings
+    )
 
     name = Column(String(100), primary_key=True)  # Program name
     degree_awarded = Column(String(100))  # Type of degree awarded (e.g., BSc, MSc)
@@ -154,6 +171,10 @@ class ResearchProject(Base):
     Represents research projects supervised by university lecturers.
     """
     __tablename__ = "research_projects"
+    __table_args__ = (
+        Index("ix_research_projects_investigator", "principal_investigator"),  # Projects per lecturer
+        Index("ft_research_projects_title_outcomes", "project_title", "outcomes", mysql_prefix="FULLTEXT"),  # Search
+    )
 
     project_title = Column(String(255), primary_key=True)  # Unique project title
     principal_investigator = Column(Integer, ForeignKey("lecturers.lecturer_id"))  # Lead investigator (lecturer)
@@ -164,7 +185,70 @@ class ResearchProject(Base):
 
     # Relationships
     investigator = relationship("Lecturer")
+    members = relationship("ProjectMember", back_populates="project", order_by="ProjectMember.position")
+
+# Project Members Table
+class ProjectMember(Base):
+    """
+    Links a research project to each lecturer or student on its team.
+    """
+    __tablename__ = "project_members"
+    __table_args__ = (
+        Index("ix_project_members_member", "member_type", "member_id"),  # Projects a person works on
+    )
+
+    project_title = Column(String(255), ForeignKey("research_projects.project_title"), primary_key=True)  # Project
+    member_type = Column(String(20), primary_key=True)  # "lecturer" or "student"
+    member_id = Column(Integer, primary_key=True)  # lecturer_id or student_id, depending on member_type
+    position = Column(Integer)  # Order in which the member is listed on the team
+
+    # Relationships
+    project = relationship("ResearchProject", back_populates="members")
+
+# Department Statistics Table
+class DepartmentStat(Base):
+    """
+    Per-department counts kept up to date by the triggers in department_stats.py.
+
+    The average grade is stored as a running total and count so that it can be
+    adjusted row by row; read it as grade_total / graded_students.
+    """
+    __tablename__ = "department_stats"
+
+    department = Column(String(100), primary_key=True)  # Department name as used in the fact tables
+    course_count = Column(Integer, nullable=False, default=0, server_default="0")  # Courses offered
+    lecturer_count = Column(Integer, nullable=False, default=0, server_default="0")  # Lecturers
+    staff_count = Column(Integer, nullable=False, default=0, server_default="0")  # Non-academic staff
+    student_count = Column(Integer, nullable=False, default=0, server_default="0")  # Students whose program is the department
+    graded_students = Column(Integer, nullable=False, default=0, server_default="0")  # Students with a current grade
+    grade_total = Column(Float(precision=53), nullable=False, default=0, server_default="0")  # Sum of those grades
+    research_project_count = Column(Integer, nullable=False, default=0, server_default="0")  # Projects led by the department's lecturers
+
+# Schema Version Table
+class SchemaVersion(Base):
+    """
+    The schema fingerprint last applied by bootstrap.py (a single row).
+    """
+    __tablename__ = "schema_version"
+
+    id = Column(Integer, primary_key=True)  # Always 1
+    version = Column(String(64), nullable=False)  # SHA-256 of the schema DDL
+    applied_at = Column(DateTime)  # When the schema was last brought up to date
+
+def ensure_indexes(bind):
+    """
+    Create any index declared on the models that is missing from the database.
+
+    create_all() only builds indexes for tables it creates, so databases set up before an
+    index was declared need this. Existing indexes are left untouched, so it is safe to
+    run on every start.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda idx: idx.name):
+            index.create(bind=bind, checkfirst=True)
+
+if __name__ == "__main__":
+    from bootstrap import bootstrap
 
-# Create all tables in the database
-Base.metadata.create_all(engine)
-print("✅ Database and tables created successfully.")
+    bootstrap(force=True)
+    print("✅ Database and tables created successfully.")
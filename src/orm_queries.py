@@ -0,0 +1,152 @@
+"""
+orm_queries.py
+
+Read access through the SQLAlchemy models, with every relationship loaded eagerly.
+
+Walking relationships such as Student.courses or Course.lecturers one object at a time
+would issue a lazy-load query per object (the N+1 problem). Each function here instead
+states up front which relationships it returns and how to load them:
+
+- joinedload for many-to-one links (Student.advisor, ResearchProject.investigator): the
+  parent row is joined in, which adds no rows to the result.
+- selectinload for collections (Course.students_enrolled, Lecturer.courses_taught, ...):
+  one extra `WHERE key IN (...)` query per relationship, however many objects were loaded,
+  without multiplying rows the way a JOIN on a collection would.
+- raiseload for everything else, so touching a relationship that was not loaded raises
+  instead of quietly querying the database.
+
+The number of statements is therefore fixed per function; tests/test_orm_queries.py
+checks it. Objects are returned detached from their session and are read-only snapshots.
+"""
+
+import sys
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from bootstrap import get_engine
+from models import (
+    Course, Department, Lecturer, NonAcademicStaff, ResearchProject, ScopedSession, Student
+)
+
+# Everything about one department. `department` is None if no departments row exists.
+DepartmentGraph = namedtuple("DepartmentGraph", ["department", "courses", "lecturers", "staff", "research_projects"])
+
+
+@contextmanager
+def session_scope():
+    """
+    Provide this thread's session for a unit of read work and discard it afterwards.
+
+    Nested use shares the outer session; only the outermost block closes it.
+    """
+    get_engine()  # Binds Session on first use
+    outermost = not ScopedSession.registry.has()
+    session = ScopedSession()
+    try:
+        yield session
+    finally:
+        if outermost:
+            ScopedSession.remove()
+
+
+def _detach(session, objects):
+    """Detach loaded objects so they can be used after the session closes."""
+    session.expunge_all()
+    return objects
+
+
+def load_department(department_name):
+    """
+    Load a department with its courses, lecturers, staff and research projects.
+
+    Loaded relationships: Course.lecturers, Course.students_enrolled,
+    Lecturer.courses_taught, Lecturer.students_advised, ResearchProject.investigator
+    and ResearchProject.members. Issues 10 statements whatever the department's size.
+
+    Returns:
+        DepartmentGraph: ORM objects for the department.
+    """
+    with session_scope() as session:
+        department = session.execute(
+            select(Department).where(Department.department_name == department_name)
+        ).scalar_one_or_none()
+        courses = session.scalars(
+            select(Course)
+            .where(Course.department == department_name)
+            .order_by(Course.name)
+            .options(selectinload(Course.lecturers), selectinload(Course.students_enrolled), raiseload("*"))
+        ).all()
+        lecturers = session.scalars(
+            select(Lecturer)
+            .where(Lecturer.department == department_name)
+            .order_by(Lecturer.name)
+            .options(selectinload(Lecturer.courses_taught), selectinload(Lecturer.students_advised), raiseload("*"))
+        ).all()
+        staff = session.scalars(
+            select(NonAcademicStaff)
+            .where(NonAcademicStaff.department == department_name)
+            .order_by(NonAcademicStaff.name)
+        ).all()
+        research_projects = session.scalars(
+            select(ResearchProject)
+            .join(ResearchProject.investigator)
+            .where(Lecturer.department == department_name)
+            .order_by(ResearchProject.project_title)
+            .options(joinedload(ResearchProject.investigator), selectinload(ResearchProject.members), raiseload("*"))
+        ).unique().all()
+        return _detach(session, DepartmentGraph(department, courses, lecturers, staff, research_projects))
+
+
+def load_students(student_ids):
+    """
+    Load students with their advisor and enrolled courses (2 statements for any number of IDs).
+
+    Returns:
+        list: Student objects in the order of `student_ids`; unknown IDs are skipped.
+    """
+    student_ids = list(dict.fromkeys(student_ids))
+    if not student_ids:
+        return []
+    with session_scope() as session:
+        students = session.scalars(
+            select(Student)
+            .where(Student.student_id.in_(student_ids))
+            .options(joinedload(Student.advisor), selectinload(Student.courses), raiseload("*"))
+        ).unique().all()
+        by_id = {student.student_id: student for student in students}
+        return _detach(session, [by_id[i] for i in student_ids if i in by_id])
+
+
+def load_students_in_program(program_name):
+    """Load the students in a program, ordered by name, with their advisor and courses (2 statements)."""
+    with session_scope() as session:
+        students = session.scalars(
+            select(Student)
+            .where(Student.program == program_name)
+            .order_by(Student.name, Student.student_id)
+            .options(joinedload(Student.advisor), selectinload(Student.courses), raiseload("*"))
+        ).unique().all()
+        return _detach(session, students)
+
+
+def load_research_projects(lecturer_ids=None):
+    """
+    Load research projects with their investigator and ordered team members (2 statements).
+
+    Args:
+        lecturer_ids (list): Only projects led by these lecturers; all projects when None.
+    """
+    query = select(ResearchProject).order_by(ResearchProject.project_title).options(
+        joinedload(ResearchProject.investigator), selectinload(ResearchProject.members), raiseload("*")
+    )
+    if lecturer_ids is not None:
+        query = query.where(ResearchProject.principal_investigator.in_(list(lecturer_ids)))
+    with session_scope() as session:
+        return _detach(session, session.scalars(query).unique().all())
@@ -2,6 +2,7 @@
 populate_data.py
 
 This script executes the populate_data.sql file to insert data into the MySQL database.
+Statements are streamed and batched by loader.py.
 """
 
 import sys
@@ -10,29 +11,60 @@ import os
 # Ensure the `src` directory is included in the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import get_db_connection  
+import loader
+from database import connect, get_db_connection
+from department_stats import rebuild_department_stats, triggers_suspended
+from migrations import migrate_project_members
 
 def execute_sql_file(filename):
-    """Read and execute the SQL file for data population."""
+    """
+    Stream and execute the SQL file for data population (see loader.execute_sql_file).
+
+    The department_stats triggers are suspended meanwhile; refresh_department_stats()
+    recomputes the table afterwards.
+    """
+    try:
+        conn = connect()
+        try:
+            with triggers_suspended(conn):
+                executed = loader.execute_sql_file(filename, conn=conn)
+        finally:
+            conn.close()
+        print(f"✅ Data successfully populated from {os.path.basename(filename)} ({executed} statements)")
+    except Exception as e:
+        print(f"⚠️ Error while populating data: {e}")
+
+def populate_project_members():
+    """Fill project_members from the team_members text of the freshly loaded projects."""
     conn = get_db_connection()
     if conn is None:
         print("❌ Database connection failed.")
         return
 
     try:
-        with conn.cursor() as cursor:
-            with open(filename, 'r', encoding='utf-8') as file:
-                sql_statements = file.read()
-                for statement in sql_statements.split(';'):  # Execute each statement separately
-                    statement = statement.strip()
-                    if statement:
-                        cursor.execute(statement)
-        conn.commit()
-        print("✅ Data successfully populated from populate_data.sql")
+        inserted = migrate_project_members(conn)
+        print(f"✅ Linked {inserted} project members")
     except Exception as e:
-        print(f"⚠️ Error while populating data: {e}")
+        print(f"⚠️ Error while linking project members: {e}")
+    finally:
+        conn.close()
+
+def refresh_department_stats():
+    """Recompute department_stats, since the TRUNCATEs in the seed file bypass its triggers."""
+    conn = get_db_connection()
+    if conn is None:
+        print("❌ Database connection failed.")
+        return
+
+    try:
+        departments = rebuild_department_stats(conn)
+        print(f"✅ Department statistics rebuilt for {departments} departments")
+    except Exception as e:
+        print(f"⚠️ Error while rebuilding department statistics: {e}")
     finally:
         conn.close()
 
 if __name__ == "__main__":
     execute_sql_file("data/populate_data.sql")
+    populate_project_members()
+    refresh_department_stats()
@@ -1,193 +1,645 @@
-from database import get_db_connection
+import base64
+import json
+from collections import namedtuple
+from types import MappingProxyType
 
+from cache import cached
+from database import db_connection, stream_rows
+from query_registry import register, run_query
+
+DEFAULT_PAGE_SIZE = 50
+
+# One page of a paginated query: the rows (a tuple, since pages are cached and shared), a
+# token for the next page (None on the last page) and the total number of matching rows
+# (None when not requested).
+Page = namedtuple("Page", ["rows", "next_token", "total"])
+
+# SQL used by the query functions below. Each statement is registered with
+# query_registry (see the end of this block), which executes it by name and lets
+# tests/test_indexes.py and `python src/query_registry.py` EXPLAIN exactly what the
+# application runs.
+STUDENTS_IN_MAJOR_QUERY = """
+SELECT name FROM students WHERE program = %s;
+"""
+
+PROFESSORS_IN_DEPARTMENT_QUERY = """
+SELECT CONCAT('Dr. ', name) AS professor_name, academic_qualifications, expertise
+FROM lecturers
+WHERE department = %s;
+"""
+
+STUDENTS_IN_COURSE_QUERY = """
+SELECT s.name
+FROM students s
+JOIN enrollments e ON s.student_id = e.student_id
+JOIN courses c ON e.course_id = c.course_code
+WHERE c.name = %s;
+"""
+
+COURSES_TAUGHT_BY_LECTURERS_QUERY = """
+SELECT CONCAT('Dr. ', l.name) AS lecturer_name, GROUP_CONCAT(c.name SEPARATOR ', ') AS courses
+FROM lecturers l
+JOIN lecturer_courses lc ON l.lecturer_id = lc.lecturer_id
+JOIN courses c ON lc.course_id = c.course_code
+WHERE l.department = %s
+GROUP BY l.lecturer_id, l.name;
+"""
+
+TOP_STUDENTS_QUERY = """
+SELECT name, current_grades
+FROM students
+WHERE current_grades > 70;
+"""
+
+STAFF_IN_DEPARTMENT_QUERY = """
+SELECT name, job_title
+FROM non_academic_staff
+WHERE department = %s;
+"""
+
+ALL_DEPARTMENTS_QUERY = "SELECT TRIM(department_name) FROM departments;"  # ✅ Ensure full names are retrieved
+
+COURSES_BY_DEPARTMENT_QUERY = """
+SELECT name
+FROM courses
+WHERE department = %s;
+"""
+
+RESEARCH_PROJECTS_BY_DEPARTMENT_QUERY = """
+SELECT rp.project_title,
+       CONCAT('Dr. ', l.name) AS principal_investigator,
+       rp.funding_sources,
+       CONCAT('Dr. ', l.name, ' & Students: ',
+              COALESCE(GROUP_CONCAT(s.name ORDER BY pm.position SEPARATOR ', '), '')) AS team_members,
+       rp.publications
+FROM lecturers l
+JOIN research_projects rp ON rp.principal_investigator = l.lecturer_id
+LEFT JOIN project_members pm ON pm.project_title = rp.project_title AND pm.member_type = 'student'
+LEFT JOIN students s ON s.student_id = pm.member_id
+WHERE l.department = %s
+GROUP BY rp.project_title, l.lecturer_id;
+"""
+
+BACHELORS_DEGREES_QUERY = """
+SELECT name, degree_awarded, duration, course_requirements, enrolment_details
+FROM programs
+WHERE degree_awarded IN ('BSc', 'BEng', 'BBA', 'BA');
+"""
+
+MASTERS_DEGREES_QUERY = """
+SELECT name, degree_awarded, duration, course_requirements, enrolment_details
+FROM programs
+WHERE degree_awarded = 'MSc';
+"""
+
+# Per-department counts maintained by the triggers in department_stats.py
+DEPARTMENT_STATS_QUERY = """
+SELECT department, course_count, lecturer_count, staff_count, student_count,
+       ROUND(grade_total / NULLIF(graded_students, 0), 2) AS average_grade, research_project_count
+FROM department_stats
+ORDER BY department;
+"""
+
+# Department overview: every per-department listing in one statement. Each column is a
+# JSON array built by a correlated subquery, and the derived table `d` holds the requested
+# department names ({departments} expands to "SELECT %s AS department_name UNION ALL ...").
+# Rows mirror the individual queries above. (On MariaDB, JSON_ARRAYAGG is capped by
+# group_concat_max_len; MySQL has no such limit.)
+DEPARTMENT_OVERVIEW_QUERY = """
+SELECT d.department_name,
+       (SELECT JSON_ARRAYAGG(JSON_ARRAY(c.name))
+        FROM courses c
+        WHERE c.department = d.department_name) AS courses,
+       (SELECT JSON_ARRAYAGG(JSON_ARRAY(CONCAT('Dr. ', l.name), l.academic_qualifications, l.expertise))
+        FROM lecturers l
+        WHERE l.department = d.department_name) AS professors,
+       (SELECT JSON_ARRAYAGG(JSON_ARRAY(
+                   CONCAT('Dr. ', l.name),
+                   (SELECT GROUP_CONCAT(c.name SEPARATOR ', ')
+                    FROM lecturer_courses lc
+                    JOIN courses c ON lc.course_id = c.course_code
+                    WHERE lc.lecturer_id = l.lecturer_id)))
+        FROM lecturers l
+        WHERE l.department = d.department_name
+          AND EXISTS (SELECT 1 FROM lecturer_courses lc WHERE lc.lecturer_id = l.lecturer_id)) AS lecturer_courses,
+       (SELECT JSON_ARRAYAGG(JSON_ARRAY(n.name, n.job_title))
+        FROM non_academic_staff n
+        WHERE n.department = d.department_name) AS staff,
+       (SELECT JSON_ARRAYAGG(JSON_ARRAY(
+                   rp.project_title,
+                   CONCAT('Dr. ', l.name),
+                   rp.funding_sources,
+                   CONCAT('Dr. ', l.name, ' & Students: ', COALESCE(
+                       (SELECT GROUP_CONCAT(s.name ORDER BY pm.position SEPARATOR ', ')
+                        FROM project_members pm
+                        JOIN students s ON s.student_id = pm.member_id
+                        WHERE pm.project_title = rp.project_title AND pm.member_type = 'student'), '')),
+                   rp.publications))
+        FROM lecturers l
+        JOIN research_projects rp ON rp.principal_investigator = l.lecturer_id
+        WHERE l.department = d.department_name) AS research_projects
+FROM ({departments}) d;
+"""
+
+DEPARTMENT_OVERVIEW_SECTIONS = ("courses", "professors", "lecturer_courses", "staff", "research_projects")
+
+# Student transcript: profile, advisor, enrolled courses and research participation in one
+# statement. {where} selects the students, e.g. "s.student_id IN (%s, %s)". Each student's
+# courses and projects come back as JSON arrays from correlated subqueries on the
+# enrollments primary key and the project_members (member_type, member_id) index.
+TRANSCRIPT_QUERY = """
+SELECT s.student_id, s.name, s.dob, s.contact_info, s.program, s.year_of_study,
+       s.current_grades, s.graduation_status,
+       CONCAT('Dr. ', a.name) AS advisor,
+       (SELECT JSON_ARRAYAGG(JSON_ARRAY(c.course_code, c.name, c.credits))
+        FROM enrollments e
+        JOIN courses c ON c.course_code = e.course_id
+        WHERE e.student_id = s.student_id) AS courses,
+       (SELECT JSON_ARRAYAGG(JSON_ARRAY(rp.project_title, CONCAT('Dr. ', l.name)))
+        FROM project_members pm
+        JOIN research_projects rp ON rp.project_title = pm.project_title
+        LEFT JOIN lecturers l ON l.lecturer_id = rp.principal_investigator
+        WHERE pm.member_type = 'student' AND pm.member_id = s.student_id) AS research_projects
+FROM students s
+LEFT JOIN lecturers a ON a.lecturer_id = s.advisor_id
+WHERE {where}
+ORDER BY s.name, s.student_id;
+"""
+
+TRANSCRIPT_FIELDS = ("student_id", "name", "dob", "contact_info", "program", "year_of_study",
+                     "current_grades", "graduation_status", "advisor")
+
+# Student IDs per statement in get_transcripts(); larger batches mean fewer round trips
+# but longer IN lists to parse
+TRANSCRIPT_BATCH_SIZE = 500
+
+# Keyset (seek) pagination: each page continues after the last key of the previous page,
+# so fetching page N costs the same as page 1 instead of scanning N * page_size rows.
+STUDENTS_IN_MAJOR_PAGE_QUERY = """
+SELECT name, student_id
+FROM students
+WHERE program = %s AND (name > %s OR (name = %s AND student_id > %s))
+ORDER BY name, student_id
+LIMIT %s;
+"""
+
+STUDENTS_IN_MAJOR_COUNT_QUERY = "SELECT COUNT(*) FROM students WHERE program = %s;"
+
+# Course names are not unique, so a student can appear once per same-named course; the
+# key is (student_id, course_id) so that no enrollment is skipped at a page boundary.
+STUDENTS_IN_COURSE_PAGE_QUERY = """
+SELECT s.name, e.student_id, e.course_id
+FROM courses c
+JOIN enrollments e ON e.course_id = c.course_code
+JOIN students s ON s.student_id = e.student_id
+WHERE c.name = %s AND (e.student_id > %s OR (e.student_id = %s AND e.course_id > %s))
+ORDER BY e.student_id, e.course_id
+LIMIT %s;
+"""
+
+STUDENTS_IN_COURSE_COUNT_QUERY = """
+SELECT COUNT(*)
+FROM courses c
+JOIN enrollments e ON e.course_id = c.course_code
+WHERE c.name = %s;
+"""
+
+# current_grades is a FLOAT; "+ 0E0" returns its exact double value so the key sent back
+# in the next page's comparison matches the stored value.
+TOP_STUDENTS_PAGE_QUERY = """
+SELECT name, current_grades, current_grades + 0E0 AS grade_key, student_id
+FROM students
+WHERE current_grades > %s AND (current_grades < %s OR (current_grades = %s AND student_id < %s))
+ORDER BY current_grades DESC, student_id DESC
+LIMIT %s;
+"""
+
+TOP_STUDENTS_COUNT_QUERY = "SELECT COUNT(*) FROM students WHERE current_grades > %s;"
+
+# name -> (SQL, sample parameters for EXPLAIN). Page queries end with the LIMIT argument.
+for _name, (_sql, _sample_params) in {
+    "students_in_major": (STUDENTS_IN_MAJOR_QUERY, ("Computer Science",)),
+    "professors_in_department": (PROFESSORS_IN_DEPARTMENT_QUERY, ("Engineering",)),
+    "students_in_course": (STUDENTS_IN_COURSE_QUERY, ("Introduction to AI",)),
+    "courses_taught_by_lecturers": (COURSES_TAUGHT_BY_LECTURERS_QUERY, ("Computer Science",)),
+    "top_students": (TOP_STUDENTS_QUERY, None),
+    "staff_in_department": (STAFF_IN_DEPARTMENT_QUERY, ("Administration",)),
+    "courses_by_department": (COURSES_BY_DEPARTMENT_QUERY, ("Mathematics",)),
+    "research_projects_by_department": (RESEARCH_PROJECTS_BY_DEPARTMENT_QUERY, ("Physics",)),
+    "bachelors_degrees": (BACHELORS_DEGREES_QUERY, None),
+    "masters_degrees": (MASTERS_DEGREES_QUERY, None),
+    "students_in_major_page": (STUDENTS_IN_MAJOR_PAGE_QUERY, ("Computer Science", "", "", 0, DEFAULT_PAGE_SIZE + 1)),
+    "students_in_major_count": (STUDENTS_IN_MAJOR_COUNT_QUERY, ("Computer Science",)),
+    "students_in_course_page": (STUDENTS_IN_COURSE_PAGE_QUERY, ("Introduction to AI", 0, 0, "", DEFAULT_PAGE_SIZE + 1)),
+    "students_in_course_count": (STUDENTS_IN_COURSE_COUNT_QUERY, ("Introduction to AI",)),
+    "top_students_page": (TOP_STUDENTS_PAGE_QUERY, (70, 1e300, 1e300, 0, DEFAULT_PAGE_SIZE + 1)),
+    "top_students_count": (TOP_STUDENTS_COUNT_QUERY, (70,)),
+}.items():
+    register(_name, _sql, _sample_params)
+del _name, _sql, _sample_params
+
+# Listing every department (or every department's stats) has no filter, so reading the
+# whole table is the plan
+register("all_departments", ALL_DEPARTMENTS_QUERY, allowed_scans=("departments",))
+register("department_stats", DEPARTMENT_STATS_QUERY, allowed_scans=("department_stats",))
+register("program_transcripts", TRANSCRIPT_QUERY.format(where="s.program = %s"), ("Computer Science",))
+
+
+def encode_page_token(key):
+    """Encode the last row's sort key as an opaque continuation token."""
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_page_token(token, length):
+    """
+    Decode a continuation token produced by encode_page_token().
+
+    Raises:
+        ValueError: If the token is malformed or does not hold a key of `length` values.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid page token: {token!r}") from e
+    if not isinstance(key, list) or len(key) != length:
+        raise ValueError(f"Invalid page token: {token!r}")
+    return key
+
+
+def _fetch_page(page_query, page_params, count_query, count_params, page_size, include_total, key_length):
+    """Run a registered keyset page query (and optionally its count) on one connection."""
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            # Ask for one extra row to learn whether another page exists
+            run_query(cursor, page_query, page_params + (page_size + 1,))
+            rows = cursor.fetchall()
+            total = None
+            if include_total:
+                run_query(cursor, count_query, count_params)
+                total = cursor.fetchone()[0]
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_key = list(rows[-1][-key_length:]) if has_more else None
+    return rows, next_key, total
+
+
+@cached(tables=("students",))
+def get_students_in_major_page(major_name, page_token=None, page_size=DEFAULT_PAGE_SIZE, include_total=True):
+    """
+    Retrieve one page of the students in a major, ordered by name.
+
+    Args:
+        major_name (str): Program name.
+        page_token (str): Token from the previous page; None for the first page.
+        page_size (int): Maximum rows per page.
+        include_total (bool): Also count all matching students (one extra indexed query).
+
+    Returns:
+        Page: rows of (student_name,), the next page token and the optional total.
+    """
+    name, student_id = decode_page_token(page_token, 2) if page_token else ("", 0)
+    rows, next_key, total = _fetch_page(
+        "students_in_major_page", (major_name, name, name, student_id),
+        "students_in_major_count", (major_name,), page_size, include_total, 2
+    )
+    next_token = encode_page_token(next_key) if next_key else None
+    return Page(tuple((row[0],) for row in rows), next_token, total)
+
+
+@cached(tables=("students", "enrollments", "courses"))
+def get_students_in_course_page(course_name, page_token=None, page_size=DEFAULT_PAGE_SIZE, include_total=True):
+    """
+    Retrieve one page of the students enrolled in a course, ordered by student ID.
+
+    A student enrolled in two courses of the same name is listed once per enrollment,
+    matching the total.
+
+    Returns:
+        Page: rows of (student_name,), the next page token and the optional total.
+    """
+    student_id, course_id = decode_page_token(page_token, 2) if page_token else (0, "")
+    rows, next_key, total = _fetch_page(
+        "students_in_course_page", (course_name, student_id, student_id, course_id),
+        "students_in_course_count", (course_name,), page_size, include_total, 2
+    )
+    next_token = encode_page_token(next_key) if next_key else None
+    return Page(tuple((row[0],) for row in rows), next_token, total)
+
+
+@cached(tables=("students",))
+def get_top_students_page(page_token=None, page_size=DEFAULT_PAGE_SIZE, include_total=True, min_grade=70):
+    """
+    Retrieve one page of the students whose average grade is above `min_grade`, best first.
+
+    Returns:
+        Page: rows of (student_name, current_grades), the next page token and the optional total.
+    """
+    # The first page starts above any possible grade
+    grade, student_id = decode_page_token(page_token, 2) if page_token else (1e300, 0)
+    rows, next_key, total = _fetch_page(
+        "top_students_page", (min_grade, grade, grade, student_id),
+        "top_students_count", (min_grade,), page_size, include_total, 2
+    )
+    next_token = encode_page_token(next_key) if next_key else None
+    return Page(tuple((row[0], row[1]) for row in rows), next_token, total)
+
+
+@cached(tables=("department_stats", "courses", "lecturers", "non_academic_staff", "students", "research_projects"))
+def get_department_stats():
+    """
+    Retrieve up-to-date counts for every department from the department_stats summary table.
+
+    Returns:
+        list: Tuples (department, courses, lecturers, staff, students, average_grade, research_projects).
+    """
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "department_stats")
+            result = cursor.fetchall()
+    return result
+
+
+def _department_overview_sql(count):
+    """DEPARTMENT_OVERVIEW_QUERY for `count` department names."""
+    return DEPARTMENT_OVERVIEW_QUERY.format(departments=" UNION ALL ".join(["SELECT %s AS department_name"] * count))
+
+
+def _department_overview_query(count):
+    """Register the overview for `count` departments (once) and return its registry name."""
+    name = "department_overview" if count == 1 else f"department_overview_{count}"
+    register(name, _department_overview_sql(count), ("Computer Science",) * count)
+    return name
+
+
+_department_overview_query(1)
+
+
+@cached(tables=("courses", "lecturers", "lecturer_courses", "non_academic_staff",
+                "research_projects", "project_members", "students"))
+def _fetch_department_overviews(department_names):
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, _department_overview_query(len(department_names)), department_names)
+            rows = cursor.fetchall()
+
+    # Read-only mappings of tuples: the result is cached and shared by every caller
+    overviews = {}
+    for row in rows:
+        overviews[row[0]] = MappingProxyType({
+            section: tuple(tuple(item) for item in json.loads(value)) if value else ()
+            for section, value in zip(DEPARTMENT_OVERVIEW_SECTIONS, row[1:])
+        })
+    return MappingProxyType(overviews)
+
+
+def get_department_overview(department_name):
+    """
+    Retrieve everything shown for a department in one round trip.
+
+    Returns:
+        mapping: Read-only; tuples of rows keyed by "courses", "professors", "lecturer_courses",
+        "staff" and "research_projects", shaped like the results of the matching get_* functions.
+    """
+    return _fetch_department_overviews((department_name,))[department_name]
+
+
+def get_department_overviews(department_names=None):
+    """
+    Retrieve get_department_overview() for many departments in a single query.
+
+    Args:
+        department_names (list): Departments to include; all departments when None.
+
+    Returns:
+        mapping: Read-only; department name -> overview mapping.
+    """
+    if department_names is None:
+        department_names = get_all_departments()
+    department_names = tuple(dict.fromkeys(department_names))  # Deduplicate, keep order
+    if not department_names:
+        return MappingProxyType({})
+    return _fetch_department_overviews(department_names)
+
+
+def _transcript_query(count):
+    """Register the transcript query for `count` student IDs (once) and return its registry name."""
+    name = "transcript" if count == 1 else f"transcripts_{count}"
+    where = "s.student_id = %s" if count == 1 else f"s.student_id IN ({', '.join(['%s'] * count)})"
+    register(name, TRANSCRIPT_QUERY.format(where=where), (1,) * count)
+    return name
+
+
+_transcript_query(1)
+
+
+def _build_transcript(row):
+    """A read-only transcript mapping (transcripts are cached and shared by every caller)."""
+    transcript = dict(zip(TRANSCRIPT_FIELDS, row))
+    # JSON_ARRAYAGG has no ORDER BY in MySQL, so both lists are sorted here (courses by code, projects by title)
+    courses = tuple(sorted(tuple(course) for course in json.loads(row[-2]))) if row[-2] else ()
+    transcript["courses"] = courses
+    transcript["total_credits"] = sum(credits or 0 for _, _, credits in courses)
+    transcript["research_projects"] = tuple(sorted(tuple(project) for project in json.loads(row[-1]))) if row[-1] else ()
+    return MappingProxyType(transcript)
+
+
+@cached(tables=("students", "enrollments", "courses", "lecturers", "project_members", "research_projects"))
+def _fetch_transcripts(name, params):
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, name, params)
+            return tuple(_build_transcript(row) for row in cursor.fetchall())
+
+
+def get_transcript(student_id):
+    """
+    Retrieve a student's full record in one query.
+
+    Returns:
+        mapping: Read-only; the profile fields in TRANSCRIPT_FIELDS ("advisor" is the advisor's name or
+        None), "courses" as (course_code, name, credits) tuples, "total_credits" and
+        "research_projects" as (project_title, principal_investigator) tuples ordered by title.
+        None if the student does not exist.
+    """
+    transcripts = _fetch_transcripts(_transcript_query(1), (student_id,))
+    return transcripts[0] if transcripts else None
+
+
+def get_transcripts(student_ids, batch_size=TRANSCRIPT_BATCH_SIZE):
+    """
+    Retrieve get_transcript() for many students, one query per `batch_size` IDs.
+
+    Returns:
+        dict: Student ID -> transcript, in the order of `student_ids`; unknown IDs are omitted.
+    """
+    student_ids = list(dict.fromkeys(student_ids))
+    found = {}
+    for start in range(0, len(student_ids), batch_size):
+        batch = tuple(student_ids[start:start + batch_size])
+        # Pad to a power of two by repeating the last ID, so only a few statement shapes exist
+        size = 1 << (len(batch) - 1).bit_length()
+        batch += batch[-1:] * (size - len(batch))
+        for transcript in _fetch_transcripts(_transcript_query(size), batch):
+            found[transcript["student_id"]] = transcript
+    return {student_id: found[student_id] for student_id in student_ids if student_id in found}
+
+
+def get_program_transcripts(program_name):
+    """Retrieve a tuple of the transcripts of every student in a program (a cohort), ordered by name, in one query."""
+    return _fetch_transcripts("program_transcripts", (program_name,))
+
+
+@cached(tables=("students",))
 def get_students_in_major(major_name):
     """Retrieve all students enrolled in the same major."""
-    query = """
-    SELECT name FROM students WHERE program = %s;
-    """
-    conn = get_db_connection()
-    with conn.cursor() as cursor:
-        cursor.execute(query, (major_name,))
-        result = cursor.fetchall()
-    conn.close()
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "students_in_major", (major_name,))
+            result = cursor.fetchall()
     return result
 
+@cached(tables=("lecturers",))
 def get_professors_in_department(department_name):
     """Retrieve all professors in a specific department with 'Dr.' prefix."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    query = """
-    SELECT CONCAT('Dr. ', name) AS professor_name, academic_qualifications, expertise
-    FROM lecturers
-    WHERE department = %s;
-    """
-    
-    cursor.execute(query, (department_name,))
-    results = cursor.fetchall()
-    
-    conn.close()
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "professors_in_department", (department_name,))
+            results = cursor.fetchall()
+
     return results
 
+@cached(tables=("students", "enrollments", "courses"))
 def get_students_in_course(course_name):
     """
     Retrieve all students enrolled in a specific course.
-    
+
     Args:
         course_name (str): Name of the course.
-    
+
     Returns:
         list: A list of student names enrolled in the course.
     """
-    query = """
-    SELECT s.name
-    FROM students s
-    JOIN enrollments e ON s.student_id = e.student_id
-    JOIN courses c ON e.course_id = c.course_code
-    WHERE c.name = %s;
-    """
-    conn = get_db_connection()
-    with conn.cursor() as cursor:
-        cursor.execute(query, (course_name,))
-        result = cursor.fetchall()
-    conn.close()
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "students_in_course", (course_name,))
+            result = cursor.fetchall()
     return result
 
+@cached(tables=("lecturers", "lecturer_courses", "courses"))
 def get_courses_taught_by_lecturers(department_name):
     """Retrieve courses taught by lecturers in a department with 'Dr.' prefix."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    query = """
-    SELECT CONCAT('Dr. ', l.name) AS lecturer_name, GROUP_CONCAT(c.name SEPARATOR ', ') AS courses
-    FROM lecturers l
-    JOIN lecturer_courses lc ON l.lecturer_id = lc.lecturer_id
-    JOIN courses c ON lc.course_id = c.course_code
-    WHERE l.department = %s
-    GROUP BY l.lecturer_id, l.name;
-    """
-    
-    cursor.execute(query, (department_name,))
-    results = cursor.fetchall()
-    
-    conn.close()
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "courses_taught_by_lecturers", (department_name,))
+            results = cursor.fetchall()
+
     return results
 
+@cached(tables=("students",))
 def get_top_students():
     """
     List all students with an average grade above 70%.
-    
+
     Returns:
         list: A list of tuples (student_name, current_grades).
     """
-    query = """
-    SELECT name, current_grades
-    FROM students
-    WHERE current_grades > 70;
-    """
-    conn = get_db_connection()
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        result = cursor.fetchall()
-    conn.close()
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "top_students")
+            result = cursor.fetchall()
     return result
 
+@cached(tables=("non_academic_staff",))
 def get_staff_in_department(department_name):
     """
     Find all staff members employed in a specific department.
-    
+
     Args:
         department_name (str): The department name.
-    
+
     Returns:
         list: A list of tuples (staff_name, job_title).
     """
-    query = """
-    SELECT name, job_title
-    FROM non_academic_staff
-    WHERE department = %s;
-    """
-    conn = get_db_connection()
-    with conn.cursor() as cursor:
-        cursor.execute(query, (department_name,))
-        result = cursor.fetchall()
-    conn.close()
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "staff_in_department", (department_name,))
+            result = cursor.fetchall()
     return result
 
+@cached(tables=("departments",))
 def get_all_departments():
-    """Retrieve a list of all departments."""
-    query = "SELECT TRIM(department_name) FROM departments;"  # ✅ Ensure full names are retrieved
-    conn = get_db_connection()
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        result = cursor.fetchall()
-    conn.close()
-    
-    return [row[0] for row in result]  # ✅ Ensures proper formatting
+    """Retrieve a tuple of all department names."""
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "all_departments")
+            result = cursor.fetchall()
+
+    return tuple(row[0] for row in result)  # ✅ A tuple: cached results are shared by every caller
 
 
+@cached(tables=("courses",))
 def get_courses_by_department(department_name):
     """Retrieve all courses for a specific department."""
-    query = """
-    SELECT name
-    FROM courses
-    WHERE department = %s;
-    """
-    conn = get_db_connection()
-    with conn.cursor() as cursor:
-        cursor.execute(query, (department_name,))
-        result = cursor.fetchall()
-    conn.close()
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "courses_by_department", (department_name,))
+            result = cursor.fetchall()
     return result
 
+@cached(tables=("research_projects", "lecturers", "project_members", "students"))
 def get_research_projects_by_department(department_name):
     """Retrieve all research projects in a specific department with properly formatted names."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    query = """
-    SELECT rp.project_title, 
-           CONCAT('Dr. ', l.name) AS principal_investigator, 
-           rp.funding_sources, 
-           CONCAT('Dr. ', l.name, ' & Students: ', s1.name, ', ', s2.name) AS team_members, 
-           rp.publications
-    FROM research_projects rp
-    JOIN lecturers l ON rp.principal_investigator = l.lecturer_id
-    LEFT JOIN students s1 ON SUBSTRING_INDEX(SUBSTRING_INDEX(rp.team_members, ', ', -2), ', ', 1) = CONCAT('Student ', s1.student_id)
-    LEFT JOIN students s2 ON SUBSTRING_INDEX(rp.team_members, ', ', -1) = CONCAT('Student ', s2.student_id)
-    WHERE l.department = %s;
-    """
-    
-    cursor.execute(query, (department_name,))
-    results = cursor.fetchall()
-    
-    conn.close()
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "research_projects_by_department", (department_name,))
+            results = cursor.fetchall()
+
     return results
 
+@cached(tables=("programs",))
 def get_bachelors_degrees():
     """Retrieve all bachelor's degree programmes (BSc, BEng, BBA, BA)."""
-    query = """
-    SELECT name, degree_awarded, duration, course_requirements, enrolment_details
-    FROM programs
-    WHERE degree_awarded IN ('BSc', 'BEng', 'BBA', 'BA');
-    """
-    conn = get_db_connection()
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        result = cursor.fetchall()
-    conn.close()
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "bachelors_degrees")
+            result = cursor.fetchall()
     return result
 
+@cached(tables=("programs",))
 def get_masters_degrees():
     """Retrieve all master's degree programmes (MSc)."""
-    query = """
-    SELECT name, degree_awarded, duration, course_requirements, enrolment_details
-    FROM programs
-    WHERE degree_awarded = 'MSc';
-    """
-    conn = get_db_connection()
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        result = cursor.fetchall()
-    conn.close()
-    return result
\ No newline at end of file
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, "masters_degrees")
+            result = cursor.fetchall()
+    return result
+
+
+# Streaming variants. These read through a server-side cursor and yield rows lazily, for
+# exports and very large departments where materialising the whole result is wasteful.
+# They bypass the result cache; stop iterating (or call .close()) at any time.
+
+def iter_students_in_major(major_name, batch_size=None):
+    """Yield the students in a major one row at a time."""
+    return stream_rows(STUDENTS_IN_MAJOR_QUERY, (major_name,), batch_size, name="iter_students_in_major")
+
+def iter_professors_in_department(department_name, batch_size=None):
+    """Yield the professors in a department one row at a time."""
+    return stream_rows(PROFESSORS_IN_DEPARTMENT_QUERY, (department_name,), batch_size, name="iter_professors_in_department")
+
+def iter_students_in_course(course_name, batch_size=None):
+    """Yield the students enrolled in a course one row at a time."""
+    return stream_rows(STUDENTS_IN_COURSE_QUERY, (course_name,), batch_size, name="iter_students_in_course")
+
+def iter_top_students(batch_size=None):
+    """Yield (student_name, current_grades) for every student above 70% one row at a time."""
+    return stream_rows(TOP_STUDENTS_QUERY, None, batch_size, name="iter_top_students")
+
+def iter_staff_in_department(department_name, batch_size=None):
+    """Yield (staff_name, job_title) for a department one row at a time."""
+    return stream_rows(STAFF_IN_DEPARTMENT_QUERY, (department_name,), batch_size, name="iter_staff_in_department")
+
+def iter_courses_by_department(department_name, batch_size=None):
+    """Yield the courses of a department one row at a time."""
+    return stream_rows(COURSES_BY_DEPARTMENT_QUERY, (department_name,), batch_size, name="iter_courses_by_department")
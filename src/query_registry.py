@@ -0,0 +1,286 @@
+"""
+query_registry.py
+
+Central registry of the application's named SQL queries.
+
+Every query in queries.py (and search.py) is registered under a name together with
+sample parameters. Registered queries are executed through run_query(), which can
+optionally run them as server-side prepared statements, prepared once per connection.
+The registry also drives plan checks: `python src/query_registry.py` EXPLAINs every
+registered query and diffs the plans against data/explain_baseline.json, failing on
+regressions such as a lost index, a new full table scan, filesort or temporary table.
+
+Usage:
+    python src/query_registry.py --save-baseline          # Record plans for the current data
+    python src/query_registry.py                           # Compare with the baseline
+    python src/query_registry.py --scale 10 --analyze      # Load scale 10 into a scratch DB, show EXPLAIN ANALYZE
+"""
+
+import json
+import os
+import re
+import sys
+import time
+import weakref
+from collections import namedtuple
+
+import instrumentation
+from config import REGISTRY_CONFIG
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_EXPLAIN_BASELINE = os.path.join(BASE_DIR, "data", "explain_baseline.json")
+
+# name: registry key; sql: pymysql-style SQL with %s placeholders; sample_params: arguments
+# used for EXPLAIN; allowed_scans: tables that may legitimately be read in full.
+RegisteredQuery = namedtuple("RegisteredQuery", ["name", "sql", "sample_params", "allowed_scans"])
+
+QUERIES = {}
+
+# Statements prepared on each raw connection; entries vanish with their connection
+_prepared = weakref.WeakKeyDictionary()
+
+_PLAN_FLAGS = ("Using filesort", "Using temporary", "Using index", "Using where", "Using join buffer")
+
+
+def register(name, sql, sample_params=None, allowed_scans=()):
+    """
+    Register a named query and return its SQL unchanged, so modules can write
+    `SOME_QUERY = register("some_query", "SELECT ...")`.
+
+    Raises:
+        ValueError: If a different query is already registered under `name`.
+    """
+    existing = QUERIES.get(name)
+    if existing is not None and existing.sql != sql:
+        raise ValueError(f"A different query is already registered as {name!r}.")
+    QUERIES[name] = RegisteredQuery(name, sql, sample_params, frozenset(allowed_scans))
+    return sql
+
+
+def get_query(name):
+    """Return the RegisteredQuery called `name` (KeyError if unknown)."""
+    return QUERIES[name]
+
+
+def _statement_name(name):
+    return "rq_" + re.sub(r"\W", "_", name)
+
+
+def _execute_plain(cursor, query, params):
+    return cursor.execute(query.sql, params)
+
+
+def _execute_prepared(cursor, query, params):
+    conn = cursor.connection
+    prepared = _prepared.setdefault(conn, set())
+    statement = _statement_name(query.name)
+    if statement not in prepared:
+        text = query.sql.strip().rstrip(";").replace("%s", "?")
+        cursor.execute(f"PREPARE {statement} FROM %s", (text,))
+        prepared.add(statement)
+    params = tuple(params or ())
+    if not params:
+        return cursor.execute(f"EXECUTE {statement}")
+    variables = [f"@rq_p{i}" for i in range(len(params))]
+    cursor.execute("SET " + ", ".join(f"{var} = %s" for var in variables), params)
+    return cursor.execute(f"EXECUTE {statement} USING " + ", ".join(variables))
+
+
+def run_query(cursor, name, params=None):
+    """
+    Execute the registered query `name` on `cursor`; fetch results from the cursor as usual.
+
+    With REGISTRY_CONFIG["server_prepare"] the statement is prepared on the connection the
+    first time it is used there and executed with EXECUTE ... USING afterwards. Each call
+    is timed and reported to instrumentation.record().
+    """
+    query = QUERIES[name]
+    execute = _execute_prepared if REGISTRY_CONFIG["server_prepare"] else _execute_plain
+    if not instrumentation.enabled():
+        return execute(cursor, query, params)
+
+    caller = instrumentation.calling_function()
+    start = time.perf_counter()
+    try:
+        result = execute(cursor, query, params)
+    except Exception:
+        instrumentation.record(name, time.perf_counter() - start, 0, caller, error=True)
+        raise
+    # Buffered cursors have read the whole result by now, so rowcount is the row count
+    instrumentation.record(name, time.perf_counter() - start, cursor.rowcount, caller)
+    return result
+
+
+def explain(cursor, query, analyze=False):
+    """
+    EXPLAIN a registered query with its sample parameters.
+
+    Returns:
+        list: Plan rows as dictionaries, or the EXPLAIN ANALYZE text lines when `analyze` is set.
+    """
+    sql = query.sql.strip().rstrip(";")
+    if analyze:
+        cursor.execute("EXPLAIN ANALYZE " + sql, query.sample_params)
+        return [line for row in cursor.fetchall() for line in row[0].splitlines()]
+    cursor.execute("EXPLAIN " + sql, query.sample_params)
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def summarize_plan(rows):
+    """
+    Reduce EXPLAIN rows to the parts that should be stable between runs: the access type,
+    the chosen key and the notable Extra flags (row estimates are dropped).
+    """
+    summary = []
+    for row in rows:
+        extra = row.get("Extra") or ""
+        summary.append({
+            "table": row.get("table"),
+            "type": row.get("type"),
+            "key": row.get("key"),
+            "flags": [flag for flag in _PLAN_FLAGS if flag in extra],
+        })
+    return summary
+
+
+def is_full_scan(step, query):
+    """True if a plan step reads a whole base table the query is not allowed to scan."""
+    table = step["table"] or ""
+    # <derivedN>, <unionN,M> and <subqueryN> are in-memory results, not base tables
+    return step["type"] == "ALL" and not table.startswith("<") and table not in query.allowed_scans
+
+
+def diff_plans(baseline, current):
+    """
+    Compare two {query name: plan summary} mappings.
+
+    Returns:
+        tuple: (regressions, changes) as lists of human-readable strings.
+    """
+    regressions, changes = [], []
+    for name, plan in current.items():
+        previous = baseline.get(name)
+        if previous is None:
+            changes.append(f"{name}: new query")
+            continue
+        if plan == previous:
+            continue
+        before = {(step["table"], position): step for position, step in enumerate(previous)}
+        for position, step in enumerate(plan):
+            old = before.get((step["table"], position))
+            where = f"{name} [{step['table']}]"
+            if old is None:
+                changes.append(f"{where}: new plan step ({step['type']}, key {step['key']})")
+                continue
+            if step["type"] == "ALL" and old["type"] != "ALL":
+                regressions.append(f"{where}: now a full scan (was {old['type']} on {old['key']})")
+            elif old["key"] and not step["key"]:
+                regressions.append(f"{where}: no longer uses an index (was {old['key']})")
+            elif step["key"] != old["key"] or step["type"] != old["type"]:
+                changes.append(f"{where}: {old['type']}/{old['key']} -> {step['type']}/{step['key']}")
+            for flag in ("Using filesort", "Using temporary"):
+                if flag in step["flags"] and flag not in old["flags"]:
+                    regressions.append(f"{where}: new '{flag}'")
+        if len(plan) != len(previous):
+            changes.append(f"{name}: plan has {len(plan)} steps (was {len(previous)})")
+    return regressions, changes
+
+
+def collect_plans(conn):
+    """EXPLAIN every registered query and return {name: plan summary}."""
+    plans = {}
+    with conn.cursor() as cursor:
+        for name in sorted(QUERIES):
+            plans[name] = summarize_plan(explain(cursor, QUERIES[name]))
+    return plans
+
+
+def load_all_queries():
+    """Import the modules that register queries."""
+    import queries  # noqa: F401
+    import search  # noqa: F401
+
+
+def main():
+    """Dump plans for every registered query and diff them against the baseline."""
+    import argparse
+
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from database import connect, configure_connections
+
+    parser = argparse.ArgumentParser(description="EXPLAIN every registered query and check for plan regressions.")
+    parser.add_argument("--scale", type=float, help="Load this generator scale into a scratch database first")
+    parser.add_argument("--seed", type=int, default=42, help="Data generator seed")
+    parser.add_argument("--baseline", default=DEFAULT_EXPLAIN_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the current plans as the baseline")
+    parser.add_argument("--analyze", action="store_true", help="Also print EXPLAIN ANALYZE output (MySQL 8.0.18+)")
+    args = parser.parse_args()
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"no plan baseline at {args.baseline}; record one first with --save-baseline")
+
+    load_all_queries()
+    scale_key = "current" if args.scale is None else str(args.scale)
+    scratch = None
+    if args.scale is not None:
+        import benchmark
+        import generator
+        from config import DB_CONFIG
+
+        scratch = benchmark.SCRATCH_DATABASE
+        benchmark.prepare_scratch_database(scratch, DB_CONFIG["database"])
+        configure_connections(database=scratch)
+        generator.generate_to_database(args.scale, seed=args.seed)
+
+    try:
+        conn = connect()
+        try:
+            plans = collect_plans(conn)
+            if args.analyze:
+                with conn.cursor() as cursor:
+                    for name in sorted(QUERIES):
+                        print(f"\n🔬 {name}")
+                        for line in explain(cursor, QUERIES[name], analyze=True):
+                            print(f"   {line}")
+        finally:
+            conn.close()
+    finally:
+        if scratch:
+            configure_connections()
+            benchmark.drop_scratch_database(scratch)
+
+    scans = [f"{name} [{step['table']}]" for name, plan in plans.items()
+             for step in plan if is_full_scan(step, QUERIES[name])]
+    for scan in scans:
+        print(f"⚠️ Full table scan: {scan}")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    if args.save_baseline:
+        baseline[scale_key] = plans
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f"💾 Plans for {len(plans)} queries saved to {args.baseline} (scale: {scale_key})")
+        return 0
+
+    if scale_key not in baseline:
+        print(f"❌ No baseline for scale {scale_key} in {args.baseline}; run with --save-baseline to create one.")
+        return 1
+
+    regressions, changes = diff_plans(baseline[scale_key], plans)
+    for change in changes:
+        print(f"ℹ️ {change}")
+    if regressions or scans:
+        print("\n❌ Plan regressions detected:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+    print(f"\n✅ {len(plans)} query plans match the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+search.py
+
+Full-text search across courses, lecturers, research projects and students.
+
+Each searchable table has a FULLTEXT index (see models.py). A search runs one
+MATCH ... AGAINST per table in BOOLEAN MODE, where every search word also matches as a
+prefix ("genet" finds "Genetics"), merges them with UNION ALL and ranks the hits by
+relevance. Results come back one page at a time as a queries.Page.
+"""
+
+import re
+import sys
+import os
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache import cached
+from database import db_connection
+from queries import Page, encode_page_token, decode_page_token
+from query_registry import register, run_query
+
+DEFAULT_SEARCH_PAGE_SIZE = 20
+
+# kind -> SELECT producing (kind, item_key, title, detail, score) for the rows matching %s.
+# The MATCH column lists must equal the FULLTEXT indexes declared in models.py.
+SEARCH_SOURCES = {
+    "course": """
+        SELECT 'course' AS kind, course_code AS item_key, name AS title, description AS detail,
+               MATCH(name, description) AGAINST (%s IN BOOLEAN MODE) AS score
+        FROM courses
+        WHERE MATCH(name, description) AGAINST (%s IN BOOLEAN MODE)""",
+    "lecturer": """
+        SELECT 'lecturer', CAST(lecturer_id AS CHAR), CONCAT('Dr. ', name), expertise,
+               MATCH(expertise, research_interests, publications) AGAINST (%s IN BOOLEAN MODE)
+        FROM lecturers
+        WHERE MATCH(expertise, research_interests, publications) AGAINST (%s IN BOOLEAN MODE)""",
+    "research_project": """
+        SELECT 'research_project', project_title, project_title, outcomes,
+               MATCH(project_title, outcomes) AGAINST (%s IN BOOLEAN MODE)
+        FROM research_projects
+        WHERE MATCH(project_title, outcomes) AGAINST (%s IN BOOLEAN MODE)""",
+    "student": """
+        SELECT 'student', CAST(student_id AS CHAR), name, program,
+               MATCH(name) AGAINST (%s IN BOOLEAN MODE)
+        FROM students
+        WHERE MATCH(name) AGAINST (%s IN BOOLEAN MODE)""",
+}
+
+SEARCH_KINDS = tuple(SEARCH_SOURCES)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def to_boolean_query(text):
+    """
+    Turn free text into a BOOLEAN MODE query that matches any word, or any word prefix.
+
+    Boolean operators typed by the user are dropped, so input can never produce a syntax
+    error. Returns an empty string when the text contains no words.
+    """
+    return " ".join(f"{word}*" for word in _WORD.findall(text or ""))
+
+
+def _search_sql(kinds):
+    union = "\n        UNION ALL".join(SEARCH_SOURCES[kind] for kind in kinds)
+    page = f"SELECT kind, item_key, title, detail, score FROM ({union}\n) hits\nORDER BY score DESC, kind, item_key\nLIMIT %s OFFSET %s;"
+    count = f"SELECT COUNT(*) FROM ({union}\n) hits;"
+    return page, count
+
+
+def _search_queries(kinds):
+    """Register the page and count queries for `kinds` (once) and return their registry names."""
+    name = "search_records" if kinds == SEARCH_KINDS else "search_records_" + "_".join(kinds)
+    page, count = _search_sql(kinds)
+    sample = ["data*"] * (2 * len(kinds))
+    register(name, page, sample + [DEFAULT_SEARCH_PAGE_SIZE + 1, 0])
+    register(name + "_count", count, sample)
+    return name, name + "_count"
+
+
+_search_queries(SEARCH_KINDS)
+
+
+def search_records(text, kinds=None, page_token=None, page_size=DEFAULT_SEARCH_PAGE_SIZE, include_total=True):
+    """
+    Search courses, lecturers, research projects and students, most relevant first.
+
+    Args:
+        text (str): Words to look for.
+        kinds (iterable): Restrict to some of SEARCH_KINDS; all of them when None.
+        page_token (str): Token from the previous page's next_token, or None for the first page.
+        page_size (int): Maximum hits per page.
+        include_total (bool): Also count all hits (one extra query).
+
+    Returns:
+        Page: rows are (kind, key, title, detail, score) tuples.
+
+    Raises:
+        ValueError: For an unknown kind or a malformed page token.
+    """
+    # Normalised here, outside the cache, so any iterable of kinds gives a hashable key
+    kinds = SEARCH_KINDS if kinds is None else tuple(kinds)
+    return _search_records(text, kinds, page_token, page_size, include_total)
+
+
+@cached(tables=("courses", "lecturers", "research_projects", "students"))
+def _search_records(text, kinds, page_token, page_size, include_total):
+    unknown = set(kinds) - set(SEARCH_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown search kind(s): {', '.join(sorted(unknown))}")
+    query = to_boolean_query(text)
+    if not query or not kinds:
+        return Page((), None, 0 if include_total else None)
+
+    # Hits are ranked by a computed score, so pages continue from an offset
+    offset = decode_page_token(page_token, 1)[0] if page_token else 0
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError(f"Invalid page token: {page_token!r}")
+    page_query, count_query = _search_queries(kinds)
+    params = [query] * (2 * len(kinds))
+
+    with db_connection() as conn:
+        with conn.cursor() as cursor:
+            run_query(cursor, page_query, params + [page_size + 1, offset])
+            rows = cursor.fetchall()
+            total = None
+            if include_total:
+                run_query(cursor, count_query, params)
+                total = cursor.fetchone()[0]
+
+    next_token = encode_page_token([offset + page_size]) if len(rows) > page_size else None
+    return Page(tuple(tuple(row) for row in rows[:page_size]), next_token, total)  # Immutable: pages are cached
@@ -0,0 +1,171 @@
+"""
+snapshot.py
+
+Save a loaded dataset to a compact local file and restore it with bulk loading.
+
+A snapshot is a zip archive in data/snapshots/ holding one TSV file per table (in the
+format written by loader.format_tsv_row) and a manifest.json with the column lists, row
+counts and the schema fingerprint. Restoring empties the tables and reloads them with
+LOAD DATA LOCAL INFILE, which is much faster than replaying populate_data.sql and always
+gives back exactly the same data. A restore is a single transaction: if it fails partway
+the database keeps its previous contents.
+
+Usage:
+    python src/snapshot.py save seed
+    python src/snapshot.py restore seed
+    python src/snapshot.py list
+"""
+
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+
+# Ensure the `src` directory is included in the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pymysql.cursors
+
+import generator
+import loader
+from bootstrap import schema_fingerprint
+from config import STREAM_CONFIG
+from database import connect
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_DIR = os.path.join(BASE_DIR, "data", "snapshots")
+SNAPSHOT_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def snapshot_path(name, directory=SNAPSHOT_DIR):
+    """Return the archive path for a snapshot name."""
+    if not SNAPSHOT_NAME.match(name):
+        raise ValueError(f"Invalid snapshot name: {name!r} (use letters, digits, '.', '_' or '-')")
+    return os.path.join(directory, f"{name}.zip")
+
+
+def list_snapshots(directory=SNAPSHOT_DIR):
+    """Return the names of the stored snapshots."""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(entry[:-4] for entry in os.listdir(directory) if entry.endswith(".zip"))
+
+
+def read_manifest(name, directory=SNAPSHOT_DIR):
+    """Return a snapshot's manifest dict."""
+    with zipfile.ZipFile(snapshot_path(name, directory)) as archive:
+        return json.loads(archive.read("manifest.json"))
+
+
+def _dump_table(conn, table, columns, archive):
+    """Stream one table into `<table>.tsv` inside the archive; returns the row count."""
+    column_list = ", ".join(f"`{column}`" for column in columns)
+    rows = 0
+    with archive.open(f"{table}.tsv", "w") as raw:
+        with io.TextIOWrapper(raw, encoding="utf-8", newline="\n") as file:
+            with conn.cursor(pymysql.cursors.SSCursor) as cursor:
+                cursor.execute(f"SELECT {column_list} FROM `{table}`")
+                while True:
+                    batch = cursor.fetchmany(STREAM_CONFIG["fetch_batch_rows"])
+                    if not batch:
+                        break
+                    file.writelines(loader.format_tsv_row(row) for row in batch)
+                    rows += len(batch)
+    return rows
+
+
+def save_snapshot(name, directory=SNAPSHOT_DIR, conn=None):
+    """
+    Write every table of the dataset to a snapshot archive, replacing any snapshot of that name.
+
+    Returns:
+        dict: The snapshot's manifest.
+    """
+    path = snapshot_path(name, directory)
+    os.makedirs(directory, exist_ok=True)
+    own_connection = conn is None
+    if own_connection:
+        conn = connect()
+
+    manifest = {
+        "name": name,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "schema": schema_fingerprint(),
+        "tables": {},
+    }
+    temporary = f"{path}.tmp"
+    try:
+        with zipfile.ZipFile(temporary, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for table in generator.TABLE_ORDER:
+                columns = generator.TABLE_COLUMNS[table]
+                rows = _dump_table(conn, table, columns, archive)
+                manifest["tables"][table] = {"columns": columns, "rows": rows}
+            archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+        os.replace(temporary, path)  # Never leave a half-written snapshot under the real name
+    finally:
+        if own_connection:
+            conn.close()
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return manifest
+
+
+def restore_snapshot(name, directory=SNAPSHOT_DIR, conn=None, progress=None):
+    """
+    Replace the current data with a snapshot's contents, all or nothing.
+
+    The tables are emptied with DELETE instead of TRUNCATE, because TRUNCATE commits
+    implicitly and would make the old data unrecoverable before the new data is in.
+    Nothing is committed until every table is loaded and department_stats is rebuilt.
+
+    Raises:
+        ValueError: If the snapshot's column lists no longer match the tables.
+
+    Returns:
+        dict: Rows loaded per table.
+    """
+    path = snapshot_path(name, directory)
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        for table, info in manifest["tables"].items():
+            if info["columns"] != generator.TABLE_COLUMNS.get(table):
+                raise ValueError(f"Snapshot {name!r} does not match the current columns of {table}; reseed instead.")
+        if manifest.get("schema") != schema_fingerprint():
+            print(f"ℹ️ Snapshot {name!r} was taken with an older schema; its columns still match, restoring anyway.")
+
+        with tempfile.TemporaryDirectory() as workdir:
+            files = []
+            for table in generator.TABLE_ORDER:
+                if table in manifest["tables"]:
+                    files.append((table, archive.extract(f"{table}.tsv", workdir), manifest["tables"][table]["rows"]))
+            if progress is None:
+                progress = loader.ProgressReporter(f"Restoring snapshot {name}")
+            return generator.load_generated_files(files, truncate=True, conn=conn, progress=progress, atomic=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Save, restore or list dataset snapshots.")
+    parser.add_argument("action", choices=["save", "restore", "list"])
+    parser.add_argument("name", nargs="?", help="Snapshot name")
+    args = parser.parse_args()
+
+    if args.action == "list":
+        for snapshot in list_snapshots():
+            manifest = read_manifest(snapshot)
+            rows = sum(info["rows"] for info in manifest["tables"].values())
+            print(f"📦 {snapshot:<20} {manifest['created']}  {rows:,} rows")
+    elif not args.name:
+        parser.error("a snapshot name is required")
+    elif args.action == "save":
+        manifest = save_snapshot(args.name)
+        rows = sum(info["rows"] for info in manifest["tables"].values())
+        print(f"✅ Saved snapshot {args.name!r} ({rows:,} rows) to {snapshot_path(args.name)}")
+    else:
+        loaded = restore_snapshot(args.name)
+        print(f"✅ Restored snapshot {args.name!r} ({sum(loaded.values()):,} rows)")
@@ -1,17 +1,64 @@
 import sys
+
+try:
+    import readline  # Tab completion for name prompts (not available on every platform)
+except ImportError:
+    readline = None
+
+import analytics
+import autocomplete
+import instrumentation
+from config import ANALYTICS_CONFIG
 from queries import (
-    get_students_in_major,
+    get_students_in_major_page,
     get_courses_by_department,
     get_professors_in_department,
-    get_students_in_course,
+    get_students_in_course_page,
     get_courses_taught_by_lecturers,
-    get_top_students,
+    get_top_students_page,
     get_staff_in_department,
     get_all_departments,
     get_research_projects_by_department,
     get_bachelors_degrees, 
     get_masters_degrees
 )
+from search import search_records
+
+def ask_name(prompt, category):
+    """
+    Prompt for a department, course or program name with Tab completion.
+
+    A name that matches an existing one apart from case, or is the prefix of exactly one,
+    is replaced by the stored spelling; otherwise close matches are suggested.
+    """
+    if readline is not None:
+        def completer(text, state):
+            matches = autocomplete.complete(category, text.lstrip())
+            return matches[state] if state < len(matches) else None
+
+        readline.set_completer_delims("")  # Complete the whole line, names contain spaces
+        readline.set_completer(completer)
+        readline.parse_and_bind("tab: complete")
+    try:
+        name = input(prompt).strip()
+    finally:
+        if readline is not None:
+            readline.set_completer(None)
+
+    try:
+        match = autocomplete.resolve(category, name)
+        suggestions = [] if match else (autocomplete.complete(category, name) or autocomplete.complete(category, name[:3]))
+    except Exception:
+        return name  # Suggestions are a convenience; the query itself reports connection errors
+    if match and match != name:
+        print(f"🔹 Using '{match}'")
+        return match
+    if suggestions:
+        print(f"💡 Did you mean: {', '.join(suggestions)}?")
+    return name
+
+# Valid menu numbers; only these are used as action labels in the query statistics
+MENU_CHOICES = tuple(str(number) for number in range(1, 16))
 
 def display_menu():
     """Displays the main menu."""
@@ -29,7 +76,10 @@ def display_menu():
     print("9. 🏆  List all research projects in a department")
     print("10. 🎓  List all Bachelor's degree programmes")
     print("11. 🎓  List all Master's degree programmes")
-    print("12. 🚪  Exit")
+    print("12. 🔍  Search courses, lecturers, research and students")
+    print("13. 📈  Show query statistics")
+    print("14. 📊  Grade analytics")
+    print("15. 🚪  Exit")
     print("*" * 50)
 
 def main():
@@ -38,46 +88,54 @@ def main():
         display_menu()
         choice = input("Enter your choice: ").strip()
 
+        # Queries run for this choice are attributed to it in the query statistics
+        instrumentation.set_action(f"CLI: option {choice}" if choice in MENU_CHOICES else None)
         if choice == "1":
-            major_name = input("\n🔹 Enter major name: ").strip()
-            students = get_students_in_major(major_name)
-            print_results(f"Students enrolled in {major_name}", students)
+            major_name = ask_name("\n🔹 Enter major name: ", "program")
+            print_paged_results(
+                f"Students enrolled in {major_name}",
+                lambda token: get_students_in_major_page(major_name, token, include_total=token is None)
+            )
 
         elif choice == "2":
-            department_name = input("\n🔹 Enter department name: ").strip()
+            department_name = ask_name("\n🔹 Enter department name: ", "department")
             courses = get_courses_by_department(department_name)
             print_results(f"Courses in {department_name.upper()}", courses)
 
         elif choice == "3":
-            course_name = input("\n🔹 Enter course name: ").strip()
-            students = get_students_in_course(course_name)
-            print_results(f"Students enrolled in {course_name}", students)
+            course_name = ask_name("\n🔹 Enter course name: ", "course")
+            print_paged_results(
+                f"Students enrolled in {course_name}",
+                lambda token: get_students_in_course_page(course_name, token, include_total=token is None)
+            )
 
         elif choice == "4":
-            students = get_top_students()
-            print_results("Students with an average grade above 70%", students)
+            print_paged_results(
+                "Students with an average grade above 70%",
+                lambda token: get_top_students_page(token, include_total=token is None)
+            )
 
         elif choice == "5":
             departments = get_all_departments()
             print_results("List of Departments", departments)
 
         elif choice == "6":
-            department_name = input("\n🔹 Enter department name: ").strip()
+            department_name = ask_name("\n🔹 Enter department name: ", "department")
             professors = get_professors_in_department(department_name)
             print_lecturer_results(f"Professors in {department_name.upper()}", professors)
 
         elif choice == "7":
-            department_name = input("\n🔹 Enter department name: ").strip()
+            department_name = ask_name("\n🔹 Enter department name: ", "department")
             courses = get_courses_taught_by_lecturers(department_name)
             print_lecturer_results(f"Courses in {department_name.upper()}", courses)
 
         elif choice == "8":
-            department_name = input("\n🔹 Enter department name: ").strip()
+            department_name = ask_name("\n🔹 Enter department name: ", "department")
             staff = get_staff_in_department(department_name)
             print_results(f"Staff in {department_name.upper()}", staff)
 
         elif choice == "9":  # ✅ NEW FUNCTION FOR RESEARCH PROJECTS
-            department_name = input("\n🔹 Enter department name: ").strip()
+            department_name = ask_name("\n🔹 Enter department name: ", "department")
             projects = get_research_projects_by_department(department_name)
             print_research_results(f"Research Projects in {department_name.upper()}", projects)
 
@@ -90,6 +148,25 @@ def main():
             print_degree_results("Master's Degree Programmes", masters_degrees)
 
         elif choice == "12":
+            text = input("\n🔹 Enter search words: ").strip()
+            print_paged_results(
+                f"Search results for '{text}'",
+                lambda token: search_records(text, page_token=token, include_total=token is None),
+                format_item=format_search_hit
+            )
+
+        elif choice == "13":
+            print_query_stats()
+
+        elif choice == "14":
+            by = input("\n🔹 Group by (program, year or program_year) [program]: ").strip().lower() or "program"
+            threshold = input(f"🔹 Grade threshold [{ANALYTICS_CONFIG['default_threshold']}]: ").strip()
+            try:
+                print_grade_analytics(by, float(threshold) if threshold else None)
+            except ValueError as e:
+                print(f"\n❌ {e}")
+
+        elif choice == "15":
             print("\n🚪 Exiting... Goodbye! 👋\n")
             sys.exit(0)
 
@@ -115,23 +192,107 @@ def print_results(title, data):
 
     if data:
         for item in data:
-            if isinstance(item, tuple):
-                if all(isinstance(x, str) and len(x) == 1 for x in item):  
-                    # If the tuple contains single-character elements (fix for department names)
-                    print(f"✔️ {''.join(item)}")  
-                elif len(item) == 2:  
-                    # If the tuple contains two values (Name and Detail)
-                    name, detail = item
-                    print(f"✔️ {name}: {detail}")  
-                else:
-                    print(f"✔️ {' '.join(map(str, item))}")  
-            else:
-                print(f"✔️ {item}")  # If item is a single string
+            print(format_result_item(item))
     else:
         print("❌ No results found.")
 
     print("*" * 40)
 
+def format_result_item(item):
+    """Formats a single result row for print_results and print_paged_results."""
+    if isinstance(item, tuple):
+        if all(isinstance(x, str) and len(x) == 1 for x in item):  
+            # If the tuple contains single-character elements (fix for department names)
+            return f"✔️ {''.join(item)}"
+        elif len(item) == 2:  
+            # If the tuple contains two values (Name and Detail)
+            name, detail = item
+            return f"✔️ {name}: {detail}"
+        else:
+            return f"✔️ {' '.join(map(str, item))}"
+    return f"✔️ {item}"  # If item is a single string
+
+def format_search_hit(hit):
+    """Formats a search_records() row as '[kind] title: detail'."""
+    kind, _, title, detail, _ = hit
+    label = kind.replace("_", " ").title()
+    return f"✔️ [{label}] {title}" + (f": {detail}" if detail else "")
+
+def print_paged_results(title, fetch_page, format_item=format_result_item):
+    """
+    Displays a paginated query one page at a time.
+
+    Args:
+        title (str): Heading for the results.
+        fetch_page (callable): Takes a page token (None for the first page) and returns a queries.Page.
+        format_item (callable): Formats one row for display.
+    """
+    print("\n" + "*" * 40)
+    print(f"📌 {title}:")
+    print("*" * 40)
+
+    shown = 0
+    total = None
+    token = None
+    while True:
+        page = fetch_page(token)
+        if page.total is not None:
+            total = page.total
+        if not page.rows and shown == 0:
+            print("❌ No results found.")
+            break
+
+        for item in page.rows:
+            print(format_item(item))
+        shown += len(page.rows)
+        print(f"📄 Showing {shown} of {total}" if total is not None else f"📄 Showing {shown}")
+
+        if not page.next_token:
+            break
+        more = input("➡️  Press Enter for the next page, or 'q' to stop: ").strip().lower()
+        if more == "q":
+            break
+        token = page.next_token
+
+    print("*" * 40)
+
+def print_query_stats():
+    """Prints per-query timings, row counts and callers for this session."""
+    print("\n" + "*" * 90)
+    print("📌 Query statistics for this session:")
+    print("*" * 90)
+    print(instrumentation.format_query_stats())
+    print(f"\n🐢 Slow queries are logged to {instrumentation.slow_log_path()}")
+    print("*" * 90)
+
+def print_grade_analytics(by="program", threshold=None):
+    """Prints grade percentiles, the grade distribution and per-group statistics."""
+    threshold = ANALYTICS_CONFIG["default_threshold"] if threshold is None else threshold
+    groups = analytics.group_statistics(by, threshold)  # Validates `by` before anything is printed
+    print("\n" + "*" * 90)
+    print(f"📌 Grade analytics by {by.replace('_', ' and ')} (threshold {threshold:g}%):")
+    print("*" * 90)
+    if not groups:
+        print("❌ No graded students found.")
+        print("*" * 90)
+        return
+
+    percentiles = analytics.grade_percentiles()
+    print("📈 Percentiles: " + ", ".join(f"p{p}={value:.1f}" for p, value in percentiles.items()))
+    print("\n📊 Distribution:")
+    distribution = analytics.grade_distribution()
+    largest = max(count for _, _, count in distribution) or 1
+    for low, high, count in distribution:
+        print(f"   {low:>5.0f}-{high:<5.0f} {'█' * round(30 * count / largest):<30} {count}")
+
+    print(f"\n{'Group':<40} {'Students':>8} {'Mean':>7} {'Std':>6} {'Median':>7} {'Min':>6} {'Max':>6} {'Above':>7}")
+    for row in groups:
+        print(
+            f"{analytics.format_group(row.group, by)[:40]:<40} {row.students:>8} {row.mean:>7.1f} {row.std:>6.1f} "
+            f"{row.median:>7.1f} {row.minimum:>6.1f} {row.maximum:>6.1f} {row.above_share:>6.0%}"
+        )
+    print("*" * 90)
+
 def print_research_results(title, data):
     """Formats and displays query results with structured output."""
     print("\n" + "*" * 50)
@@ -3,62 +3,86 @@ This script automates the database setup and execution of the University Record
 It also allows the user to choose between running the application in CLI or GUI mode.
 """
 
+import argparse
 import subprocess
 import sys
-import pymysql
-from sqlalchemy import create_engine, inspect
-from src.config import DB_CONFIG
 import os
+import time
 
-# Database connection credentials
-DB_HOST = DB_CONFIG['host']
-DB_USER = DB_CONFIG['user']
-DB_PASSWORD = DB_CONFIG['password']
-DB_NAME = DB_CONFIG['database']
-DB_PORT = DB_CONFIG['port']
+# Make the modules in src/ importable so setup runs in this process instead of subprocesses
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
 
-def database_exists():
-    """Check if the MySQL database exists before running setup."""
+from bootstrap import bootstrap, record_startup_time
+from database import connect
+from populate_data import execute_sql_file, populate_project_members, refresh_department_stats
+from snapshot import list_snapshots, restore_snapshot, save_snapshot
+
+def parse_args():
+    """Parse the data-loading options."""
+    parser = argparse.ArgumentParser(description="Set up the database and launch the University Record Management System.")
+    data_mode = parser.add_mutually_exclusive_group()
+    data_mode.add_argument("--keep-data", action="store_true", help="Use the data already in the database")
+    data_mode.add_argument("--restore-snapshot", metavar="NAME", help="Replace the data with a saved snapshot")
+    data_mode.add_argument("--reseed", action="store_true", help="Reload data/populate_data.sql")
+    parser.add_argument("--save-snapshot", metavar="NAME", help="Save the loaded data as a snapshot before launching")
+    return parser.parse_args()
+
+def has_data():
+    """Check whether the database already holds student records."""
+    conn = connect()
     try:
-        conn = pymysql.connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD, port=DB_PORT)
-        cursor = conn.cursor()
-        cursor.execute(f"SHOW DATABASES LIKE '{DB_NAME}'")
-        database_found = cursor.fetchone()
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM students)")
+            return bool(cursor.fetchone()[0])
+    finally:
         conn.close()
-        return bool(database_found)
-    except pymysql.MySQLError as e:
-        print(f"⚠️ Database connection error: {e}")
-        return False
-
-def tables_exist():
-    """Check if required tables exist in the database."""
-    DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    engine = create_engine(DATABASE_URL)
-    inspector = inspect(engine)
-    required_tables = [
-        "students", "lecturers", "courses", "departments", 
-        "research_projects", "non_academic_staff", "enrollments", "lecturer_courses"
-    ]
-
-    existing_tables = inspector.get_table_names()
-    return all(table in existing_tables for table in required_tables)
-
-def setup_database():
-    """Ensures database setup and resets data every time."""
-    if not database_exists():
-        print("🛠️ Database not found. Creating database and tables...")
-        subprocess.run([sys.executable, "src/models.py"], check=True)
-        print("✅ Database setup complete!")
-
-    if not tables_exist():
-        print("🛠️ Tables missing. Creating tables...")
-        subprocess.run([sys.executable, "src/models.py"], check=True)
-        print("✅ Tables setup complete!")
 
+def reseed():
+    """Reload the seed data from data/populate_data.sql."""
     print("🔄 Resetting database data...")
-    subprocess.run([sys.executable, "src/populate_data.py"], check=True)
+    execute_sql_file("data/populate_data.sql")
+    populate_project_members()
+    refresh_department_stats()
     print("✅ Database reset and repopulated successfully!")
 
+def setup_database(keep_data=False, snapshot=None, reseed_data=False, save_as=None):
+    """
+    Ensures the schema is up to date, then keeps, restores or reseeds the data.
+
+    With no option chosen, existing data is kept and an empty database is seeded.
+    """
+    started = time.perf_counter()
+    result = bootstrap()
+    if result["applied"]:
+        print("✅ Database schema created/updated!")
+    else:
+        print("✅ Database schema is up to date.")
+    timings = dict(result["timings"])
+
+    step = time.perf_counter()
+    if snapshot:
+        if snapshot not in list_snapshots():
+            print(f"❌ Snapshot {snapshot!r} not found. Available: {', '.join(list_snapshots()) or 'none'}")
+            sys.exit(1)
+        loaded = restore_snapshot(snapshot)
+        mode = "restore"
+        print(f"✅ Restored snapshot {snapshot!r} ({sum(loaded.values()):,} rows)")
+    elif reseed_data or (not keep_data and not has_data()):
+        reseed()
+        mode = "reseed"
+    else:
+        mode = "keep"
+        print("📦 Keeping the existing data (use --reseed to reload it).")
+    timings["data"] = time.perf_counter() - step
+
+    if save_as:
+        manifest = save_snapshot(save_as)
+        print(f"💾 Saved snapshot {save_as!r} ({sum(t['rows'] for t in manifest['tables'].values()):,} rows)")
+
+    timings["startup_total"] = time.perf_counter() - started
+    record_startup_time(timings, schema_applied=result["applied"], data_mode=mode)
+    print(f"⏱️ Startup took {timings['startup_total']:.2f}s")
+
 def choose_interface():
     """Prompt user to choose between CLI or GUI before running the application."""
 
@@ -99,5 +123,6 @@ def choose_interface():
             print("\n❌ Invalid choice. Please enter \033[1;33m1\033[0m for CLI, \033[1;33m2\033[0m for GUI, or \033[1;33m0\033[0m to exit.\n")
 
 if __name__ == "__main__":
-    setup_database()
+    args = parse_args()
+    setup_database(args.keep_data, args.restore_snapshot, args.reseed, args.save_snapshot)
     choose_interface()
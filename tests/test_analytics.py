@@ -0,0 +1,102 @@
+"""
+test_analytics.py
+
+This module tests the NumPy grade analytics against straightforward Python calculations.
+No database is needed: the functions are given GradeData built from sample rows.
+"""
+
+import unittest
+import statistics
+import sys
+import os
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import analytics
+
+ROWS = [
+    (1, "Physics", 1, 82.0), (2, "Physics", 1, 64.5), (3, "Physics", 2, 91.0), (4, "Physics", 2, 70.0),
+    (5, "History", 1, 55.0), (6, "History", 2, 71.5), (7, "History", 2, 68.0),
+    (8, "Biology", 3, 77.0),
+]
+
+class TestGradeAnalytics(unittest.TestCase):
+    """Test cases for grouped statistics, percentiles, z-scores and cohort comparison."""
+
+    def setUp(self):
+        """Build column arrays from the sample rows."""
+        self.data = analytics.make_grade_data(ROWS)
+
+    def grades(self, program=None, year=None):
+        return [grade for _, p, y, grade in ROWS if program in (None, p) and year in (None, y)]
+
+    def test_group_statistics_by_program(self):
+        """Per-program statistics should match the statistics module."""
+        rows = analytics.group_statistics("program", threshold=70, data=self.data)
+        self.assertEqual([row.group for row in rows], ["Biology", "History", "Physics"])
+        for row in rows:
+            grades = self.grades(program=row.group)
+            self.assertEqual(row.students, len(grades))
+            self.assertAlmostEqual(row.mean, statistics.mean(grades))
+            self.assertAlmostEqual(row.std, statistics.pstdev(grades))
+            self.assertAlmostEqual(row.median, statistics.median(grades))
+            self.assertEqual((row.minimum, row.maximum), (min(grades), max(grades)))
+            self.assertEqual(row.above, sum(grade > 70 for grade in grades))
+
+    def test_group_statistics_by_program_and_year(self):
+        """Combined groups should be (program, year) pairs."""
+        rows = analytics.group_statistics("program_year", data=self.data)
+        self.assertEqual(len(rows), 5)
+        physics_year_2 = next(row for row in rows if row.group == ("Physics", 2))
+        self.assertAlmostEqual(physics_year_2.mean, statistics.mean(self.grades("Physics", 2)))
+        self.assertEqual(analytics.format_group(("Physics", 2), "program_year"), "Physics, year 2")
+        with self.assertRaises(ValueError):
+            analytics.group_statistics("faculty", data=self.data)
+
+    def test_percentiles_and_distribution(self):
+        """Percentiles and histogram counts should cover every grade."""
+        self.assertAlmostEqual(analytics.grade_percentiles((50,), self.data)[50], statistics.median(self.grades()))
+        distribution = analytics.grade_distribution(10, self.data)
+        self.assertEqual(sum(count for _, _, count in distribution), len(ROWS))
+        self.assertEqual(dict(((low, count) for low, _, count in distribution))[70.0], 3)
+
+    def test_z_scores_within_groups(self):
+        """Group z-scores should be standardised within each program."""
+        scores = analytics.z_scores("program", self.data)
+        history = self.grades(program="History")
+        expected = (55.0 - statistics.mean(history)) / statistics.pstdev(history)
+        self.assertAlmostEqual(scores[4], expected)
+        self.assertEqual(scores[7], 0.0)  # Biology has a single student
+
+    def test_read_only_arrays(self):
+        """The analyses should work on read-only arrays, as returned by the cached load_grades()."""
+        for array in self.data:
+            array.flags.writeable = False
+        analytics.group_statistics("program_year", threshold=70, data=self.data)
+        analytics.grade_percentiles(data=self.data)
+        analytics.grade_distribution(data=self.data)
+        analytics.z_scores("program", self.data)
+        analytics.outliers(1.0, data=self.data)
+        analytics.compare_cohorts("Physics", "History", data=self.data)
+        with self.assertRaises(ValueError):
+            self.data.grades[0] = 0
+
+    def test_compare_cohorts(self):
+        """Mean difference and Welch's t should match a manual calculation."""
+        physics, history = self.grades(program="Physics"), self.grades(program="History")
+        result = analytics.compare_cohorts("Physics", "History", data=self.data)
+        difference = statistics.mean(physics) - statistics.mean(history)
+        standard_error = (statistics.variance(physics) / 4 + statistics.variance(history) / 3) ** 0.5
+        self.assertAlmostEqual(result.difference, difference)
+        self.assertAlmostEqual(result.t_statistic, difference / standard_error)
+        self.assertIsNone(analytics.compare_cohorts("Physics", "Biology", data=self.data).t_statistic)
+
+    def test_empty_data(self):
+        """With no graded students the functions should return empty results."""
+        empty = analytics.make_grade_data([])
+        self.assertEqual(analytics.group_statistics(data=empty), [])
+        self.assertEqual(sum(count for _, _, count in analytics.grade_distribution(data=empty)), 0)
+
+if __name__ == "__main__":
+    unittest.main()
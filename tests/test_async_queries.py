@@ -0,0 +1,60 @@
+"""
+test_async_queries.py
+
+This module tests the asyncio query API: timeouts, concurrent fan-out and parity with queries.py.
+"""
+
+import asyncio
+import time
+import unittest
+import sys
+import os
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import async_queries
+from async_queries import run_sync, get_department_details, get_all_departments
+from queries import get_courses_by_department, get_staff_in_department
+
+class TestRunSync(unittest.TestCase):
+    """Test cases for running blocking calls from the event loop."""
+
+    def test_calls_run_concurrently(self):
+        """Blocking calls fanned out with gather should overlap instead of running in sequence."""
+        async def fan_out():
+            return await asyncio.gather(*(run_sync(time.sleep, 0.2) for _ in range(3)))
+
+        started = time.perf_counter()
+        asyncio.run(fan_out())
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+    def test_timeout(self):
+        """A call that outlives its timeout should raise asyncio.TimeoutError."""
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(run_sync(time.sleep, 0.5, timeout=0.05))
+
+    def test_async_version_keeps_metadata(self):
+        """Async counterparts should keep the name and docstring of the synchronous query."""
+        self.assertEqual(get_all_departments.__name__, "get_all_departments")
+        self.assertTrue(asyncio.iscoroutinefunction(get_all_departments))
+        self.assertEqual(async_queries.get_department_overview.__name__, "get_department_overview")
+        self.assertTrue(asyncio.iscoroutinefunction(async_queries.get_department_overviews))
+        self.assertTrue(asyncio.iscoroutinefunction(async_queries.get_department_stats))
+        self.assertEqual(async_queries.search_records.__name__, "search_records")
+
+class TestAsyncQueries(unittest.TestCase):
+    """Test cases for the async query API against the database."""
+
+    @classmethod
+    def tearDownClass(cls):
+        async_queries.shutdown()
+
+    def test_department_details_match_sync_queries(self):
+        """Fan-out results should equal the synchronous queries."""
+        details = asyncio.run(get_department_details("Computer Science", timeout=10))
+        self.assertEqual(details["courses"], get_courses_by_department("Computer Science"))
+        self.assertEqual(details["staff"], get_staff_in_department("Computer Science"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+test_autocomplete.py
+
+This module tests the prefix index used to suggest department, course and program names.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from autocomplete import PrefixIndex, Autocompleter
+from cache import QueryCache
+
+class TestPrefixIndex(unittest.TestCase):
+    """Test cases for PrefixIndex."""
+
+    def setUp(self):
+        self.index = PrefixIndex(["Computer Science", "Computational Biology", "Chemistry", "Physics", "chemistry"])
+
+    def test_complete_is_case_insensitive_and_sorted(self):
+        """Completions should ignore case and come back in alphabetical order."""
+        self.assertEqual(self.index.complete("comp"), ["Computational Biology", "Computer Science"])
+        self.assertEqual(self.index.complete("CH"), ["Chemistry"])
+        self.assertEqual(self.index.complete("x"), [])
+        self.assertEqual(self.index.complete("", limit=2), ["Chemistry", "Computational Biology"])
+
+    def test_resolve(self):
+        """Exact names (any case) and unique prefixes resolve; ambiguous ones do not."""
+        self.assertEqual(self.index.resolve("physics"), "Physics")
+        self.assertEqual(self.index.resolve("Computer"), "Computer Science")
+        self.assertIsNone(self.index.resolve("Comput"))
+        self.assertIsNone(self.index.resolve(""))
+
+class TestAutocompleter(unittest.TestCase):
+    """Test cases for loading and refreshing the name indexes."""
+
+    def setUp(self):
+        self.loads = 0
+        self.names = [("department", "Physics"), ("course", "Quantum Mechanics")]
+        self.cache = QueryCache()
+        self.now = 0.0
+
+        def load_names():
+            self.loads += 1
+            return list(self.names)
+
+        self.completer = Autocompleter(load_names, cache=self.cache, refresh_interval=60, clock=lambda: self.now)
+
+    def test_loads_once(self):
+        """Repeated lookups should not reload the names."""
+        self.assertEqual(self.completer.complete("department", "ph"), ["Physics"])
+        self.completer.complete("course", "q")
+        self.assertEqual(self.loads, 1)
+
+    def test_refreshes_after_relevant_invalidation(self):
+        """Writes to a name table should trigger a reload; writes elsewhere should not."""
+        self.completer.complete("department", "")
+        self.cache.invalidate_tables("enrollments")
+        self.completer.complete("department", "")
+        self.assertEqual(self.loads, 1)
+
+        self.names.append(("department", "Philosophy"))
+        self.cache.invalidate_tables("departments")
+        self.assertEqual(self.completer.complete("department", "ph"), ["Philosophy", "Physics"])
+        self.assertEqual(self.loads, 2)
+
+    def test_refreshes_after_interval(self):
+        """Names should be reloaded once the refresh interval has passed."""
+        self.completer.complete("department", "")
+        self.now = 61
+        self.completer.complete("department", "")
+        self.assertEqual(self.loads, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+test_benchmark.py
+
+This module tests the benchmark's pure helpers: percentile interpolation, row counting
+and the baseline comparison. No database is needed.
+"""
+
+import unittest
+import sys
+import os
+from types import MappingProxyType
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from benchmark import percentile, compare_to_baseline, _call
+
+def results(p95_ms, scale="1", name="get_top_students"):
+    """Benchmark results holding a single query's p95 latency."""
+    return {scale: {name: {"p95_ms": p95_ms}}}
+
+class TestPercentile(unittest.TestCase):
+    """Test cases for percentile()."""
+
+    def test_interpolates_between_values(self):
+        """Percentiles between two samples should be linearly interpolated."""
+        values = [10.0, 20.0, 30.0, 40.0]
+        self.assertEqual(percentile(values, 0.0), 10.0)
+        self.assertEqual(percentile(values, 0.5), 25.0)
+        self.assertAlmostEqual(percentile(values, 0.95), 38.5)
+        self.assertEqual(percentile(values, 1.0), 40.0)
+
+    def test_small_inputs(self):
+        """An empty list should give 0.0 and a single value should be every percentile."""
+        self.assertEqual(percentile([], 0.95), 0.0)
+        self.assertEqual(percentile([7.0], 0.5), 7.0)
+        self.assertEqual(percentile([7.0], 0.99), 7.0)
+
+class TestCall(unittest.TestCase):
+    """Test cases for counting the rows a query function returns."""
+
+    def test_sequences_and_streams(self):
+        """Lists and tuples should count their length; generators should be drained."""
+        self.assertEqual(_call(lambda: [(1,), (2,)], ()), 2)
+        self.assertEqual(_call(lambda n: ((i,) for i in range(n)), (5,)), 5)
+        self.assertEqual(_call(lambda: None, ()), 0)
+
+    def test_mappings(self):
+        """A single record counts once; a mapping of records counts each record."""
+        overview = MappingProxyType({"courses": ((1,), (2,)), "staff": (), "professors": ((3,),)})
+        self.assertEqual(_call(lambda: overview, ()), 1)
+        self.assertEqual(_call(lambda: MappingProxyType({"Physics": overview, "History": overview}), ()), 2)
+        self.assertEqual(_call(lambda: MappingProxyType({}), ()), 0)
+
+class TestCompareToBaseline(unittest.TestCase):
+    """Test cases for compare_to_baseline()."""
+
+    def test_regression_must_exceed_tolerance_and_floor(self):
+        """A slowdown is reported only when it beats both the relative tolerance and min_delta_ms."""
+        baseline = {"results": results(10.0)}
+        self.assertEqual(len(compare_to_baseline(results(13.0), baseline, 0.25, 1.0)), 1)
+        self.assertEqual(compare_to_baseline(results(12.0), baseline, 0.25, 1.0), [])
+        self.assertEqual(compare_to_baseline(results(13.0), baseline, 0.25, 5.0), [])
+
+    def test_tiny_latencies_ignore_jitter(self):
+        """Sub-millisecond queries should not regress on relative jitter alone."""
+        baseline = {"results": results(0.2)}
+        self.assertEqual(compare_to_baseline(results(0.6), baseline, 0.25, 1.0), [])
+
+    def test_queries_missing_from_baseline(self):
+        """New queries and scales without a baseline entry should be skipped."""
+        baseline = {"results": results(10.0)}
+        self.assertEqual(compare_to_baseline(results(50.0, scale="10"), baseline, 0.25, 1.0), [])
+        self.assertEqual(compare_to_baseline(results(50.0, name="get_transcript"), baseline, 0.25, 1.0), [])
+        self.assertEqual(compare_to_baseline(results(50.0), {}, 0.25, 1.0), [])
+
+    def test_message(self):
+        """The report should name the query, the scale and both latencies."""
+        regressions = compare_to_baseline(results(20.0), {"results": results(10.0)}, 0.25, 1.0)
+        self.assertEqual(regressions, ["get_top_students @ scale 1: p95 20.00 ms vs baseline 10.00 ms"])
+
+if __name__ == "__main__":
+    unittest.main()
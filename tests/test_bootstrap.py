@@ -0,0 +1,56 @@
+"""
+test_bootstrap.py
+
+This module tests the schema bootstrap: side-effect-free model imports, the schema
+fingerprint and skipping work when the stored version already matches.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import models
+from bootstrap import bootstrap, schema_fingerprint, stored_fingerprint, record_startup_time
+
+class TestSchemaFingerprint(unittest.TestCase):
+    """Test cases that do not need a database."""
+
+    def test_models_import_has_no_side_effects(self):
+        """Importing models should not create an engine or open a session."""
+        self.assertFalse(hasattr(models, "engine"))
+        self.assertFalse(hasattr(models, "session"))
+
+    def test_fingerprint_is_stable(self):
+        """The same models should always produce the same fingerprint."""
+        self.assertEqual(schema_fingerprint(), schema_fingerprint())
+        self.assertEqual(len(schema_fingerprint()), 64)
+
+    def test_record_startup_time(self):
+        """Each start-up should append one JSON line with its timings."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "startup.jsonl")
+            record_startup_time({"total": 0.123456}, path, schema_applied=False)
+            record_startup_time({"total": 0.5}, path, schema_applied=True)
+            with open(path, encoding="utf-8") as file:
+                entries = [json.loads(line) for line in file]
+        self.assertEqual([entry["timings"]["total"] for entry in entries], [0.1235, 0.5])
+        self.assertTrue(entries[1]["schema_applied"])
+
+class TestBootstrap(unittest.TestCase):
+    """Test cases against the database."""
+
+    def test_second_run_skips_schema_work(self):
+        """Once the schema is applied, bootstrap should only check the stored version."""
+        bootstrap()
+        result = bootstrap()
+        self.assertFalse(result["applied"])
+        self.assertNotIn("apply_schema", result["timings"])
+        self.assertEqual(stored_fingerprint(), schema_fingerprint())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+test_cache.py
+
+This module tests the query result cache: LRU eviction, TTL expiry and table-based invalidation.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from cache import QueryCache, cached, table_written_by
+
+class FakeClock:
+    """A controllable time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestQueryCache(unittest.TestCase):
+    """Test cases for QueryCache and the cached() decorator."""
+
+    def setUp(self):
+        """Create a small cache with a fake clock."""
+        self.clock = FakeClock()
+        self.cache = QueryCache(max_entries=2, default_ttl=10, clock=self.clock)
+        self.calls = []
+
+        @cached(tables=("students",), cache=self.cache)
+        def students_in_major(major):
+            self.calls.append(major)
+            return ((f"{major} student",),)
+
+        self.students_in_major = students_in_major
+
+    def test_read_through_and_hit_statistics(self):
+        """The second call with the same arguments should be served from the cache."""
+        self.assertEqual(self.students_in_major("Physics"), (("Physics student",),))
+        self.students_in_major("Physics")
+        self.assertEqual(self.calls, ["Physics"])
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_ttl_expiry(self):
+        """Entries older than their TTL should be reloaded."""
+        self.students_in_major("Physics")
+        self.clock.now = 11
+        self.students_in_major("Physics")
+        self.assertEqual(self.calls, ["Physics", "Physics"])
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+    def test_lru_eviction(self):
+        """The least recently used entry should be evicted when the cache is full."""
+        self.students_in_major("Physics")
+        self.students_in_major("History")
+        self.students_in_major("Physics")  # Physics is now most recently used
+        self.students_in_major("Biology")  # Evicts History
+        self.students_in_major("Physics")
+        self.students_in_major("History")
+        self.assertEqual(self.calls, ["Physics", "History", "Biology", "History"])
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+    def test_invalidation_by_table(self):
+        """Writing to a dependent table should evict the entry; other tables should not."""
+        self.students_in_major("Physics")
+        self.cache.invalidate_tables("courses")
+        self.students_in_major("Physics")
+        self.cache.invalidate_tables("students")
+        self.students_in_major("Physics")
+        self.assertEqual(self.calls, ["Physics", "Physics"])
+
+    def test_stale_result_is_not_stored(self):
+        """A result computed while its table was being written should not be cached."""
+        @cached(tables=("students",), cache=self.cache)
+        def racing_query():
+            self.calls.append("query")
+            self.cache.invalidate_tables("students")  # A write lands mid-query
+            return ()
+
+        racing_query()
+        racing_query()
+        self.assertEqual(self.calls, ["query", "query"])
+
+    def test_disabled_cache_passes_through(self):
+        """With the cache disabled every call should reach the database."""
+        self.cache.enabled = False
+        self.students_in_major("Physics")
+        self.students_in_major("Physics")
+        self.assertEqual(len(self.calls), 2)
+
+class TestTableWrittenBy(unittest.TestCase):
+    """Test cases for detecting which table a statement writes."""
+
+    def test_write_statements(self):
+        """Writes should report their target table; reads should not."""
+        self.assertEqual(table_written_by("INSERT INTO students (name) VALUES ('x')"), "students")
+        self.assertEqual(table_written_by("TRUNCATE TABLE enrollments"), "enrollments")
+        self.assertEqual(table_written_by("UPDATE `courses` SET credits = 10"), "courses")
+        self.assertEqual(table_written_by("DELETE FROM lecturers WHERE lecturer_id = 1"), "lecturers")
+        self.assertEqual(table_written_by("LOAD DATA LOCAL INFILE '/tmp/x' INTO TABLE programs"), "programs")
+        self.assertIsNone(table_written_by("SELECT * FROM students"))
+        self.assertIsNone(table_written_by("SET FOREIGN_KEY_CHECKS = 0"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,7 +11,7 @@ import os
 # Add src/ to the Python path dynamically
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
-from database import get_db_connection  # Import the database connection function
+from database import get_db_connection, get_pool, ConnectionPool, PoolTimeoutError, _connect_kwargs  # Import the database connection helpers
 
 class TestDatabaseConnection(unittest.TestCase):
     """Test cases for verifying database connection and tables."""
@@ -39,5 +39,57 @@ class TestDatabaseConnection(unittest.TestCase):
                 result = self.cursor.fetchone()
                 self.assertIsNotNone(result, f"Table '{table}' does not exist!")
 
+class TestConnectionPool(unittest.TestCase):
+    """Test cases for the pooled connection API."""
+
+    def test_connection_is_reused(self):
+        """A returned connection should be handed out again instead of reconnecting."""
+        pool = ConnectionPool(size=1, **_connect_kwargs())
+        try:
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT CONNECTION_ID()")
+                    first_id = cursor.fetchone()[0]
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT CONNECTION_ID()")
+                    second_id = cursor.fetchone()[0]
+            self.assertEqual(first_id, second_id)
+            self.assertEqual(pool.stats()["created"], 1)
+            self.assertEqual(pool.stats()["checkouts"], 2)
+        finally:
+            pool.close()
+
+    def test_checkout_times_out_when_exhausted(self):
+        """Checking out from a full pool should fail after the timeout."""
+        pool = ConnectionPool(size=1, checkout_timeout=0.1, **_connect_kwargs())
+        try:
+            conn = pool.acquire()
+            with self.assertRaises(PoolTimeoutError):
+                pool.acquire()
+            conn.close()
+            self.assertEqual(pool.stats()["timeouts"], 1)
+        finally:
+            pool.close()
+
+    def test_expired_connection_is_recycled(self):
+        """Connections older than max_lifetime should be replaced on checkout."""
+        pool = ConnectionPool(size=1, max_lifetime=0, **_connect_kwargs())
+        try:
+            with pool.connection():
+                pass
+            with pool.connection():
+                pass
+            self.assertEqual(pool.stats()["created"], 2)
+        finally:
+            pool.close()
+
+    def test_shared_pool_metrics(self):
+        """get_db_connection() should check out from the shared pool."""
+        checkouts = get_pool().stats()["checkouts"]
+        conn = get_db_connection()
+        conn.close()
+        self.assertEqual(get_pool().stats()["checkouts"], checkouts + 1)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,114 @@
+"""
+test_department_stats.py
+
+This module tests that the department_stats summary table follows writes to the fact tables.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from department_stats import trigger_statements, rebuild_department_stats, TRACKED_TABLES, COUNTER_COLUMNS
+from database import get_db_connection
+
+TEST_DEPARTMENT = "Trigger Test Department"
+NEW_DEPARTMENT = "Trigger Brand New Department"
+
+class TestTriggerStatements(unittest.TestCase):
+    """Test cases for the generated trigger DDL."""
+
+    def test_every_table_and_event_has_a_trigger(self):
+        """Each tracked table should get an INSERT, UPDATE and DELETE trigger."""
+        names = [name for name, _ in trigger_statements()]
+        self.assertEqual(len(names), 3 * len(TRACKED_TABLES))
+        self.assertIn("trg_department_stats_students_update", names)
+        self.assertEqual(len(set(names)), len(names))
+
+    def test_triggers_can_be_suspended_and_avoid_values_function(self):
+        """Bulk loads skip the triggers via @skip_department_stats; VALUES() in upserts is deprecated."""
+        for name, statement in trigger_statements():
+            with self.subTest(trigger=name):
+                self.assertIn("BEGIN IF @skip_department_stats IS NULL THEN", statement)
+                self.assertNotIn("VALUES(", statement)
+
+    def test_inserts_name_every_counter(self):
+        """Trigger upserts should not rely on column defaults when they create a department's row."""
+        for name, statement in trigger_statements():
+            for insert in statement.split("INSERT INTO department_stats")[1:]:
+                with self.subTest(trigger=name):
+                    columns = insert[insert.index("(") + 1:insert.index(")")]
+                    self.assertEqual([c.strip() for c in columns.split(",")], ["department"] + list(COUNTER_COLUMNS))
+
+class TestDepartmentStats(unittest.TestCase):
+    """Test cases for incremental maintenance of department_stats."""
+
+    def setUp(self):
+        """Set up database connection before each test."""
+        self.conn = get_db_connection()
+        self.cursor = self.conn.cursor()
+
+    def tearDown(self):
+        """Remove test rows and close the connection."""
+        self.cursor.execute("DELETE FROM students WHERE student_id IN (99001, 99002)")
+        self.cursor.execute("DELETE FROM courses WHERE course_code IN ('TRG101', 'TRG201')")
+        self.cursor.execute("DELETE FROM department_stats WHERE department IN (%s, %s)", (TEST_DEPARTMENT, NEW_DEPARTMENT))
+        self.conn.commit()
+        self.cursor.close()
+        self.conn.close()
+
+    def stats(self):
+        self.cursor.execute(
+            "SELECT course_count, student_count, graded_students, grade_total FROM department_stats WHERE department = %s",
+            (TEST_DEPARTMENT,)
+        )
+        return self.cursor.fetchone()
+
+    def test_counts_follow_inserts_updates_and_deletes(self):
+        """Inserting, updating and deleting rows should adjust the department's counters."""
+        self.cursor.execute(
+            "INSERT INTO courses (course_code, name, department) VALUES ('TRG101', 'Trigger Course', %s)", (TEST_DEPARTMENT,)
+        )
+        self.cursor.executemany(
+            "INSERT INTO students (student_id, name, program, current_grades) VALUES (%s, %s, %s, %s)",
+            [(99001, "Trigger One", TEST_DEPARTMENT, 80.0), (99002, "Trigger Two", TEST_DEPARTMENT, 60.0)]
+        )
+        self.conn.commit()
+        self.assertEqual(self.stats(), (1, 2, 2, 140.0))
+
+        self.cursor.execute("UPDATE students SET current_grades = 90.0 WHERE student_id = 99002")
+        self.cursor.execute("DELETE FROM courses WHERE course_code = 'TRG101'")
+        self.conn.commit()
+        self.assertEqual(self.stats(), (0, 2, 2, 170.0))
+
+    def test_first_row_of_a_new_department(self):
+        """A course in a department without a stats row should create the row (strict sql_mode included)."""
+        self.cursor.execute("SET SESSION sql_mode = CONCAT(@@sql_mode, ',STRICT_TRANS_TABLES')")
+        self.cursor.execute("DELETE FROM department_stats WHERE department = %s", (NEW_DEPARTMENT,))
+        self.cursor.execute(
+            "INSERT INTO courses (course_code, name, department) VALUES ('TRG201', 'Trigger Course', %s)", (NEW_DEPARTMENT,)
+        )
+        self.conn.commit()
+        self.cursor.execute(
+            "SELECT course_count, lecturer_count, staff_count, student_count, graded_students, grade_total, "
+            "research_project_count FROM department_stats WHERE department = %s", (NEW_DEPARTMENT,)
+        )
+        self.assertEqual(self.cursor.fetchone(), (1, 0, 0, 0, 0, 0.0, 0))
+
+    def test_rebuild_matches_incremental_counts(self):
+        """A full rebuild should produce the same counts the triggers maintained."""
+        query = """
+        SELECT department, course_count, lecturer_count, staff_count, student_count, graded_students,
+               research_project_count
+        FROM department_stats ORDER BY department
+        """
+        self.cursor.execute(query)
+        incremental = [row for row in self.cursor.fetchall() if any(row[1:])]  # Emptied departments keep a zero row
+        rebuild_department_stats(self.conn)
+        self.cursor.execute(query)
+        self.assertEqual(list(self.cursor.fetchall()), incremental)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+test_export.py
+
+This module tests the export writers on in-memory batches: CSV, JSON Lines and Parquet
+output, compression and partitioning. No database is needed.
+"""
+
+import unittest
+import csv
+import datetime
+import decimal
+import gzip
+import json
+import sys
+import os
+import tempfile
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from pymysql.constants import FIELD_TYPE
+
+import export
+
+# A cursor.description (name, type_code, ...) and rows as a server-side cursor returns them
+DESCRIPTION = (
+    ("course_code", FIELD_TYPE.VAR_STRING, None, None, None, None, False),
+    ("department", FIELD_TYPE.VAR_STRING, None, None, None, None, True),
+    ("credits", FIELD_TYPE.LONG, None, None, None, None, True),
+    ("fee", FIELD_TYPE.NEWDECIMAL, None, None, 10, 2, True),
+    ("starts", FIELD_TYPE.DATE, None, None, None, None, True),
+    ("description", FIELD_TYPE.BLOB, None, None, None, None, True),  # TEXT columns arrive as BLOB
+)
+ROWS = [
+    ("PHY101", "Physics", 10, decimal.Decimal("100.50"), datetime.date(2025, 9, 1), "Newtonian physics"),
+    ("PHY102", "Physics", None, None, None, None),
+    ("HIS101", "History/Arts", 20, decimal.Decimal("80.00"), datetime.date(2025, 9, 8), "Modern history"),
+]
+
+def batches(size=2):
+    """Yield the sample rows in batches like database.stream_batches()."""
+    for start in range(0, len(ROWS), size):
+        yield DESCRIPTION, ROWS[start:start + size]
+
+class TestExport(unittest.TestCase):
+    """Test cases for write_batches()."""
+
+    def setUp(self):
+        """Create a temporary output directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.dir = self.directory.name
+
+    def tearDown(self):
+        """Remove the output directory."""
+        self.directory.cleanup()
+
+    def test_csv(self):
+        """CSV output should have a header and every row."""
+        path = os.path.join(self.dir, "courses.csv")
+        result = export.write_batches(batches(), path, "csv")
+        self.assertEqual(result["rows"], 3)
+        with open(path, newline="", encoding="utf-8") as file:
+            lines = list(csv.reader(file))
+        self.assertEqual(lines[0], ["course_code", "department", "credits", "fee", "starts", "description"])
+        self.assertEqual(lines[1], ["PHY101", "Physics", "10", "100.50", "2025-09-01", "Newtonian physics"])
+        self.assertEqual(len(lines), 4)
+
+    def test_gzip_jsonl(self):
+        """JSONL output should round-trip through gzip with values converted to JSON types."""
+        path = os.path.join(self.dir, "courses.jsonl.gz")
+        export.write_batches(batches(1), path, "jsonl", compression="gzip")
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]["fee"], 100.5)
+        self.assertEqual(records[0]["starts"], "2025-09-01")
+        self.assertIsNone(records[1]["credits"])
+
+    def test_partitioning(self):
+        """Each partition value should get its own file; odd characters are escaped."""
+        result = export.write_batches(batches(), self.dir, "csv", partition_by="department")
+        self.assertEqual(sorted(result["files"].values()), [1, 2])
+        self.assertTrue(os.path.exists(os.path.join(self.dir, "department=Physics", "part-0.csv")))
+        self.assertTrue(os.path.exists(os.path.join(self.dir, "department=History%2FArts", "part-0.csv")))
+        with self.assertRaises(ValueError):
+            export.write_batches(batches(), self.dir, "csv", partition_by="faculty")
+
+    def test_invalid_options(self):
+        """Unknown formats and compressions should be rejected."""
+        with self.assertRaises(ValueError):
+            export.write_batches(batches(), self.dir, "xml")
+        with self.assertRaises(ValueError):
+            export.write_batches(batches(), self.dir, "csv", compression="bzip2")
+
+    def test_unknown_source(self):
+        """Only model tables and registered queries can be exported."""
+        self.assertTrue(export.export_sql("students")[0].startswith("SELECT `student_id`"))
+        self.assertEqual(export.export_sql("students_in_major", ["Physics"])[1], ("Physics",))
+        with self.assertRaises(ValueError):
+            export.export_sql("students; DROP TABLE students")
+
+    @unittest.skipIf(export.pyarrow is None, "pyarrow is not installed")
+    def test_parquet(self):
+        """Parquet output should keep column types and hold one row group per batch."""
+        path = os.path.join(self.dir, "courses.parquet")
+        export.write_batches(batches(), path, "parquet", compression="zstd")
+        parquet_file = export.pyarrow.parquet.ParquetFile(path)
+        self.assertEqual(parquet_file.metadata.num_rows, 3)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+        self.assertEqual(str(parquet_file.schema_arrow.field("credits").type), "int64")
+        self.assertEqual(str(parquet_file.schema_arrow.field("fee").type), "decimal128(10, 2)")
+        self.assertEqual(str(parquet_file.schema_arrow.field("description").type), "string")
+        self.assertEqual(parquet_file.read().column("description").to_pylist()[0], "Newtonian physics")
+
+    @unittest.skipIf(export.zstandard is None, "zstandard is not installed")
+    def test_zstd(self):
+        """zstd-compressed CSV should decompress to the same rows."""
+        path = os.path.join(self.dir, "courses.csv.zst")
+        export.write_batches(batches(), path, "csv", compression="zstd")
+        with export.zstandard.open(path, "rt", encoding="utf-8") as file:
+            self.assertEqual(len(file.read().splitlines()), 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+test_generator.py
+
+This module tests the synthetic data generator: deterministic output, foreign keys that
+always point at generated parents, and row counts that follow the scale factor. No
+database is needed.
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import generator
+from generator import ScalePlan, TABLE_COLUMNS, generate_chunk, iter_tasks
+
+def generate_all(scale, seed=42):
+    """Generate every table at `scale`, as {table: list of row dicts}."""
+    tables = {table: [] for table in TABLE_COLUMNS}
+    for table, chunk in iter_tasks(scale):
+        columns = TABLE_COLUMNS[table]
+        tables[table].extend(dict(zip(columns, row)) for row in generate_chunk(scale, seed, table, chunk))
+    return tables
+
+class TestDeterminism(unittest.TestCase):
+    """Test cases for reproducible output."""
+
+    def test_same_seed_and_scale_give_identical_rows(self):
+        """Generating twice with the same seed and scale should produce the same data."""
+        self.assertEqual(generate_all(0.5, seed=7), generate_all(0.5, seed=7))
+
+    def test_different_seeds_differ(self):
+        """A different seed should change the random parts of the data."""
+        self.assertNotEqual(generate_all(0.5, seed=7)["students"], generate_all(0.5, seed=8)["students"])
+
+    def test_chunks_do_not_depend_on_each_other(self):
+        """A chunk should come out the same whether or not other chunks were generated first."""
+        original = generator.CHUNK_SIZE
+        generator.CHUNK_SIZE = 100
+        try:
+            expected = generate_chunk(1, 42, "enrollments", 3)
+            generate_chunk(1, 42, "enrollments", 0)
+            self.assertEqual(generate_chunk(1, 42, "enrollments", 3), expected)
+            self.assertEqual(len(list(iter_tasks(1, ["students"]))), 10)
+        finally:
+            generator.CHUNK_SIZE = original
+
+class TestForeignKeys(unittest.TestCase):
+    """Every reference in a generated dataset should point at a generated parent."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = generate_all(1.5)
+
+    def keys(self, table, column):
+        return {row[column] for row in self.data[table]}
+
+    def assertReferences(self, table, column, parent, parent_column):
+        values = {row[column] for row in self.data[table] if row[column] is not None}
+        self.assertTrue(values, f"{table}.{column} is empty")
+        self.assertLessEqual(values, self.keys(parent, parent_column), f"{table}.{column} -> {parent}.{parent_column}")
+
+    def test_primary_keys_are_unique(self):
+        """Key columns should not repeat within a table."""
+        for table, key in (("students", ("student_id",)), ("lecturers", ("lecturer_id",)), ("courses", ("course_code",)),
+                           ("non_academic_staff", ("staff_id",)), ("research_projects", ("project_title",)),
+                           ("enrollments", ("student_id", "course_id")), ("lecturer_courses", ("lecturer_id", "course_id")),
+                           ("project_members", ("project_title", "member_type", "member_id"))):
+            with self.subTest(table=table):
+                keys = [tuple(row[column] for column in key) for row in self.data[table]]
+                self.assertEqual(len(keys), len(set(keys)))
+
+    def test_foreign_keys(self):
+        """Declared foreign keys should only reference generated rows."""
+        self.assertReferences("students", "advisor_id", "lecturers", "lecturer_id")
+        self.assertReferences("enrollments", "student_id", "students", "student_id")
+        self.assertReferences("enrollments", "course_id", "courses", "course_code")
+        self.assertReferences("lecturer_courses", "lecturer_id", "lecturers", "lecturer_id")
+        self.assertReferences("lecturer_courses", "course_id", "courses", "course_code")
+        self.assertReferences("research_projects", "principal_investigator", "lecturers", "lecturer_id")
+        self.assertReferences("project_members", "project_title", "research_projects", "project_title")
+
+    def test_project_members(self):
+        """Team members should be generated lecturers and students, led by the project's PI."""
+        lecturers = self.keys("lecturers", "lecturer_id")
+        students = self.keys("students", "student_id")
+        investigators = {row["project_title"]: row["principal_investigator"] for row in self.data["research_projects"]}
+        for row in self.data["project_members"]:
+            self.assertIn(row["member_id"], lecturers if row["member_type"] == "lecturer" else students)
+            if row["position"] == 1:
+                self.assertEqual((row["member_type"], row["member_id"]), ("lecturer", investigators[row["project_title"]]))
+
+    def test_department_names(self):
+        """Departments, and programs named after them, should exist for every row that names one."""
+        departments = self.keys("departments", "department_name")
+        for table in ("lecturers", "courses", "non_academic_staff"):
+            with self.subTest(table=table):
+                self.assertLessEqual(self.keys(table, "department"), departments)
+        self.assertLessEqual(self.keys("students", "program"), departments & self.keys("programs", "name"))
+
+    def test_relationships_stay_within_a_department(self):
+        """Advisors and enrolled courses should belong to the student's department."""
+        lecturer_departments = {row["lecturer_id"]: row["department"] for row in self.data["lecturers"]}
+        course_departments = {row["course_code"]: row["department"] for row in self.data["courses"]}
+        programs = {row["student_id"]: row["program"] for row in self.data["students"]}
+        for row in self.data["students"]:
+            self.assertEqual(lecturer_departments[row["advisor_id"]], row["program"])
+        for row in self.data["enrollments"]:
+            self.assertEqual(course_departments[row["course_id"]], programs[row["student_id"]])
+
+class TestScale(unittest.TestCase):
+    """Row counts should follow ScalePlan."""
+
+    def test_row_counts_match_the_plan(self):
+        """Generated tables should have the sizes ScalePlan.counts() documents."""
+        for scale in (0.5, 2):
+            with self.subTest(scale=scale):
+                counts = ScalePlan(scale).counts()
+                data = generate_all(scale)
+                for table, rows in data.items():
+                    if table == "project_members":
+                        # Each team has the PI plus one to four students
+                        projects = counts["research_projects"]
+                        self.assertTrue(2 * projects <= len(rows) <= 5 * projects)
+                    else:
+                        self.assertEqual(len(rows), counts[table], table)
+
+    def test_students_scale_linearly(self):
+        """Scale 1 means 1,000 students; other tables grow with it above their floors."""
+        self.assertEqual(ScalePlan(1).students, 1000)
+        self.assertEqual(ScalePlan(100).students, 100000)
+        self.assertEqual(ScalePlan(100).lecturers, 100000 // 20)
+        self.assertEqual(ScalePlan(0.001).students, 10)
+        self.assertEqual(ScalePlan(0.001).departments, len(generator.BASE_DEPARTMENTS))
+        with self.assertRaises(ValueError):
+            ScalePlan(0)
+
+class RecordingCursor:
+    """A cursor that records every statement on its connection."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append(sql)
+
+class RecordingConnection:
+    """Stands in for a caller-supplied pymysql connection."""
+
+    def __init__(self):
+        self.statements = []
+
+    def cursor(self):
+        return RecordingCursor(self)
+
+    def commit(self):
+        self.statements.append("COMMIT")
+
+    def rollback(self):
+        self.statements.append("ROLLBACK")
+
+def failing_load(*args, **kwargs):
+    """Plays the part of a loader call that loses the connection."""
+    raise ConnectionError("lost connection")
+
+class TestBulkLoadFailure(unittest.TestCase):
+    """Test cases for restoring session checks when a bulk load fails."""
+
+    def assert_checks_restored(self, conn):
+        """The last statements should turn unique and foreign key checks back on."""
+        self.assertIn("SET FOREIGN_KEY_CHECKS = 0", conn.statements)
+        self.assertEqual(conn.statements[-2:], ["SET UNIQUE_CHECKS = 1", "SET FOREIGN_KEY_CHECKS = 1"])
+
+    def test_generate_to_database(self):
+        """A failed insert should not leave the checks off on the caller's connection."""
+        conn = RecordingConnection()
+        with mock.patch.object(generator.loader, "insert_rows", failing_load):
+            with self.assertRaises(ConnectionError):
+                generator.generate_to_database(0.001, workers=1, truncate=False, conn=conn, progress=False)
+        self.assert_checks_restored(conn)
+
+    def test_load_generated_files(self):
+        """A failed file load should restore the checks, with or without atomic."""
+        files = [("departments", "departments.tsv", 1)]
+        for atomic in (False, True):
+            conn = RecordingConnection()
+            with mock.patch.object(generator.loader, "load_delimited_file", failing_load):
+                with self.assertRaises(ConnectionError):
+                    generator.load_generated_files(files, truncate=False, conn=conn, progress=False, atomic=atomic)
+            self.assert_checks_restored(conn)
+            self.assertEqual("ROLLBACK" in conn.statements, atomic)
+
+if __name__ == "__main__":
+    unittest.main()
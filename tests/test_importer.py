@@ -0,0 +1,174 @@
+"""
+test_importer.py
+
+This module tests the CSV importer: rules derived from the models, chunk validation,
+the rejected-rows report and resuming from a checkpoint. A fake connection records the
+upserts, so no database is needed.
+"""
+
+import unittest
+import csv
+import os
+import sys
+import tempfile
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import importer
+
+LECTURERS = {1, 2}
+COURSES = {"CS101", "MA201"}
+
+class FakeCursor:
+    """A cursor that answers foreign-key lookups and records upserts on its connection."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        existing = LECTURERS if "lecturer_id" in sql else COURSES
+        self._rows = [(key,) for key in params if key in existing]
+
+    def fetchall(self):
+        return self._rows
+
+    def executemany(self, sql, rows):
+        if self.conn.fail_after is not None and len(self.conn.inserted) >= self.conn.fail_after:
+            raise ConnectionError("lost connection")
+        self.conn.statements.append(sql)
+        self.conn.pending.extend(rows)
+
+class FakeConnection:
+    """Stands in for a pymysql connection; upserts count as inserted once committed."""
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.statements = []
+        self.pending = []
+        self.inserted = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.inserted.extend(self.pending)
+        self.pending = []
+
+    def close(self):
+        pass
+
+def lookup(table, column, keys):
+    """Foreign-key lookup against the sample lecturers and courses."""
+    return set(keys) & (LECTURERS if table == "lecturers" else COURSES)
+
+class TestValidation(unittest.TestCase):
+    """Test cases for the column rules and chunk validation."""
+
+    def test_rules_come_from_the_models(self):
+        """Types, required flags, lengths and references should be read from models.py."""
+        rules = importer.column_rules("students")
+        self.assertEqual(rules["student_id"].kind, "int")
+        self.assertTrue(rules["student_id"].required)
+        self.assertTrue(rules["name"].required)
+        self.assertEqual(rules["name"].max_length, 100)
+        self.assertEqual(rules["current_grades"].kind, "float")
+        self.assertEqual(rules["advisor_id"].references, ("lecturers", "lecturer_id"))
+        self.assertFalse(rules["program"].required)
+
+    def test_validate_chunk_converts_and_rejects(self):
+        """Valid values should be converted; every failing rule of a bad row should be reported."""
+        header = ["student_id", "name", "current_grades", "advisor_id"]
+        records = [
+            ["1", "Ada", "91.5", "1"],
+            ["2", "", "80", "2"],
+            ["x", "Bob", "seventy", "1"],
+            ["4", "Cy", "", ""],
+            ["5", "Di", "60", "9"],
+            ["6.5", "E" * 101, "70", "1"],
+        ]
+        rows, rejected = importer.validate_chunk(importer.column_rules("students"), header, records, lookup)
+        self.assertEqual(rows, [(1, "Ada", 91.5, 1), (4, "Cy", None, None)])
+        self.assertIsInstance(rows[0][0], int)
+        reasons = dict(rejected)
+        self.assertEqual(sorted(reasons), [1, 2, 4, 5])
+        self.assertEqual(reasons[1], ["name is required"])
+        self.assertEqual(reasons[2], ["student_id must be an integer", "current_grades must be a number"])
+        self.assertEqual(reasons[4], ["advisor_id does not match any lecturers.lecturer_id"])
+        self.assertEqual(reasons[5], ["student_id must be an integer", "name is longer than 100 characters"])
+
+    def test_string_foreign_keys(self):
+        """Foreign keys to string columns such as course_code should be checked."""
+        rows, rejected = importer.validate_chunk(
+            importer.column_rules("enrollments"), ["student_id", "course_id"],
+            [["1", "CS101"], ["1", "XX999"]], lambda table, column, keys: set(keys) & ({1} if table == "students" else COURSES)
+        )
+        self.assertEqual(rows, [(1, "CS101")])
+        self.assertEqual(rejected, [(1, ["course_id does not match any courses.course_code"])])
+
+class TestImport(unittest.TestCase):
+    """Test cases for import_csv() with a fake connection."""
+
+    def setUp(self):
+        """Write a ten-row students CSV with one unknown advisor."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "students.csv")
+        with open(self.path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["student_id", "name", "advisor_id"])
+            for i in range(1, 11):
+                writer.writerow([i, f"Student {i}", 9 if i == 7 else 1])
+
+    def tearDown(self):
+        """Remove the CSV, its checkpoint and its report."""
+        self.directory.cleanup()
+
+    def test_import_upserts_and_reports_rejects(self):
+        """Valid rows should be upserted and rejected rows written to the report."""
+        conn = FakeConnection()
+        result = importer.import_csv(self.path, "students", conn=conn, chunk_rows=4, progress=False)
+        self.assertEqual((result.imported, result.rejected, result.resumed_from), (9, 1, 0))
+        self.assertEqual(len(conn.inserted), 9)
+        self.assertIn("ON DUPLICATE KEY UPDATE `name` = VALUES(`name`), `advisor_id` = VALUES(`advisor_id`)", conn.statements[0])
+        with open(result.report, newline="") as file:
+            report = list(csv.reader(file))
+        self.assertEqual(report[0], ["line", "errors", "student_id", "name", "advisor_id"])
+        self.assertEqual(report[1][:3], ["8", "advisor_id does not match any lecturers.lecturer_id", "7"])
+        self.assertFalse(os.path.exists(importer.checkpoint_path(self.path)))
+
+    def test_resume_after_failure(self):
+        """A failed import should resume after the last committed chunk."""
+        with self.assertRaises(ConnectionError):
+            importer.import_csv(self.path, "students", conn=FakeConnection(fail_after=4), chunk_rows=4, progress=False)
+        checkpoint = importer.read_checkpoint(self.path, "students")
+        self.assertEqual(checkpoint["rows_done"], 4)
+
+        conn = FakeConnection()
+        result = importer.import_csv(self.path, "students", conn=conn, chunk_rows=4, progress=False)
+        self.assertEqual(result.resumed_from, 4)
+        self.assertEqual([row[0] for row in conn.inserted], [5, 6, 8, 9, 10])
+        self.assertEqual((result.imported, result.rejected), (9, 1))
+
+    def test_header_errors(self):
+        """Unknown or missing required columns and unknown tables should be rejected."""
+        with open(self.path, "w") as file:
+            file.write("student_id,nickname\n1,Al\n")
+        with self.assertRaisesRegex(ValueError, "Unknown column"):
+            importer.import_csv(self.path, "students", conn=FakeConnection(), progress=False)
+        with open(self.path, "w") as file:
+            file.write("student_id,program\n1,CS\n")
+        with self.assertRaisesRegex(ValueError, "Missing required column"):
+            importer.import_csv(self.path, "students", conn=FakeConnection(), progress=False)
+        with self.assertRaises(ValueError):
+            importer.import_csv(self.path, "alumni", conn=FakeConnection(), progress=False)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+test_indexes.py
+
+This module checks that every registered query (see query_registry.py) is served by an
+index, by running EXPLAIN on the exact SQL the application executes and rejecting full
+table scans.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import query_registry
+from database import get_db_connection
+
+query_registry.load_all_queries()
+
+
+class TestQueryIndexes(unittest.TestCase):
+    """Fail if any application query falls back to a full table scan."""
+
+    def setUp(self):
+        """Open a connection for running EXPLAIN."""
+        self.conn = get_db_connection()
+        self.cursor = self.conn.cursor()
+
+    def tearDown(self):
+        """Return the connection to the pool."""
+        self.cursor.close()
+        self.conn.close()
+
+    def test_queries_avoid_full_table_scans(self):
+        """Every base table access should use an index (type other than ALL)."""
+        for name, query in sorted(query_registry.QUERIES.items()):
+            with self.subTest(query=name):
+                for row in query_registry.explain(self.cursor, query):
+                    step = query_registry.summarize_plan([row])[0]
+                    self.assertFalse(
+                        query_registry.is_full_scan(step, query),
+                        f"{name} does a full scan of '{row['table']}' (possible keys: {row['possible_keys']})"
+                    )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+test_instrumentation.py
+
+This module tests query instrumentation: statistics, histograms, caller and action
+attribution, connection wait accounting and the slow-query log. No database is needed.
+"""
+
+import unittest
+import json
+import sys
+import os
+import tempfile
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import instrumentation
+import query_registry
+from config import INSTRUMENTATION_CONFIG
+
+class FakeCursor:
+    """A cursor whose execute() 'returns' a fixed number of rows."""
+
+    connection = None
+
+    def __init__(self, rows):
+        self.rowcount = rows
+
+    def execute(self, sql, params=None):
+        return self.rowcount
+
+def get_lecturers(cursor):
+    """Plays the part of a function in queries.py."""
+    return query_registry.run_query(cursor, "test_lecturers")
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for recording and reporting query statistics."""
+
+    def setUp(self):
+        """Start from empty statistics and a temporary slow-query log."""
+        self.config = dict(INSTRUMENTATION_CONFIG)
+        self.directory = tempfile.TemporaryDirectory()
+        INSTRUMENTATION_CONFIG["slow_query_log"] = os.path.join(self.directory.name, "slow.jsonl")
+        INSTRUMENTATION_CONFIG["slow_query_ms"] = 100
+        INSTRUMENTATION_CONFIG["enabled"] = True
+        instrumentation.reset_query_stats()
+        instrumentation.note_connection_wait(0.0)
+
+    def tearDown(self):
+        """Restore the configuration."""
+        INSTRUMENTATION_CONFIG.clear()
+        INSTRUMENTATION_CONFIG.update(self.config)
+        instrumentation.reset_query_stats()
+        query_registry.QUERIES.pop("test_lecturers", None)
+        self.directory.cleanup()
+
+    def test_statistics_and_histogram(self):
+        """Calls, rows, errors and percentiles should be aggregated per query."""
+        for elapsed in (0.0005, 0.003, 0.003, 0.04):
+            instrumentation.record("students_in_major", elapsed, 10, "get_students_in_major")
+        instrumentation.record("students_in_major", 0.001, 0, "get_students_in_major", error=True)
+        stats = instrumentation.get_query_stats()["students_in_major"]
+        self.assertEqual((stats["calls"], stats["rows"], stats["errors"]), (5, 40, 1))
+        self.assertEqual(stats["p50_ms"], 5.0)
+        self.assertEqual(stats["p99_ms"], 50.0)
+        self.assertAlmostEqual(stats["max_ms"], 40.0)
+        self.assertEqual(stats["histogram"]["<=5ms"], 2)
+        self.assertEqual(stats["callers"], {"get_students_in_major": 5})
+        self.assertIn("students_in_major", instrumentation.format_query_stats())
+
+    def test_connection_wait_is_charged_once(self):
+        """A checkout's wait time belongs to the first query that follows it."""
+        instrumentation.note_connection_wait(0.02)
+        instrumentation.record("q", 0.001, 1)
+        instrumentation.record("q", 0.001, 1)
+        self.assertAlmostEqual(instrumentation.get_query_stats()["q"]["avg_wait_ms"], 10.0)
+
+    def test_slow_query_log(self):
+        """Queries over the threshold should be logged with their caller and action, without parameters."""
+        with instrumentation.action("CLI: option 5"):
+            instrumentation.record("all_departments", 0.25, 7, "get_all_departments")
+        instrumentation.record("all_departments", 0.01, 7, "get_all_departments")
+        with open(instrumentation.slow_log_path(), encoding="utf-8") as file:
+            entries = [json.loads(line) for line in file]
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["query"], "all_departments")
+        self.assertEqual(entries[0]["action"], "CLI: option 5")
+        self.assertEqual(entries[0]["caller"], "get_all_departments")
+        self.assertEqual(entries[0]["rows"], 7)
+
+    def test_run_query_is_instrumented(self):
+        """Registered queries should be recorded with rows and the calling function."""
+        query_registry.register("test_lecturers", "SELECT name FROM lecturers;")
+        with instrumentation.action("GUI: lecturers"):
+            get_lecturers(FakeCursor(3))
+        stats = instrumentation.get_query_stats()["test_lecturers"]
+        self.assertEqual((stats["calls"], stats["rows"]), (1, 3))
+        self.assertEqual(stats["callers"], {"get_lecturers": 1})
+        self.assertEqual(stats["actions"], {"GUI: lecturers": 1})
+
+    def test_set_action(self):
+        """set_action() labels later queries on the thread until it is changed or cleared."""
+        query_registry.register("test_lecturers", "SELECT name FROM lecturers;")
+        try:
+            instrumentation.set_action("CLI: option 6")
+            get_lecturers(FakeCursor(1))
+            instrumentation.set_action(None)
+            get_lecturers(FakeCursor(1))
+        finally:
+            instrumentation.set_action(None)
+        self.assertEqual(instrumentation.get_query_stats()["test_lecturers"]["actions"], {"CLI: option 6": 1})
+
+    def test_disabled(self):
+        """With instrumentation off nothing is recorded."""
+        INSTRUMENTATION_CONFIG["enabled"] = False
+        query_registry.register("test_lecturers", "SELECT name FROM lecturers;")
+        get_lecturers(FakeCursor(3))
+        self.assertEqual(instrumentation.get_query_stats(), {})
+
+if __name__ == "__main__":
+    unittest.main()
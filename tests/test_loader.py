@@ -0,0 +1,97 @@
+"""
+test_loader.py
+
+This module tests the streaming SQL tokenizer and the batching helpers in loader.py.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from loader import iter_sql_statements, coalesce_inserts, format_tsv_row
+
+SEED_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "populate_data.sql")
+
+def split(text):
+    """Tokenize a SQL string line by line, as a file would be read."""
+    return list(iter_sql_statements(text.splitlines(keepends=True)))
+
+class TestSQLTokenizer(unittest.TestCase):
+    """Test cases for splitting SQL text into statements."""
+
+    def test_semicolons_inside_strings(self):
+        """Semicolons in string literals should not end a statement."""
+        statements = split("INSERT INTO t VALUES ('a;b', \"c;d\");\nSELECT 1;")
+        self.assertEqual(statements, ["INSERT INTO t VALUES ('a;b', \"c;d\")", "SELECT 1"])
+
+    def test_escaped_quotes(self):
+        """Backslash-escaped and doubled quotes should stay inside the string."""
+        statements = split("SELECT 'it\\'s; fine', 'O''Brien; too';SELECT 2;")
+        self.assertEqual(statements, ["SELECT 'it\\'s; fine', 'O''Brien; too'", "SELECT 2"])
+
+    def test_comments_are_dropped(self):
+        """Line and block comments, including ones containing semicolons, should be removed."""
+        statements = split("-- first; comment\nSELECT 1; # trailing; note\n/* block;\n comment */ SELECT 2;")
+        self.assertEqual(statements, ["SELECT 1", "SELECT 2"])
+
+    def test_strings_spanning_lines(self):
+        """A string containing a newline and a semicolon should be kept whole."""
+        statements = split("INSERT INTO t VALUES ('line one;\nline two');")
+        self.assertEqual(statements, ["INSERT INTO t VALUES ('line one;\nline two')"])
+
+    def test_dashes_without_space_are_not_comments(self):
+        """MySQL only treats '-- ' followed by whitespace as a comment."""
+        self.assertEqual(split("SELECT 5--3;"), ["SELECT 5--3"])
+
+    def test_unterminated_final_statement(self):
+        """A last statement without a semicolon should still be returned."""
+        self.assertEqual(split("SELECT 1;\nSELECT 2"), ["SELECT 1", "SELECT 2"])
+
+    def test_seed_file(self):
+        """The bundled seed file should split into complete statements."""
+        with open(SEED_FILE, encoding="utf-8") as file:
+            statements = list(iter_sql_statements(file))
+        self.assertEqual(statements[0], "USE university_db")
+        self.assertTrue(all(not s.startswith("--") for s in statements))
+        self.assertIn("SET FOREIGN_KEY_CHECKS = 1", statements)
+
+class TestCoalesceInserts(unittest.TestCase):
+    """Test cases for merging single-row INSERTs."""
+
+    def test_merges_same_table(self):
+        """Consecutive inserts into the same table should become one multi-row insert."""
+        merged = list(coalesce_inserts([
+            "INSERT INTO t (a) VALUES (1)",
+            "INSERT INTO t (a) VALUES (2)",
+            "INSERT INTO u (a) VALUES (3)",
+        ]))
+        self.assertEqual(merged, [("INSERT INTO t (a) VALUES (1), (2)", 2), ("INSERT INTO u (a) VALUES (3)", 1)])
+
+    def test_respects_row_limit_and_other_statements(self):
+        """Batches should be capped and non-insert statements should pass through in order."""
+        merged = list(coalesce_inserts([
+            "INSERT INTO t VALUES (1)",
+            "INSERT INTO t VALUES (2)",
+            "INSERT INTO t VALUES (3)",
+            "DELETE FROM t",
+            "INSERT INTO t VALUES (4) ON DUPLICATE KEY UPDATE a = 4",
+        ], max_rows=2))
+        self.assertEqual([sql for sql, _ in merged], [
+            "INSERT INTO t VALUES (1), (2)",
+            "INSERT INTO t VALUES (3)",
+            "DELETE FROM t",
+            "INSERT INTO t VALUES (4) ON DUPLICATE KEY UPDATE a = 4",
+        ])
+
+class TestTSVFormat(unittest.TestCase):
+    """Test cases for the LOAD DATA text format."""
+
+    def test_nulls_and_escapes(self):
+        """NULL should become \\N and special characters should be escaped."""
+        self.assertEqual(format_tsv_row((1, None, "a\tb\nc\\d")), "1\t\\N\ta\\tb\\nc\\\\d\n")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+"""
+test_migrations.py
+
+This module tests the parsing used to migrate research_projects.team_members into project_members.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from migrations import parse_team_members
+
+class TestParseTeamMembers(unittest.TestCase):
+    """Test cases for splitting team_members text into members."""
+
+    def test_lecturer_and_two_students(self):
+        """The seed data format should yield the lecturer followed by both students."""
+        self.assertEqual(
+            parse_team_members("Alice Johnson, Student 12, Student 34"),
+            [("lecturer", "Alice Johnson"), ("student", 12), ("student", 34)]
+        )
+
+    def test_any_team_size(self):
+        """Teams larger than two students should be parsed in full."""
+        members = parse_team_members("Bob Smith, Student 1, Student 2, Student 3, Student 4")
+        self.assertEqual([value for kind, value in members if kind == "student"], [1, 2, 3, 4])
+
+    def test_empty_and_irregular_input(self):
+        """Missing text, stray commas and extra spaces should be tolerated."""
+        self.assertEqual(parse_team_members(None), [])
+        self.assertEqual(parse_team_members(" Student  7 ,, "), [("student", 7)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+test_orm_queries.py
+
+This module tests the eager-loading ORM read layer: a department's whole object graph must
+load in a fixed number of SQL statements, and walking it must not issue any more.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from sqlalchemy import event
+
+from bootstrap import get_engine
+from database import get_db_connection
+from orm_queries import load_department, load_students, load_research_projects
+
+TEST_DEPARTMENT = "ORM Test Department"
+LECTURER_IDS = (98001, 98002)
+STUDENT_IDS = (98101, 98102, 98103, 98104)
+PROJECT = "ORM Test Project"
+
+class StatementCounter:
+    """Counts the SQL statements an engine sends while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+class TestOrmQueries(unittest.TestCase):
+    """Test cases for statement counts of the ORM read functions."""
+
+    def setUp(self):
+        """Insert a small department graph."""
+        self.conn = get_db_connection()
+        self.cursor = self.conn.cursor()
+        self.cleanup()
+        self.cursor.execute("INSERT INTO departments (department_name, faculty) VALUES (%s, 'Test Faculty')", (TEST_DEPARTMENT,))
+        self.cursor.executemany(
+            "INSERT INTO lecturers (lecturer_id, name, department) VALUES (%s, %s, %s)",
+            [(lecturer_id, f"ORM Lecturer {lecturer_id}", TEST_DEPARTMENT) for lecturer_id in LECTURER_IDS]
+        )
+        self.cursor.executemany(
+            "INSERT INTO students (student_id, name, program, advisor_id) VALUES (%s, %s, %s, %s)",
+            [(student_id, f"ORM Student {student_id}", TEST_DEPARTMENT, LECTURER_IDS[i % 2])
+             for i, student_id in enumerate(STUDENT_IDS)]
+        )
+        self.add_courses(3)
+        self.cursor.execute(
+            "INSERT INTO research_projects (project_title, principal_investigator) VALUES (%s, %s)", (PROJECT, LECTURER_IDS[0])
+        )
+        self.cursor.executemany(
+            "INSERT INTO project_members (project_title, member_type, member_id, position) VALUES (%s, 'student', %s, %s)",
+            [(PROJECT, student_id, position) for position, student_id in enumerate(STUDENT_IDS[:2])]
+        )
+        self.conn.commit()
+        self.engine = get_engine()
+        with self.engine.connect():
+            pass  # Open the engine's first connection outside the counted block
+
+    def tearDown(self):
+        """Remove the test rows and close the connection."""
+        self.cleanup()
+        self.cursor.close()
+        self.conn.close()
+
+    def cleanup(self):
+        self.cursor.execute("DELETE FROM project_members WHERE project_title = %s", (PROJECT,))
+        self.cursor.execute("DELETE FROM research_projects WHERE project_title = %s", (PROJECT,))
+        self.cursor.execute("DELETE FROM enrollments WHERE course_id LIKE 'ORM%%'")
+        self.cursor.execute("DELETE FROM lecturer_courses WHERE course_id LIKE 'ORM%%'")
+        self.cursor.execute("DELETE FROM courses WHERE course_code LIKE 'ORM%%'")
+        self.cursor.execute("DELETE FROM students WHERE student_id BETWEEN 98100 AND 98199")
+        self.cursor.execute("DELETE FROM lecturers WHERE lecturer_id BETWEEN 98000 AND 98099")
+        self.cursor.execute("DELETE FROM departments WHERE department_name = %s", (TEST_DEPARTMENT,))
+        self.cursor.execute("DELETE FROM department_stats WHERE department = %s", (TEST_DEPARTMENT,))
+        self.conn.commit()
+
+    def add_courses(self, count, start=0):
+        for number in range(start, start + count):
+            code = f"ORM{number:03d}"
+            self.cursor.execute(
+                "INSERT INTO courses (course_code, name, department, credits) VALUES (%s, %s, %s, 10)",
+                (code, f"ORM Course {number}", TEST_DEPARTMENT)
+            )
+            self.cursor.execute("INSERT INTO lecturer_courses VALUES (%s, %s)", (LECTURER_IDS[number % 2], code))
+            self.cursor.executemany("INSERT INTO enrollments VALUES (%s, %s)", [(student_id, code) for student_id in STUDENT_IDS])
+
+    def walk(self, graph):
+        """Touch every relationship the department graph promises to load."""
+        touched = 0
+        for course in graph.courses:
+            touched += len(course.lecturers) + len(course.students_enrolled)
+        for lecturer in graph.lecturers:
+            touched += len(lecturer.courses_taught) + len(lecturer.students_advised)
+        for project in graph.research_projects:
+            touched += len(project.members) + (project.investigator is not None)
+        return touched
+
+    def test_department_graph_statement_count(self):
+        """The whole graph loads in 10 statements and walking it issues none."""
+        with StatementCounter(self.engine) as counter:
+            graph = load_department(TEST_DEPARTMENT)
+            loaded = counter.count
+            touched = self.walk(graph)
+        self.assertEqual(loaded, 10)
+        self.assertEqual(counter.count, loaded, "walking the graph lazy-loaded relationships")
+        self.assertEqual(len(graph.courses), 3)
+        self.assertEqual(touched, 3 * (1 + 4) + 3 + 4 + 2 + 1)
+
+    def test_statement_count_does_not_grow_with_the_department(self):
+        """More courses and enrollments should not mean more statements."""
+        self.add_courses(20, start=3)
+        self.conn.commit()
+        with StatementCounter(self.engine) as counter:
+            graph = load_department(TEST_DEPARTMENT)
+            self.walk(graph)
+        self.assertEqual(len(graph.courses), 23)
+        self.assertEqual(counter.count, 10)
+
+    def test_students_and_projects(self):
+        """Students load with advisors and courses in 2 statements, projects with members in 2."""
+        with StatementCounter(self.engine) as counter:
+            students = load_students(STUDENT_IDS)
+            self.assertEqual([student.student_id for student in students], list(STUDENT_IDS))
+            self.assertEqual(sum(len(student.courses) for student in students), 12)
+            self.assertEqual(students[0].advisor.lecturer_id, LECTURER_IDS[0])
+        self.assertEqual(counter.count, 2)
+
+        with StatementCounter(self.engine) as counter:
+            projects = load_research_projects(LECTURER_IDS)
+            self.assertEqual([member.member_id for member in projects[0].members], list(STUDENT_IDS[:2]))
+        self.assertEqual(counter.count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
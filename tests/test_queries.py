@@ -18,9 +18,19 @@ from queries import (
     get_courses_by_department,
     get_research_projects_by_department,
     get_bachelors_degrees,
-    get_masters_degrees
+    get_masters_degrees,
+    get_top_students_page,
+    get_students_in_major_page,
+    get_students_in_course_page,
+    decode_page_token,
+    iter_top_students,
+    get_department_overview,
+    get_department_overviews,
+    get_transcript,
+    get_transcripts,
+    get_program_transcripts
 )
-from database import get_db_connection
+from database import get_db_connection, get_pool_stats
 
 class TestDatabaseQueries(unittest.TestCase):
     """Unit tests for database query functions in queries.py."""
@@ -68,7 +78,7 @@ class TestDatabaseQueries(unittest.TestCase):
     def test_get_all_departments(self):
         """Test retrieving all university departments."""
         result = get_all_departments()
-        self.assertIsInstance(result, (list, tuple))
+        self.assertIsInstance(result, tuple)  # Cached and shared, so it must not be mutable
 
     def test_get_courses_by_department(self):
         """Test retrieving courses offered by a specific department."""
@@ -131,5 +141,125 @@ class TestDatabaseQueries(unittest.TestCase):
         result = get_students_in_course("Non-Existent Course")
         self.assertIn(result, ([], ()))  # Accepts both empty list and empty tuple
 
+    # Pagination Tests
+    def test_top_students_pages_cover_all_rows(self):
+        """Walking every page should return each top student exactly once, best first."""
+        rows = []
+        page = get_top_students_page(page_size=7)
+        total = page.total
+        rows.extend(page.rows)
+        while page.next_token:
+            page = get_top_students_page(page.next_token, page_size=7, include_total=False)
+            self.assertIsNone(page.total)
+            rows.extend(page.rows)
+        self.assertEqual(len(rows), total)
+        self.assertEqual(sorted(rows), sorted(get_top_students()))
+        grades = [grade for _, grade in rows]
+        self.assertEqual(grades, sorted(grades, reverse=True))
+
+    def test_students_in_major_page_size(self):
+        """A page should hold at most page_size rows and report whether more exist."""
+        page = get_students_in_major_page("Computer Science", page_size=3)
+        self.assertLessEqual(len(page.rows), 3)
+        self.assertEqual(page.next_token is not None, page.total > 3)
+
+    def test_course_pages_keep_enrollments_in_same_named_courses(self):
+        """A student in two courses sharing a name should appear on a page once per enrollment."""
+        self.cursor.execute("SELECT student_id FROM students ORDER BY student_id LIMIT 2")
+        first, second = [row[0] for row in self.cursor.fetchall()]
+        self.cursor.executemany(
+            "INSERT INTO courses (course_code, name, department) VALUES (%s, 'Paging Twin Course', 'Mathematics')",
+            [("PGT101",), ("PGT102",)]
+        )
+        self.cursor.executemany(
+            "INSERT INTO enrollments (student_id, course_id) VALUES (%s, %s)",
+            [(first, "PGT101"), (first, "PGT102"), (second, "PGT101")]
+        )
+        self.conn.commit()
+        try:
+            page = get_students_in_course_page("Paging Twin Course", page_size=1)
+            total, rows = page.total, list(page.rows)
+            while page.next_token:
+                page = get_students_in_course_page("Paging Twin Course", page.next_token, page_size=1, include_total=False)
+                rows.extend(page.rows)
+            self.assertEqual((total, len(rows)), (3, 3))
+            self.assertIsInstance(page.rows, tuple)
+        finally:
+            self.cursor.execute("DELETE FROM enrollments WHERE course_id IN ('PGT101', 'PGT102')")
+            self.cursor.execute("DELETE FROM courses WHERE course_code IN ('PGT101', 'PGT102')")
+            self.conn.commit()
+
+    def test_invalid_page_token(self):
+        """A malformed continuation token should be rejected."""
+        with self.assertRaises(ValueError):
+            decode_page_token("not-a-token", 2)
+
+    # Department Overview Tests
+    def test_department_overview_matches_individual_queries(self):
+        """The one-query overview should contain the same rows as the separate queries."""
+        department = "Computer Science"
+        overview = get_department_overview(department)
+        self.assertEqual(sorted(overview["courses"]), sorted(get_courses_by_department(department)))
+        self.assertEqual(sorted(overview["professors"]), sorted(get_professors_in_department(department)))
+        self.assertEqual(sorted(overview["staff"]), sorted(get_staff_in_department(department)))
+        self.assertEqual(len(overview["lecturer_courses"]), len(get_courses_taught_by_lecturers(department)))
+        self.assertEqual(len(overview["research_projects"]), len(get_research_projects_by_department(department)))
+
+    def test_department_overviews_cover_all_departments(self):
+        """The batch form should return one overview per department."""
+        overviews = get_department_overviews()
+        self.assertEqual(set(overviews), set(get_all_departments()))
+        self.assertEqual(get_department_overviews(["Unknown Department"])["Unknown Department"]["courses"], ())
+        with self.assertRaises(TypeError):
+            overviews["Unknown Department"] = {}  # Cached and shared, so read-only
+
+    # Transcript Tests
+    def test_transcript_matches_enrollments(self):
+        """A transcript should list the student's enrolled courses and add up their credits."""
+        self.cursor.execute("SELECT student_id FROM enrollments ORDER BY student_id LIMIT 1")
+        (student_id,) = self.cursor.fetchone()
+        self.cursor.execute("""
+            SELECT c.course_code, c.name, c.credits
+            FROM enrollments e JOIN courses c ON c.course_code = e.course_id
+            WHERE e.student_id = %s
+        """, (student_id,))
+        courses = tuple(sorted(tuple(row) for row in self.cursor.fetchall()))
+
+        transcript = get_transcript(student_id)
+        self.assertEqual(transcript["student_id"], student_id)
+        self.assertEqual(transcript["courses"], courses)
+        self.assertEqual(transcript["total_credits"], sum(credits or 0 for _, _, credits in courses))
+        with self.assertRaises(TypeError):
+            transcript["name"] = "Changed"  # Cached and shared, so read-only
+        self.assertIsNone(get_transcript(-1))
+
+    def test_transcripts_batch(self):
+        """The batch form should match single transcripts, keep input order and skip unknown IDs."""
+        self.cursor.execute("SELECT student_id FROM students ORDER BY student_id DESC LIMIT 5")
+        student_ids = [row[0] for row in self.cursor.fetchall()]
+        transcripts = get_transcripts(student_ids + [-1], batch_size=2)
+        self.assertEqual(list(transcripts), student_ids)
+        self.assertEqual(transcripts[student_ids[0]], get_transcript(student_ids[0]))
+
+    def test_program_transcripts(self):
+        """A cohort's transcripts should cover every student in the program."""
+        transcripts = get_program_transcripts("Computer Science")
+        self.assertEqual(len(transcripts), len(get_students_in_major("Computer Science")))
+
+    # Streaming Tests
+    def test_iter_top_students_matches_buffered_result(self):
+        """Streaming with a small batch size should yield the same rows as the buffered query."""
+        self.assertEqual(sorted(iter_top_students(batch_size=3)), sorted(get_top_students()))
+
+    def test_iter_stopped_early_releases_connection(self):
+        """Abandoning a stream part-way should give its connection back to the pool."""
+        in_use = get_pool_stats()["in_use"]
+        rows = iter_top_students(batch_size=1)
+        next(rows)
+        self.assertEqual(get_pool_stats()["in_use"], in_use + 1)
+        rows.close()
+        self.assertEqual(get_pool_stats()["in_use"], in_use)
+        self.assertTrue(get_top_students.__wrapped__())  # The pool still hands out usable connections
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
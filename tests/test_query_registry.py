@@ -0,0 +1,140 @@
+"""
+test_query_registry.py
+
+This module tests the query registry: registration, prepared-statement execution and
+EXPLAIN plan comparison. No database is needed.
+"""
+
+import unittest
+import contextlib
+import io
+import sys
+import os
+from unittest import mock
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import query_registry
+from config import REGISTRY_CONFIG
+
+class FakeConnection:
+    """Stands in for a pymysql connection (only identity matters)."""
+
+class FakeCursor:
+    """Records the statements it is asked to execute."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.statements = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+        return 0
+
+class TestRegistry(unittest.TestCase):
+    """Test cases for register() and run_query()."""
+
+    def setUp(self):
+        """Register a throwaway query and remember the prepare setting."""
+        self.sql = query_registry.register("test_lookup", "SELECT name FROM students WHERE program = %s;", ("Physics",))
+        self.server_prepare = REGISTRY_CONFIG["server_prepare"]
+
+    def tearDown(self):
+        """Remove the throwaway query and restore the setting."""
+        query_registry.QUERIES.pop("test_lookup", None)
+        REGISTRY_CONFIG["server_prepare"] = self.server_prepare
+
+    def test_register_returns_sql_and_rejects_conflicts(self):
+        """Registering is idempotent for the same SQL, but a name cannot be reused for other SQL."""
+        self.assertEqual(query_registry.register("test_lookup", self.sql), self.sql)
+        with self.assertRaises(ValueError):
+            query_registry.register("test_lookup", "SELECT 1;")
+
+    def test_application_queries_are_registered(self):
+        """queries.py and search.py should register their statements on import."""
+        query_registry.load_all_queries()
+        for name in ("students_in_major", "top_students_page", "department_overview", "search_records"):
+            self.assertIn(name, query_registry.QUERIES)
+            self.assertIsNotNone(query_registry.get_query(name).sql)
+
+    def test_plain_execution(self):
+        """Without server-side preparation the SQL is executed directly."""
+        REGISTRY_CONFIG["server_prepare"] = False
+        cursor = FakeCursor(FakeConnection())
+        query_registry.run_query(cursor, "test_lookup", ("Physics",))
+        self.assertEqual(cursor.statements, [(self.sql, ("Physics",))])
+
+    def test_prepared_once_per_connection(self):
+        """PREPARE should run once per connection, then only SET and EXECUTE."""
+        REGISTRY_CONFIG["server_prepare"] = True
+        connection = FakeConnection()
+        cursor = FakeCursor(connection)
+        query_registry.run_query(cursor, "test_lookup", ("Physics",))
+        query_registry.run_query(cursor, "test_lookup", ("History",))
+        statements = [sql for sql, _ in cursor.statements]
+        self.assertEqual(statements, [
+            "PREPARE rq_test_lookup FROM %s",
+            "SET @rq_p0 = %s", "EXECUTE rq_test_lookup USING @rq_p0",
+            "SET @rq_p0 = %s", "EXECUTE rq_test_lookup USING @rq_p0",
+        ])
+        self.assertEqual(cursor.statements[0][1], ("SELECT name FROM students WHERE program = ?",))
+
+        other = FakeCursor(FakeConnection())
+        query_registry.run_query(other, "test_lookup", ("Physics",))
+        self.assertTrue(other.statements[0][0].startswith("PREPARE"))
+
+class TestPlanComparison(unittest.TestCase):
+    """Test cases for summarize_plan() and diff_plans()."""
+
+    def plan(self, type_, key, extra=""):
+        return query_registry.summarize_plan([{"table": "students", "type": type_, "key": key, "Extra": extra}])
+
+    def test_unchanged_plan(self):
+        """Identical plans produce no output."""
+        plan = self.plan("ref", "idx_students_program")
+        self.assertEqual(query_registry.diff_plans({"q": plan}, {"q": plan}), ([], []))
+
+    def test_regressions(self):
+        """A new full scan, a lost index or a new filesort is a regression."""
+        baseline = {"q": self.plan("ref", "idx_students_program", "Using index")}
+        for current in (self.plan("ALL", None), self.plan("index", None),
+                        self.plan("ref", "idx_students_program", "Using index; Using filesort")):
+            regressions, _ = query_registry.diff_plans(baseline, {"q": current})
+            self.assertEqual(len(regressions), 1, current)
+
+    def test_other_changes_are_reported(self):
+        """A different index or a new query is reported without failing."""
+        regressions, changes = query_registry.diff_plans(
+            {"q": self.plan("ref", "idx_a")},
+            {"q": self.plan("range", "idx_b"), "new": self.plan("ref", "idx_a")}
+        )
+        self.assertEqual(regressions, [])
+        self.assertEqual(len(changes), 2)
+
+    def test_full_scan_detection(self):
+        """Derived tables and allowed tables are not counted as full scans."""
+        query = query_registry.RegisteredQuery("q", "", None, frozenset({"departments"}))
+        self.assertTrue(query_registry.is_full_scan({"table": "students", "type": "ALL"}, query))
+        self.assertFalse(query_registry.is_full_scan({"table": "departments", "type": "ALL"}, query))
+        self.assertFalse(query_registry.is_full_scan({"table": "<derived2>", "type": "ALL"}, query))
+
+class TestCommandLine(unittest.TestCase):
+    """Test cases for the plan-check command line."""
+
+    def test_missing_baseline_fails_before_connecting(self):
+        """Without a baseline file (and no --save-baseline) the check should exit non-zero with a message."""
+        missing = os.path.join(os.path.dirname(__file__), "no_such_baseline.json")
+        stderr = io.StringIO()
+        with mock.patch.object(sys, "argv", ["query_registry.py", "--baseline", missing]), \
+                mock.patch.object(query_registry, "collect_plans") as collect_plans, \
+                contextlib.redirect_stderr(stderr):
+            with self.assertRaises(SystemExit) as raised:
+                query_registry.main()
+        self.assertNotEqual(raised.exception.code, 0)
+        self.assertIn("--save-baseline", stderr.getvalue())
+        collect_plans.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+test_search.py
+
+This module tests full-text search across courses, lecturers, research projects and students.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from search import search_records, to_boolean_query
+
+class TestBooleanQuery(unittest.TestCase):
+    """Test cases for turning user input into a BOOLEAN MODE query."""
+
+    def test_words_become_prefix_terms(self):
+        """Each word should match as a prefix, and operators should be dropped."""
+        self.assertEqual(to_boolean_query("machine learn"), "machine* learn*")
+        self.assertEqual(to_boolean_query('+data -"science" (ai)~'), "data* science* ai*")
+        self.assertEqual(to_boolean_query("  ++ "), "")
+
+class TestSearchKinds(unittest.TestCase):
+    """Test cases for the kinds argument, which is checked before any query runs."""
+
+    def test_kinds_may_be_any_iterable(self):
+        """A list (unhashable) or generator of kinds should be validated, not break the cache key."""
+        for kinds in (["course", "building"], (kind for kind in ["building"])):
+            with self.subTest(kinds=kinds):
+                with self.assertRaisesRegex(ValueError, "building"):
+                    search_records("Data", kinds=kinds)
+
+class TestSearchRecords(unittest.TestCase):
+    """Test cases for search_records() against the database."""
+
+    def test_finds_courses_by_description_word(self):
+        """A word that appears only in a course description should find that course."""
+        page = search_records("supervised", kinds=("course",))
+        self.assertEqual([row[1] for row in page.rows], ["CS104"])
+
+    def test_finds_courses_by_name_word(self):
+        """A word from a course name should find that course, most relevant first."""
+        page = search_records("Data", kinds=["course"])
+        self.assertTrue(page.rows)
+        self.assertTrue(all(row[0] == "course" for row in page.rows))
+        scores = [row[4] for row in page.rows]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_pages_cover_all_hits(self):
+        """Walking the pages should return every hit exactly once."""
+        first = search_records("Data", page_size=2)
+        hits = list(first.rows)
+        page = first
+        while page.next_token:
+            page = search_records("Data", page_token=page.next_token, page_size=2, include_total=False)
+            hits.extend(page.rows)
+        self.assertEqual(len(hits), first.total)
+        self.assertEqual(len({(row[0], row[1]) for row in hits}), len(hits))
+
+    def test_empty_and_invalid_input(self):
+        """Input without words returns no hits; unknown kinds are rejected."""
+        self.assertEqual(search_records("  *** ").rows, ())
+        with self.assertRaises(ValueError):
+            search_records("Data", kinds=("building",))
+
+if __name__ == "__main__":
+    unittest.main()
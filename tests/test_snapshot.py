@@ -0,0 +1,75 @@
+"""
+test_snapshot.py
+
+This module tests saving and restoring dataset snapshots.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add src/ to the Python path dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import loader
+from snapshot import snapshot_path, save_snapshot, restore_snapshot, read_manifest, list_snapshots
+from database import get_db_connection
+
+class TestSnapshotNames(unittest.TestCase):
+    """Test cases for snapshot naming."""
+
+    def test_names_cannot_escape_the_snapshot_directory(self):
+        """Names with path separators should be rejected."""
+        self.assertTrue(snapshot_path("seed-2024.1", "snapshots").endswith("seed-2024.1.zip"))
+        for name in ("../seed", "a/b", ""):
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError):
+                    snapshot_path(name, "snapshots")
+
+class TestSnapshotRoundTrip(unittest.TestCase):
+    """Test cases that save and restore the database."""
+
+    def table_counts(self):
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                counts = {}
+                for table in ("students", "courses", "enrollments", "project_members"):
+                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                    counts[table] = cursor.fetchone()[0]
+                return counts
+        finally:
+            conn.close()
+
+    def test_restore_returns_the_saved_data(self):
+        """Restoring a snapshot should bring back exactly the rows that were saved."""
+        before = self.table_counts()
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = save_snapshot("test", directory)
+            self.assertEqual(list_snapshots(directory), ["test"])
+            self.assertEqual(read_manifest("test", directory)["tables"]["students"]["rows"], before["students"])
+            loaded = restore_snapshot("test", directory, progress=False)
+        self.assertEqual(loaded["students"], manifest["tables"]["students"]["rows"])
+        self.assertEqual(self.table_counts(), before)
+
+    def test_failed_restore_keeps_the_previous_data(self):
+        """A restore that fails partway should roll back to the data it started from."""
+        before = self.table_counts()
+        real_load = loader.load_delimited_file
+
+        def failing_load(path, table, *args, **kwargs):
+            if table == "enrollments":
+                raise RuntimeError("simulated failure while loading enrollments")
+            return real_load(path, table, *args, **kwargs)
+
+        with tempfile.TemporaryDirectory() as directory:
+            save_snapshot("test", directory)
+            with mock.patch.object(loader, "load_delimited_file", failing_load):
+                with self.assertRaises(RuntimeError):
+                    restore_snapshot("test", directory, progress=False)
+        self.assertEqual(self.table_counts(), before)
+
+if __name__ == "__main__":
+    unittest.main()